@@ -0,0 +1,103 @@
+import argparse
+import random
+import time
+from initialize import *
+from src.text_operations.text_converter import TextConverter
+
+
+def create_saved_page(size, seed=0):
+    """
+    保存した ChatGPT の会話ページに似た、おおよそ size 文字の HTML を作成する。
+    回答ごとに「markdown prose」クラスの div があり、見出し・段落・入れ子のリスト・コードを含む。
+    """
+    rng = random.Random(seed)
+    words = ["エビデンス", "記事", "検証", "データ", "result", "value", "analysis"]
+
+    def sentence():
+        return " ".join(rng.choice(words) for _ in range(12))
+
+    answers = []
+    length = 0
+    while length < size:
+        answer = (
+            '<div class="markdown prose w-full break-words dark:prose-invert dark">'
+            f"<h2>{sentence()}</h2>\n"
+            f"<p>{sentence()} <strong>{rng.choice(words)}</strong> "
+            f'<a href="https://example.com/{rng.randint(0, 9999)}">{rng.choice(words)}</a></p>\n'
+            "<ol>\n"
+            + "".join(
+                f"<li>\n<p>{sentence()} <code>{rng.choice(words)}</code></p>\n"
+                f"<ul>\n<li>{sentence()}</li>\n<li><em>{rng.choice(words)}</em></li>\n</ul>\n</li>\n"
+                for _ in range(3)
+            )
+            + "</ol>\n"
+            f"<pre><code>{sentence()}\n{sentence()}</code></pre>\n"
+            "</div>"
+        )
+        # 会話ページの回答以外の部分（ボタンやレイアウト用の要素）
+        wrapper = (
+            '<article><div class="flex"><div class="group"><span>ChatGPT</span>'
+            f"{answer}"
+            '<div class="buttons"><button>Copy</button><button>Retry</button></div>'
+            "</div></div></article>\n"
+        )
+        answers.append(wrapper)
+        length += len(wrapper)
+    return (
+        '<!DOCTYPE html><html><head><meta charset="utf-8"><title>ChatGPT</title>'
+        "<style>body { margin: 0; }</style></head><body><main>"
+        + "".join(answers)
+        + "</main></body></html>"
+    )
+
+
+def convert(content, backend):
+    elements = TextConverter.find_elements(
+        content, "div", ["markdown", "prose"], backend=backend
+    )
+    return [TextConverter.convert_to_markdown(element) for element in elements]
+
+
+def measure(function, *args):
+    start = time.perf_counter()
+    result = function(*args)
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compare the BeautifulSoup and lxml HTML-to-Markdown backends on a saved ChatGPT page."
+    )
+    parser.add_argument(
+        "--fixture", help="Path of a saved page (default: generate a synthetic page)"
+    )
+    parser.add_argument(
+        "--size-mb", type=float, default=5.0, help="Size of the synthetic page"
+    )
+    args = parser.parse_args()
+
+    if args.fixture:
+        with open(args.fixture, encoding="utf-8") as f:
+            content = f.read()
+    else:
+        content = create_saved_page(int(args.size_mb * 1024 * 1024))
+
+    print(f"page size: {len(content) / 1024 / 1024:.1f} M characters")
+    results = {}
+    for backend in (
+        TextConverter.MARKDOWN_BACKEND_BS4,
+        TextConverter.MARKDOWN_BACKEND_LXML,
+    ):
+        elapsed, results[backend] = measure(convert, content, backend)
+        print(
+            f"{backend:<6}{elapsed:>10.3f} s  ({len(results[backend])} answers converted)"
+        )
+    same = (
+        results[TextConverter.MARKDOWN_BACKEND_BS4]
+        == results[TextConverter.MARKDOWN_BACKEND_LXML]
+    )
+    print(f"identical Markdown: {same}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+import argparse
+import logging
+import os
+import tempfile
+import time
+from initialize import *
+from src.log_operations.log_handlers import (
+    CustomLogger,
+    ColoredFormatter,
+    QueueLogBackend,
+    LOG_FORMAT,
+    LOG_DATE_FORMAT,
+)
+
+
+def create_legacy_logger(name, level, log_folder, stream):
+    """
+    以前の CustomLogger と同じく、ロガーごとにコンソールとファイルのハンドラーを持ち、
+    呼び出し元のスレッドで書式設定と出力を行うロガーを作成する。
+    """
+    logger = logging.Logger(name, level)
+    logger.propagate = False
+    console_handler = logging.StreamHandler(stream)
+    console_handler.setLevel(level)
+    console_handler.setFormatter(ColoredFormatter(LOG_FORMAT, datefmt=LOG_DATE_FORMAT))
+    logger.addHandler(console_handler)
+    file_handler = logging.FileHandler(os.path.join(log_folder, f"{name}.log"))
+    file_handler.setLevel(level)
+    file_handler.setFormatter(logging.Formatter(LOG_FORMAT, datefmt=LOG_DATE_FORMAT))
+    logger.addHandler(file_handler)
+    return logger
+
+
+def log_cells_eager(logger, values):
+    for row, value in enumerate(values, 1):
+        logger.debug(f"Row {row}, Column 1: {value}")
+
+
+def log_cells_guarded(logger, values):
+    debug_enabled = logger.isEnabledFor(logging.DEBUG)
+    for row, value in enumerate(values, 1):
+        if debug_enabled:
+            logger.debug(f"Row {row}, Column 1: {value}")
+
+
+def measure(function, *args):
+    start = time.perf_counter()
+    function(*args)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Measure per-cell logging overhead of the legacy and queue-based loggers."
+    )
+    parser.add_argument("--cells", type=int, default=100_000)
+    parser.add_argument("--value-length", type=int, default=200)
+    args = parser.parse_args()
+
+    values = [f"{i:08d}" + "x" * args.value_length for i in range(args.cells)]
+    results = []
+
+    with tempfile.TemporaryDirectory() as log_folder, open(os.devnull, "w") as devnull:
+        for level in (logging.INFO, logging.DEBUG):
+            level_name = logging.getLevelName(level)
+
+            legacy = create_legacy_logger(
+                f"legacy_{level_name}", level, log_folder, devnull
+            )
+            results.append(
+                (
+                    f"legacy, {level_name}",
+                    measure(log_cells_eager, legacy, values),
+                )
+            )
+            for handler in legacy.handlers:
+                handler.close()
+
+            QueueLogBackend.stop()
+            queued = CustomLogger(f"queued_{level_name}", level, log_folder)
+            _, listener = QueueLogBackend._backends[os.path.abspath(log_folder)]
+            for handler in listener.handlers:
+                if isinstance(handler, logging.StreamHandler) and not isinstance(
+                    handler, logging.FileHandler
+                ):
+                    handler.setStream(devnull)
+            results.append(
+                (
+                    f"queue, {level_name}",
+                    measure(log_cells_guarded, queued, values),
+                )
+            )
+            drain = measure(QueueLogBackend.stop)
+            results.append((f"queue, {level_name} (drain at exit)", drain))
+
+    print(f"{args.cells} cells, value length {args.value_length}")
+    print(f"{'scenario':<34}{'total [s]':>12}{'per cell [us]':>16}")
+    for name, elapsed in results:
+        print(f"{name:<34}{elapsed:>12.4f}{elapsed / args.cells * 1e6:>16.3f}")
+
+
+if __name__ == "__main__":
+    main()
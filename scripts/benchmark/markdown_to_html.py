@@ -0,0 +1,103 @@
+import argparse
+import random
+import time
+from initialize import *
+from src.text_operations.text_converter import TextConverter
+
+
+def legacy_process_inline_elements(text):
+    """
+    以前の TextConverter._process_inline_elements と同じく、マーカーを1つずつ先頭から置き換える。
+    """
+    text = text.replace("**", "<strong>", 1)
+    while "**" in text:
+        text = text.replace("**", "</strong>", 1)
+
+    text = text.replace("*", "<em>", 1)
+    while "*" in text:
+        text = text.replace("*", "</em>", 1)
+    text = text.replace("`", "<code>", 1)
+    while "`" in text:
+        text = text.replace("`", "</code>", 1)
+
+    return text
+
+
+def create_markdown(size, paragraph_lines, seed=0):
+    """
+    見出し・リスト・段落（強調とコードを含む）を繰り返した、おおよそ size 文字の Markdown を作成する。
+    """
+    rng = random.Random(seed)
+    words = ["エビデンス", "記事", "検証", "データ", "result", "value", "analysis"]
+    blocks = []
+    length = 0
+    while length < size:
+        sentence_lines = [
+            " ".join(rng.choice(words) for _ in range(8))
+            + f" **{rng.choice(words)}** と `{rng.choice(words)}`"
+            for _ in range(paragraph_lines)
+        ]
+        block = "\n".join(
+            [f"## {rng.choice(words)}", ""]
+            + sentence_lines
+            + ["", f"- **{rng.choice(words)}**", f"- {rng.choice(words)}", ""]
+            + [f"{i}. {rng.choice(words)}" for i in range(1, 4)]
+            + [""]
+        )
+        blocks.append(block)
+        length += len(block) + 1
+    return "\n".join(blocks)
+
+
+def measure(function, *args):
+    start = time.perf_counter()
+    function(*args)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Measure TextConverter.convert_to_html on synthetic Markdown of increasing size."
+    )
+    parser.add_argument(
+        "--sizes-kb",
+        type=int,
+        nargs="+",
+        default=[100, 250, 500, 1000, 2500, 5000],
+    )
+    parser.add_argument(
+        "--paragraph-lines",
+        type=int,
+        default=5,
+        help="Lines per paragraph; long paragraphs contain many inline markers",
+    )
+    parser.add_argument(
+        "--legacy-max-kb",
+        type=int,
+        default=250,
+        help="Largest size for which the legacy inline processing is also measured",
+    )
+    args = parser.parse_args()
+
+    print(f"paragraph lines: {args.paragraph_lines}")
+    print(
+        f"{'size [KB]':>10}{'convert [s]':>14}{'per MB [s]':>12}"
+        f"{'inline [s]':>12}{'legacy inline [s]':>20}"
+    )
+    for size_kb in args.sizes_kb:
+        markdown = create_markdown(size_kb * 1024, args.paragraph_lines)
+        elapsed = measure(TextConverter.convert_to_html, markdown)
+        # 全体を1つの段落とした場合のインライン要素の処理（マーカーの数に対する計算量を比較する）
+        paragraph = " ".join(markdown.splitlines())
+        inline = measure(TextConverter._process_inline_elements, paragraph)
+        legacy = ""
+        if size_kb <= args.legacy_max_kb:
+            legacy = f"{measure(legacy_process_inline_elements, paragraph):.4f}"
+        print(
+            f"{size_kb:>10}{elapsed:>14.4f}{elapsed / (len(markdown) / 1024 / 1024):>12.4f}"
+            f"{inline:>12.4f}{legacy:>20}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+import argparse
+import json
+import os
+from collections import defaultdict
+from initialize import *
+from src.log_operations.log_handlers import METRICS_FILE_NAME
+
+
+def load_records(metrics_path):
+    """
+    メトリクスファイル（JSON Lines）のレコードを読み込む。壊れた行は読み飛ばす。
+    """
+    records = []
+    with open(metrics_path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                records.append(json.loads(line))
+            except json.JSONDecodeError:
+                continue
+    return records
+
+
+def summarize(records):
+    """
+    (実行 ID, スクリプト名, スパン名) ごとに回数・経過時間・CPU 時間・最大 RSS を集計する。
+    """
+    summary = defaultdict(
+        lambda: {"count": 0, "wall_s": 0.0, "cpu_s": 0.0, "peak_rss": 0}
+    )
+    for record in records:
+        entry = summary[(record["run_id"], record["script"], record["span"])]
+        entry["count"] += 1
+        entry["wall_s"] += record["wall_s"]
+        entry["cpu_s"] += record["cpu_s"]
+        entry["peak_rss"] = max(entry["peak_rss"], record.get("peak_rss") or 0)
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Aggregate span metrics per run, script and span name."
+    )
+    parser.add_argument("--metrics", default=os.path.join("logs", METRICS_FILE_NAME))
+    parser.add_argument("--run-id", help="Only show this run (default: all runs)")
+    args = parser.parse_args()
+
+    records = load_records(args.metrics)
+    if args.run_id:
+        records = [r for r in records if r.get("run_id") == args.run_id]
+
+    summary = summarize(records)
+    print(
+        f"{'run':<26}{'script':<32}{'span':<20}"
+        f"{'count':>7}{'wall [s]':>11}{'cpu [s]':>10}{'peak RSS [MB]':>15}"
+    )
+    for (run_id, script, span), entry in sorted(summary.items()):
+        print(
+            f"{run_id:<26}{script:<32}{span:<20}{entry['count']:>7}"
+            f"{entry['wall_s']:>11.3f}{entry['cpu_s']:>10.3f}"
+            f"{entry['peak_rss'] / (1024 * 1024):>15.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+import argparse
+import os
+import re
+import shutil
+import tempfile
+import time
+from initialize import *
+from src.file_operations.file_processor import FileHandler, FileProcessor, FileValidator
+
+WORDS = ["エビデンス", "記事", "検証", "データ", "result", "value", "analysis"]
+PATTERNS = [
+    (re.compile(r"\*\*(.+?)\*\*"), r"<strong>\1</strong>"),
+    (re.compile(r"`([^`]+)`"), r"<code>\1</code>"),
+    (re.compile(r"\[(.+?)\]\((.+?)\)"), r'<a href="\2">\1</a>'),
+    (re.compile(r"^(#{1,3}) (.+)$", re.MULTILINE), r"\1 \2"),
+    (re.compile(r"(\d+)\. "), r"\1) "),
+]
+
+
+def light_transform(content):
+    """
+    I/O の比率が高い変換（1つの文字列の置換）。
+    """
+    return content.replace("エビデンス", "根拠")
+
+
+def heavy_transform(content):
+    """
+    CPU の比率が高い変換（複数の正規表現を繰り返し適用する）。
+    プロセスプールで実行できるよう、モジュールの最上位に定義する。
+    """
+    for _ in range(20):
+        for pattern, replacement in PATTERNS:
+            content = pattern.sub(replacement, content)
+    return content.replace("エビデンス", "根拠")
+
+
+def create_tree(root, files, files_per_folder, file_kb):
+    """
+    index.mdx を含むフォルダを作成し、合計 files 個の .mdx ファイルを配置する。
+    """
+    line = " ".join(WORDS) + " **強調** `code` [link](https://example.com) 1. item\n"
+    body = line * max(1, file_kb * 1024 // len(line.encode("utf-8")))
+    for i in range(0, files, files_per_folder):
+        folder = os.path.join(root, f"article_{i // files_per_folder:05d}")
+        os.makedirs(folder)
+        for j in range(min(files_per_folder, files - i)):
+            name = "index.mdx" if j == 0 else f"section_{j}.mdx"
+            with open(os.path.join(folder, name), "w", encoding="utf-8") as f:
+                f.write(f"---\ntitle: 記事 {i + j}\n---\n## 見出し\n{body}")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Measure FileProcessor.process_all_matching_files with serial, thread and process execution."
+    )
+    parser.add_argument("--files", type=int, default=10_000)
+    parser.add_argument("--files-per-folder", type=int, default=4)
+    parser.add_argument("--file-kb", type=int, default=4)
+    parser.add_argument("--workers", type=int, nargs="+", default=[4, 8])
+    args = parser.parse_args()
+
+    processor = FileProcessor(FileHandler(), FileValidator())
+    scenarios = [("serial", 1, FileProcessor.EXECUTOR_THREAD)]
+    for workers in args.workers:
+        scenarios.append((f"thread x{workers}", workers, FileProcessor.EXECUTOR_THREAD))
+        scenarios.append(
+            (f"process x{workers}", workers, FileProcessor.EXECUTOR_PROCESS)
+        )
+
+    print(
+        f"{args.files} files, {args.files_per_folder} per folder, {args.file_kb} KB each, "
+        f"{os.cpu_count()} CPUs"
+    )
+    print(f"{'transform':<10}{'scenario':<14}{'time [s]':>10}{'speedup':>9}  result")
+    for transform in (light_transform, heavy_transform):
+        baseline = None
+        for name, workers, executor in scenarios:
+            root = tempfile.mkdtemp()
+            try:
+                create_tree(root, args.files, args.files_per_folder, args.file_kb)
+                start = time.perf_counter()
+                results = processor.process_all_matching_files(
+                    root,
+                    "article_",
+                    transform,
+                    ["index.mdx"],
+                    workers=workers,
+                    executor=executor,
+                )
+                elapsed = time.perf_counter() - start
+            finally:
+                shutil.rmtree(root)
+            baseline = baseline or elapsed
+            print(
+                f"{transform.__name__.split('_')[0]:<10}{name:<14}{elapsed:>10.3f}"
+                f"{baseline / elapsed:>8.2f}x  {results}"
+            )
+
+
+if __name__ == "__main__":
+    main()
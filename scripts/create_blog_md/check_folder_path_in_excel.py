@@ -4,8 +4,7 @@ from scripts.constants import *
 from scripts.initialize import (
     excel_manager,
     value_validator,
-    folder_checker,
-    folder_path_handler,
+    folder_index,
 )
 
 
@@ -21,18 +20,18 @@ def main():
     )
     if value_validator.any_invalid(columns):
         return
+    if not folder_index.set_info(
+        CREATE_BLOG_MD_TARGET_FOLDER_FULL_PATH, CREATE_BLOG_MD_TARGET_PNG_FILE_NAME
+    ):
+        return
 
     for row, folder_name in excel_manager.cell_handler.iterate_column_values(
         column=columns["folder_name"],
         start_row=CREATE_BLOG_MD_EXCEL_START_ROW,
     ):
         if folder_name:
-            folder_path = folder_path_handler.join_and_normalize_path(
-                [CREATE_BLOG_MD_EXCEL_FILE_FULL_PATH, folder_name]
-            )
-            result = folder_checker.check_folder_exists(folder_path)
-            if result == False:
-                excel_manager.cell_handler.update_cell(row, columns["exist"], result)
+            if not folder_index.folder_exists(folder_name):
+                excel_manager.cell_handler.update_cell(row, columns["exist"], False)
             else:
                 excel_manager.cell_handler.update_cell(row, columns["exist"], "")
     excel_manager.file_handler.save()
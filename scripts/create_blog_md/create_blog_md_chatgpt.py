@@ -48,10 +48,6 @@ def main():
     if value_validator.any_invalid(columns):
         return
 
-    flag_end_row = excel_manager.cell_handler.get_last_row_of_column(
-        column=columns["flag"]
-    )
-
     chatgpt_handler.set_info(
         wait_time_after_prompt_long=WAIT_TIME_AFTER_PROMPT_LONG,
         wait_time_after_prompt_medium=WAIT_TIME_AFTER_PROMPT_MEDIUM,
@@ -64,20 +60,21 @@ def main():
         tab_count_gpts=TAB_COUNT_GPTS,
     )
     count = 0
-    for i in range(flag_end_row):
-        target_row = i + CREATE_BLOG_MD_EXCEL_START_ROW
-        flag = excel_manager.cell_handler.get_cell_value(target_row, columns["flag"])
-        if value_validator.is_valid(flag):
-            if count % 20 == 0:
-                if not count == 0:
-                    logger.info("close tab")
-                    if CHATGPT_IS_DELETE_CHAT:
-                        chatgpt_handler.delete_chat()
-                    edge_handler.close_tab()
-                edge_handler.open_url_in_browser(CHATGPT_GPTS_BLOG_MASTER_URL)
-            count += 1
-            logger.prominent_log(f"Processing group starting at row {target_row}")
-            generate_and_process_prompts(target_row, columns)
+    for target_row, _ in excel_manager.iterate_flagged_groups(
+        group_size=1,
+        start_row=CREATE_BLOG_MD_EXCEL_START_ROW,
+        flag_column=columns["flag"],
+    ):
+        if count % 20 == 0:
+            if not count == 0:
+                logger.info("close tab")
+                if CHATGPT_IS_DELETE_CHAT:
+                    chatgpt_handler.delete_chat()
+                edge_handler.close_tab()
+            edge_handler.open_url_in_browser(CHATGPT_GPTS_BLOG_MASTER_URL)
+        count += 1
+        logger.prominent_log(f"Processing group starting at row {target_row}")
+        generate_and_process_prompts(target_row, columns)
 
 
 if __name__ == "__main__":
@@ -43,7 +43,9 @@ image_folder_path = folder_path_handler.join_and_normalize_path(image_path_eleme
 def read_excel_data():
     logger.info("read excel data . . .")
     if not excel_manager.set_info(
-        CREATE_BLOG_MD_EXCEL_FILE_FULL_PATH, CREATE_BLOG_MD_EXCEL_SHEET_NAME
+        CREATE_BLOG_MD_EXCEL_FILE_FULL_PATH,
+        CREATE_BLOG_MD_EXCEL_SHEET_NAME,
+        read_only=True,
     ):
         return
     columns = excel_manager.search_handler.find_and_map_column_indices(
@@ -95,6 +97,7 @@ def read_excel_data():
     return data
 
 
+@logger.timed("thumbnail.render")
 def create_image(title: str, subtitle: str, setting_path: str) -> Any:
     logger.info("create image")
     json_data = json_parser.load(setting_path)
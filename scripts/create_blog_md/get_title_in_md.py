@@ -5,11 +5,8 @@ from scripts.initialize import (
     logger,
     excel_manager,
     value_validator,
-    file_handler,
-    file_reader,
-    file_path_handler,
+    folder_index,
     text_handler,
-    text_finder,
     text_replacer,
 )
 
@@ -23,24 +20,21 @@ def get_title_in_md(columns):
         if folder_name is None:
             continue
 
-        path_elements = [
-            CREATE_BLOG_MD_TARGET_FOLDER_FULL_PATH,
-            folder_name,
-            CREATE_BLOG_MD_TARGET_MDX_FILE_NAME,
-        ]
-        file_full_path = file_path_handler.join_and_normalize_path(path_elements)
+        folder = folder_index.normalize_folder(folder_name)
+        if not folder_index.has_files(folder, [CREATE_BLOG_MD_TARGET_MDX_FILE_NAME]):
+            continue
 
-        if file_handler.exists(file_full_path):
-            lines = file_reader.read_file_line_list(file_full_path)
-            text = text_finder.find_line_starting_with(
-                lines, CREATE_BLOG_MD_GET_TITLE_IN_MD_TARGET_TEXT
-            )
-            text = text_replacer.replace(
-                text,
-                CREATE_BLOG_MD_GET_TITLE_IN_MD_REPLACE_TARGET_TEXT,
-                CREATE_BLOG_MD_GET_TITLE_IN_MD_REPLACEMENT_TEXT,
-            )
-            excel_manager.cell_handler.update_cell(row, columns["title_full"], text)
+        title = folder_index.find_front_matter_line(
+            folder,
+            CREATE_BLOG_MD_TARGET_MDX_FILE_NAME,
+            CREATE_BLOG_MD_GET_TITLE_IN_MD_TARGET_TEXT,
+        )
+        text = text_replacer.replace(
+            title,
+            CREATE_BLOG_MD_GET_TITLE_IN_MD_REPLACE_TARGET_TEXT,
+            CREATE_BLOG_MD_GET_TITLE_IN_MD_REPLACEMENT_TEXT,
+        )
+        excel_manager.cell_handler.update_cell(row, columns["title_full"], text)
 
 
 def separate_title_in_md(columns):
@@ -71,6 +65,10 @@ def main():
     )
     if value_validator.any_invalid(columns):
         return
+    if not folder_index.set_info(
+        CREATE_BLOG_MD_TARGET_FOLDER_FULL_PATH, CREATE_BLOG_MD_TARGET_PNG_FILE_NAME
+    ):
+        return
 
     get_title_in_md(columns)
     separate_title_in_md(columns)
@@ -4,10 +4,7 @@ from scripts.constants import *
 from scripts.initialize import (
     excel_manager,
     value_validator,
-    folder_checker,
-    folder_path_handler,
-    folder_processor,
-    file_validator,
+    folder_index,
     folder_mover,
 )
 
@@ -17,21 +14,13 @@ def move_folder():
         CREATE_BLOG_MD_TARGET_MDX_FILE_NAME,
         CREATE_BLOG_MD_TARGET_PNG_FILE_NAME,
     ]
-    folder_processor.folder_path = CREATE_BLOG_MD_TARGET_FOLDER_FULL_PATH
-    folder_processor.folder_prefix = ""
-
-    def move_folder_if_files_exist(folder_path: str) -> bool:
-        """
-        フォルダ内に必要なファイルがすべて存在する場合にフォルダを移動する
-        :param folder_path: 処理対象のフォルダのパス
-        :return: 成功したらTrue、失敗したらFalse
-        """
-        if file_validator.has_required_files(folder_path, required_files):
-            folder_mover.move_folder(
-                folder_path, CREATE_BLOG_MD_MOVE_TO_DESTINATION_FOLDER_FULL_PATH
-            )
-
-    folder_processor.process_all_matching_folders(move_folder_if_files_exist)
+    for folder in folder_index.find_folders_with_files(required_files):
+        folder_mover.move_folder(
+            folder_index.get_path(folder),
+            CREATE_BLOG_MD_MOVE_TO_DESTINATION_FOLDER_FULL_PATH,
+        )
+    # 移動したフォルダを索引から取り除く（変化したのは親フォルダのみのため読み直しは軽い）
+    folder_index.refresh()
 
 
 def check_folders():
@@ -46,23 +35,24 @@ def check_folders():
     if value_validator.any_invalid(columns):
         return
 
-    for row, folder_name in excel_manager.cell_handler.iterate_column_values(
-        column=columns["folder_name"],
-        start_row=CREATE_BLOG_MD_EXCEL_START_ROW,
-    ):
-        if folder_name:
-            folder_path = folder_path_handler.join_and_normalize_path(
-                [CREATE_BLOG_MD_TARGET_FOLDER_FULL_PATH, folder_name]
-            )
-            result = folder_checker.check_folder_exists(folder_path)
-            if result == False:
-                excel_manager.cell_handler.update_cell(row, columns["exist"], result)
-            else:
-                excel_manager.cell_handler.update_cell(row, columns["exist"], "")
-        excel_manager.file_handler.save()
+    # transaction() の終了時に1回だけ保存される
+    with excel_manager.transaction():
+        for row, folder_name in excel_manager.cell_handler.iterate_column_values(
+            column=columns["folder_name"],
+            start_row=CREATE_BLOG_MD_EXCEL_START_ROW,
+        ):
+            if folder_name:
+                if not folder_index.folder_exists(folder_name):
+                    excel_manager.cell_handler.update_cell(row, columns["exist"], False)
+                else:
+                    excel_manager.cell_handler.update_cell(row, columns["exist"], "")
 
 
 def main():
+    if not folder_index.set_info(
+        CREATE_BLOG_MD_TARGET_FOLDER_FULL_PATH, CREATE_BLOG_MD_TARGET_PNG_FILE_NAME
+    ):
+        return
     move_folder()
     check_folders()
 
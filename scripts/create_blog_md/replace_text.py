@@ -1,5 +1,6 @@
 from functools import partial
 from initialize import *
+from src.text_operations.text_replacer import TextReplacePipeline
 from scripts.load_env import *
 from scripts.constants import *
 from scripts.initialize import (
@@ -16,94 +17,59 @@ from scripts.initialize import (
 )
 
 
-def main():
-    folder_prefix = ""
-
-    target_text = CREATE_BLOG_MD_PNG_TAG_NAME
-    replacement_text = "`" + CREATE_BLOG_MD_PNG_TAG_NAME + "`"
-    exclude_pattern = "`" + CREATE_BLOG_MD_PNG_TAG_NAME + "`"
+def build_pipeline() -> TextReplacePipeline:
+    pipeline = TextReplacePipeline()
 
-    process_function = partial(
-        text_replacer.replace_with_exclusion,
-        target_text=target_text,
-        replacement_text=replacement_text,
-        exclusion_pattern=exclude_pattern,
-    )
-
-    file_processor.process_all_matching_files(
-        CREATE_BLOG_MD_TARGET_FOLDER_FULL_PATH,
-        folder_prefix,
-        process_function,
-        [],
+    pipeline.add_function(
+        "exclusion tag",
+        partial(
+            text_replacer.replace_with_exclusion,
+            target_text=CREATE_BLOG_MD_PNG_TAG_NAME,
+            replacement_text="`" + CREATE_BLOG_MD_PNG_TAG_NAME + "`",
+            exclusion_pattern="`" + CREATE_BLOG_MD_PNG_TAG_NAME + "`",
+        ),
     )
 
-    # target_text = "【"
-    # replacement_text = ""
-    # exclude_pattern = "【" + CREATE_BLOG_MD_PNG_TAG_NAME + "】"
-
-    # process_function = partial(
-    #     text_replacer.replace_with_exclusion,
-    #     target_text=target_text,
-    #     replacement_text=replacement_text,
-    #     exclusion_pattern=exclude_pattern,
+    # pipeline.add_function(
+    #     "exclusion 【",
+    #     partial(
+    #         text_replacer.replace_with_exclusion,
+    #         target_text="【",
+    #         replacement_text="",
+    #         exclusion_pattern="【" + CREATE_BLOG_MD_PNG_TAG_NAME + "】",
+    #     ),
     # )
 
-    # target_text = "】"
-    # replacement_text = ""
-    # exclude_pattern = "【" + CREATE_BLOG_MD_PNG_TAG_NAME + "】"
-
-    # process_function = partial(
-    #     text_replacer.replace_with_exclusion,
-    #     target_text=target_text,
-    #     replacement_text=replacement_text,
-    #     exclusion_pattern=exclude_pattern,
+    # pipeline.add_function(
+    #     "exclusion 】",
+    #     partial(
+    #         text_replacer.replace_with_exclusion,
+    #         target_text="】",
+    #         replacement_text="",
+    #         exclusion_pattern="【" + CREATE_BLOG_MD_PNG_TAG_NAME + "】",
+    #     ),
     # )
 
-    # file_processor.process_all_matching_files(
-    #     CREATE_BLOG_MD_TARGET_FOLDER_FULL_PATH,
-    #     folder_prefix,
-    #     process_function,
-    #     [],
-    # )
-
-    target_text = "`"
-    replacement_text = ""
-    start_marker = "---"
-    end_marker = "---"
-    use_markers = True
-
-    process_function = partial(
-        text_replacer.replace_between,
-        target_text=target_text,
-        replacement_text=replacement_text,
-        start_marker=start_marker,
-        end_marker=end_marker,
-        use_markers=use_markers,
-    )
-
-    file_processor.process_all_matching_files(
-        CREATE_BLOG_MD_TARGET_FOLDER_FULL_PATH,
-        folder_prefix,
-        process_function,
-        [],
-    )
-
-    target_text = "`: "
-    replacement_text = "`  \n  "
-    marker = "---"
-
-    process_function = partial(
-        text_replacer.replace_from_marker,
-        target_text=target_text,
-        replacement_text=replacement_text,
-        marker=marker,
+    pipeline.add_function(
+        "between markers '`'",
+        partial(
+            text_replacer.replace_between,
+            target_text="`",
+            replacement_text="",
+            start_marker="---",
+            end_marker="---",
+            use_markers=True,
+        ),
     )
 
-    file_processor.process_all_matching_files(
-        CREATE_BLOG_MD_TARGET_FOLDER_FULL_PATH,
-        folder_prefix,
-        process_function,
-        [],
+    pipeline.add_function(
+        "from marker '`: '",
+        partial(
+            text_replacer.replace_from_marker,
+            target_text="`: ",
+            replacement_text="`  \n  ",
+            marker="---",
+        ),
     )
 
     replacements = [
@@ -135,57 +101,26 @@ def main():
     ]
 
     for target_text, replacement_text in replacements:
-        process_function = partial(
-            text_replacer.replace_content,
-            target_text=target_text,
-            replacement_text=replacement_text,
-        )
-        file_processor.process_all_matching_files(
-            CREATE_BLOG_MD_TARGET_FOLDER_FULL_PATH, folder_prefix, process_function, []
-        )
-
-    target_text = "**"
-    replacement_text = ""
-    process_function = partial(
-        text_replacer.replace_content,
-        target_text=target_text,
-        replacement_text=replacement_text,
-    )
-    file_processor.process_all_matching_files(
-        CREATE_BLOG_MD_TARGET_FOLDER_FULL_PATH, folder_prefix, process_function, []
-    )
+        pipeline.add_literal(target_text, replacement_text)
 
-    target_text = r"categories: \[.*?\]"
-    replacement_text = "categories: [Coding]"
-    process_function = partial(
-        text_replacer.replace_content_regex,
-        pattern=target_text,
-        replacement=replacement_text,
-    )
-    file_processor.process_all_matching_files(
-        CREATE_BLOG_MD_TARGET_FOLDER_FULL_PATH, folder_prefix, process_function, []
-    )
+    pipeline.add_literal("**", "")
 
-    target_text = r"tags: \[.*?\]"
-    replacement_text = "tags: [" + CREATE_BLOG_MD_PNG_TAG_NAME + "]"
-    process_function = partial(
-        text_replacer.replace_content_regex,
-        pattern=target_text,
-        replacement=replacement_text,
-    )
-    file_processor.process_all_matching_files(
-        CREATE_BLOG_MD_TARGET_FOLDER_FULL_PATH, folder_prefix, process_function, []
-    )
+    pipeline.add_regex(r"categories: \[.*?\]", "categories: [Coding]")
+    pipeline.add_regex(r"tags: \[.*?\]", "tags: [" + CREATE_BLOG_MD_PNG_TAG_NAME + "]")
+    pipeline.add_regex(r"\n{2,}", "\n")
 
-    target_text = r"\n{2,}"
-    replacement_text = "\n"
-    process_function = partial(
-        text_replacer.replace_content_regex,
-        pattern=target_text,
-        replacement=replacement_text,
-    )
-    file_processor.process_all_matching_files(
-        CREATE_BLOG_MD_TARGET_FOLDER_FULL_PATH, folder_prefix, process_function, []
+    return pipeline
+
+
+def main():
+    folder_prefix = ""
+
+    file_processor.apply_pipeline(
+        CREATE_BLOG_MD_TARGET_FOLDER_FULL_PATH,
+        folder_prefix,
+        build_pipeline(),
+        [],
+        use_manifest=True,
     )
 
 
@@ -10,7 +10,6 @@ from scripts.initialize import (
     text_manager,
     file_handler,
     file_reader,
-    web_scraper,
     text_converter,
     text_replacer,
     folder_remover,
@@ -19,16 +18,13 @@ from scripts.initialize import (
 )
 
 
-def generate_and_process_prompts(start_row, columns):
+def generate_and_process_prompts(start_row, columns, group):
     """指定されたグループのプロンプトを生成し、処理する"""
-    theme = excel_manager.cell_handler.get_cell_value(start_row, columns["theme"])
-    heading = excel_manager.cell_handler.get_cell_value(start_row, columns["heading"])
-    evidences = excel_manager.cell_handler.get_range_values(
-        start_row,
-        columns["evidence"],
-        CREATE_BLOG_WP_EXCEL_GROUP_SIZE,
-    )
-    if not value_validator.any_valid(evidences):
+    theme = group["theme"][0]
+    heading = group["heading"][0]
+    evidences = group["evidence"]
+    valid_evidences = value_validator.mask_valid(evidences)
+    if not valid_evidences.any():
         logger.warning("evidence don't have any values")
         return
 
@@ -44,7 +40,7 @@ def generate_and_process_prompts(start_row, columns):
     html_contents = []
     md_contents = []
     for i, evidence in enumerate(evidences):
-        if value_validator.is_valid(evidence):
+        if valid_evidences[i]:
             logger.info(f"getting md and html content : {i+1}/{evidence_count}")
             evidence = text_manager.text_remover.remove_content_after(
                 evidence, BING_SOURCE_COPILOT_CONVERSATION
@@ -123,11 +119,28 @@ def generate_and_process_prompts(start_row, columns):
             html_file_name = (
                 CREATE_BLOG_WP_CREATE_BLOG_WP_CHATGPT_FILE_NAME + EXTENSION_HTML
             )
-            edge_handler.ui_save_html(html_file_name)
             html_file_full_path = DOWNLOAD_FOLDER_DIR_FULL_PATH + html_file_name
-            if file_handler.exists(html_file_full_path):
-                chatgpt_html = file_reader.read_file(html_file_full_path)
-            results = web_scraper.find_elements(
+            if not edge_handler.ui_save_html(
+                html_file_name,
+                CREATE_BLOG_WP_CREATE_BLOG_WP_CHATGPT_FILE_NAME
+                + DOWNLOAD_HTML_FOLDER_SUFFIX,
+            ):
+                logger.error(f"failed to save html, skip this group: {theme}")
+                if file_handler.exists(html_file_full_path):
+                    file_handler.delete_file(html_file_full_path)
+                folder_remover.remove_folder(
+                    folder_path_handler.join_and_normalize_path(
+                        [
+                            DOWNLOAD_FOLDER_DIR_FULL_PATH,
+                            CREATE_BLOG_WP_CREATE_BLOG_WP_CHATGPT_FILE_NAME
+                            + DOWNLOAD_HTML_FOLDER_SUFFIX,
+                        ]
+                    )
+                )
+                edge_handler.close_tab()
+                return
+            chatgpt_html = file_reader.read_file(html_file_full_path)
+            results = text_converter.find_elements(
                 chatgpt_html,
                 tag_name=CHATGPT_OUTPUT_TAG,
                 class_list=CHATGPT_OUTPUT_CLASS_LIST,
@@ -139,7 +152,7 @@ def generate_and_process_prompts(start_row, columns):
             )
             if len(results) >= evidence_count + 5:
                 for i in range(evidence_count):
-                    html_content = results[i]
+                    html_content = text_converter.element_to_html(results[i])
                     html_content_converted = text_replacer.replace_from_end(
                         html_content,
                         '<div class="markdown prose w-full break-words dark:prose-invert dark">',
@@ -154,8 +167,7 @@ def generate_and_process_prompts(start_row, columns):
                         )
                     )
                     html_contents.append(html_content_converted)
-                    md_content = text_converter.convert_to_markdown(html_content)
-                    md_contents.append(text_converter.convert_to_markdown(md_content))
+                    md_contents.append(text_converter.convert_to_markdown(results[i]))
                 title_content = text_converter.convert_to_markdown(
                     results[evidence_count]
                 )
@@ -238,9 +250,14 @@ def generate_and_process_prompts(start_row, columns):
 
 def main():
     if not excel_manager.set_info(
-        CREATE_BLOG_WP_EXCEL_FILE_FULL_PATH, CREATE_BLOG_WP_EXCEL_SHEET_NAME
+        CREATE_BLOG_WP_EXCEL_FILE_FULL_PATH,
+        CREATE_BLOG_WP_EXCEL_SHEET_NAME,
+        use_snapshot=True,
+        use_cache=True,
     ):
         return
+    excel_manager.enable_blob_store(CREATE_BLOG_WP_EXCEL_BLOB_THRESHOLD)
+    excel_manager.file_handler.set_async_save(CREATE_BLOG_WP_EXCEL_ASYNC_SAVE)
 
     columns = excel_manager.search_handler.find_and_map_column_indices(
         index=CREATE_BLOG_WP_EXCEL_INDEX_ROW,
@@ -249,10 +266,6 @@ def main():
     if value_validator.any_invalid(columns):
         return
 
-    flag_end_row = excel_manager.cell_handler.get_last_row_of_column(
-        column=columns["flag"]
-    )
-
     chatgpt_handler.set_info(
         wait_time_after_prompt_long=WAIT_TIME_AFTER_PROMPT_LONG,
         wait_time_after_prompt_medium=WAIT_TIME_AFTER_PROMPT_MEDIUM,
@@ -264,12 +277,15 @@ def main():
         tab_count_4omini=TAB_COUNT_4OMINI,
         tab_count_gpts=TAB_COUNT_GPTS,
     )
-    for i in range(flag_end_row):
-        start_row = i * CREATE_BLOG_WP_EXCEL_GROUP_SIZE + CREATE_BLOG_WP_EXCEL_START_ROW
-        flag = excel_manager.cell_handler.get_cell_value(start_row, columns["flag"])
-        if value_validator.is_valid(flag):
-            logger.prominent_log(f"Processing group starting at row {start_row}")
-            generate_and_process_prompts(start_row, columns)
+    for start_row, group in excel_manager.iterate_flagged_groups(
+        group_size=CREATE_BLOG_WP_EXCEL_GROUP_SIZE,
+        start_row=CREATE_BLOG_WP_EXCEL_START_ROW,
+        flag_column=columns["flag"],
+        columns=columns,
+    ):
+        logger.prominent_log(f"Processing group starting at row {start_row}")
+        generate_and_process_prompts(start_row, columns, group)
+    excel_manager.file_handler.flush()
 
 
 if __name__ == "__main__":
@@ -12,8 +12,8 @@ from scripts.initialize import (
 )
 
 
-def get_direction(start_row, columns):
-    heading = excel_manager.cell_handler.get_cell_value(start_row, columns["heading"])
+def get_direction(start_row, columns, group):
+    heading = group["heading"][0]
     heading_list = text_splitter.split_string_to_lines(heading)
     heading_list = array_remover.remove_elements(
         heading_list, CREATE_BLOG_WP_GET_DIRECTION_REMOVE_TEXT
@@ -35,9 +35,13 @@ def get_direction(start_row, columns):
 
 def main():
     if not excel_manager.set_info(
-        CREATE_BLOG_WP_EXCEL_FILE_FULL_PATH, CREATE_BLOG_WP_EXCEL_SHEET_NAME
+        CREATE_BLOG_WP_EXCEL_FILE_FULL_PATH,
+        CREATE_BLOG_WP_EXCEL_SHEET_NAME,
+        use_snapshot=True,
+        use_cache=True,
     ):
         return
+    excel_manager.enable_blob_store(CREATE_BLOG_WP_EXCEL_BLOB_THRESHOLD)
 
     columns = excel_manager.search_handler.find_and_map_column_indices(
         index=CREATE_BLOG_WP_EXCEL_INDEX_ROW,
@@ -46,17 +50,16 @@ def main():
     if value_validator.any_invalid(columns):
         return
 
-    flag_end_row = excel_manager.cell_handler.get_last_row_of_column(
-        column=columns["flag"]
-    )
-    for i in range(flag_end_row):
-        start_row = i * CREATE_BLOG_WP_EXCEL_GROUP_SIZE + CREATE_BLOG_WP_EXCEL_START_ROW
-        flag = excel_manager.cell_handler.get_cell_value(start_row, columns["flag"])
-        if value_validator.is_valid(flag):
-            logger.prominent_log(
-                f"Google get heading, processing group starting at row {start_row}"
-            )
-            get_direction(start_row, columns)
+    for start_row, group in excel_manager.iterate_flagged_groups(
+        group_size=CREATE_BLOG_WP_EXCEL_GROUP_SIZE,
+        start_row=CREATE_BLOG_WP_EXCEL_START_ROW,
+        flag_column=columns["flag"],
+        columns=columns,
+    ):
+        logger.prominent_log(
+            f"Google get heading, processing group starting at row {start_row}"
+        )
+        get_direction(start_row, columns, group)
 
 
 if __name__ == "__main__":
@@ -14,19 +14,15 @@ from scripts.initialize import (
     bing_handler,
     chatgpt_handler,
     value_validator,
-    web_scraper,
 )
 
 
-def generate_and_process_prompts(start_row, columns):
+def generate_and_process_prompts(start_row, columns, group):
     """指定されたグループのプロンプトを生成し、処理する"""
-    theme = excel_manager.cell_handler.get_cell_value(start_row, columns["theme"])
-    directions = excel_manager.cell_handler.get_range_values(
-        start_row=start_row,
-        column=columns["direction"],
-        num_rows=CREATE_BLOG_WP_EXCEL_GROUP_SIZE,
-    )
-    if not value_validator.any_valid(directions):
+    theme = group["theme"][0]
+    directions = group["direction"]
+    valid_directions = value_validator.mask_valid(directions)
+    if not valid_directions.any():
         return
 
     logger.info("open browser")
@@ -34,7 +30,7 @@ def generate_and_process_prompts(start_row, columns):
 
     logger.info("send direction")
     for i, direction in enumerate(directions):
-        if value_validator.is_valid(direction):
+        if valid_directions[i]:
             prompt_head = prompt_generator.replace_marker(
                 prompt=CREATE_BLOG_WP_GET_EVIDENCE_CHATGPT_PROMPT,
                 theme=theme,
@@ -52,11 +48,23 @@ def generate_and_process_prompts(start_row, columns):
         case GetContentMethod.HTML:
             logger.info("convert html to md")
             html_file_name = CREATE_BLOG_WP_GET_EVIDENCE_FILE_NAME + EXTENSION_HTML
-            edge_handler.ui_save_html(html_file_name)
             html_file_full_path = DOWNLOAD_FOLDER_DIR_FULL_PATH + html_file_name
-            if file_handler.exists(html_file_full_path):
-                html_content = file_reader.read_file(html_file_full_path)
-            results = web_scraper.find_elements(
+            if not edge_handler.ui_save_html(
+                html_file_name,
+                CREATE_BLOG_WP_GET_EVIDENCE_FILE_NAME + DOWNLOAD_HTML_FOLDER_SUFFIX,
+            ):
+                logger.error(f"failed to save html, skip this group: {theme}")
+                if file_handler.exists(html_file_full_path):
+                    file_handler.delete_file(html_file_full_path)
+                folder_remover.remove_folder(
+                    DOWNLOAD_FOLDER_DIR_FULL_PATH
+                    + CREATE_BLOG_WP_GET_EVIDENCE_FILE_NAME
+                    + DOWNLOAD_HTML_FOLDER_SUFFIX
+                )
+                edge_handler.close_tab()
+                return
+            html_content = file_reader.read_file(html_file_full_path)
+            results = text_converter.find_elements(
                 html_content,
                 tag_name=CHATGPT_OUTPUT_TAG,
                 class_list=CHATGPT_OUTPUT_CLASS_LIST,
@@ -89,9 +97,14 @@ def generate_and_process_prompts(start_row, columns):
 
 def main():
     if not excel_manager.set_info(
-        CREATE_BLOG_WP_EXCEL_FILE_FULL_PATH, CREATE_BLOG_WP_EXCEL_SHEET_NAME
+        CREATE_BLOG_WP_EXCEL_FILE_FULL_PATH,
+        CREATE_BLOG_WP_EXCEL_SHEET_NAME,
+        use_snapshot=True,
+        use_cache=True,
     ):
         return
+    excel_manager.enable_blob_store(CREATE_BLOG_WP_EXCEL_BLOB_THRESHOLD)
+    excel_manager.file_handler.set_async_save(CREATE_BLOG_WP_EXCEL_ASYNC_SAVE)
 
     columns = excel_manager.search_handler.find_and_map_column_indices(
         index=CREATE_BLOG_WP_EXCEL_INDEX_ROW,
@@ -100,10 +113,6 @@ def main():
     if value_validator.any_invalid(columns):
         return
 
-    flag_end_row = excel_manager.cell_handler.get_last_row_of_column(
-        column=columns["flag"]
-    )
-
     chatgpt_handler.set_info(
         wait_time_after_prompt_long=WAIT_TIME_AFTER_PROMPT_LONG,
         wait_time_after_prompt_medium=WAIT_TIME_AFTER_PROMPT_MEDIUM,
@@ -115,12 +124,15 @@ def main():
         tab_count_4omini=TAB_COUNT_4OMINI,
         tab_count_gpts=TAB_COUNT_GPTS,
     )
-    for i in range(flag_end_row):
-        start_row = i * CREATE_BLOG_WP_EXCEL_GROUP_SIZE + CREATE_BLOG_WP_EXCEL_START_ROW
-        flag = excel_manager.cell_handler.get_cell_value(start_row, columns["flag"])
-        if value_validator.is_valid(flag):
-            logger.prominent_log(f"Processing group starting at row {start_row}")
-            generate_and_process_prompts(start_row, columns)
+    for start_row, group in excel_manager.iterate_flagged_groups(
+        group_size=CREATE_BLOG_WP_EXCEL_GROUP_SIZE,
+        start_row=CREATE_BLOG_WP_EXCEL_START_ROW,
+        flag_column=columns["flag"],
+        columns=columns,
+    ):
+        logger.prominent_log(f"Processing group starting at row {start_row}")
+        generate_and_process_prompts(start_row, columns, group)
+    excel_manager.file_handler.flush()
 
 
 if __name__ == "__main__":
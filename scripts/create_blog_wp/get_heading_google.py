@@ -8,7 +8,6 @@ from scripts.initialize import (
     chatgpt_handler,
     file_handler,
     file_reader,
-    web_scraper,
     text_converter,
     value_validator,
     google_search_analyzer,
@@ -18,8 +17,8 @@ from scripts.initialize import (
 )
 
 
-def get_heading(start_row, columns):
-    theme = excel_manager.cell_handler.get_cell_value(start_row, columns["theme"])
+def get_heading(start_row, columns, group):
+    theme = group["theme"][0]
 
     heading_results = google_search_analyzer.extract_heading(theme)
     results_str = []
@@ -52,11 +51,28 @@ def get_heading(start_row, columns):
             html_file_name = (
                 CREATE_BLOG_WP_GET_HEADING_GOOGLE_FILE_NAME + EXTENSION_HTML
             )
-            edge_handler.ui_save_html(html_file_name)
             chatgpt_html_path = DOWNLOAD_FOLDER_DIR_FULL_PATH + html_file_name
-            if file_handler.exists(chatgpt_html_path):
-                chatgpt_html = file_reader.read_file(chatgpt_html_path)
-            results = web_scraper.find_elements(
+            if not edge_handler.ui_save_html(
+                html_file_name,
+                CREATE_BLOG_WP_GET_HEADING_GOOGLE_FILE_NAME
+                + DOWNLOAD_HTML_FOLDER_SUFFIX,
+            ):
+                logger.error(f"failed to save html, skip this group: {theme}")
+                if file_handler.exists(chatgpt_html_path):
+                    file_handler.delete_file(chatgpt_html_path)
+                folder_remover.remove_folder(
+                    folder_path_handler.join_and_normalize_path(
+                        [
+                            DOWNLOAD_FOLDER_DIR_FULL_PATH,
+                            CREATE_BLOG_WP_GET_HEADING_GOOGLE_FILE_NAME
+                            + DOWNLOAD_HTML_FOLDER_SUFFIX,
+                        ]
+                    )
+                )
+                edge_handler.close_tab()
+                return
+            chatgpt_html = file_reader.read_file(chatgpt_html_path)
+            results = text_converter.find_elements(
                 chatgpt_html,
                 tag_name=CHATGPT_OUTPUT_TAG,
                 class_list=CHATGPT_OUTPUT_CLASS_LIST,
@@ -95,9 +111,14 @@ def get_heading(start_row, columns):
 
 def main():
     if not excel_manager.set_info(
-        CREATE_BLOG_WP_EXCEL_FILE_FULL_PATH, CREATE_BLOG_WP_EXCEL_SHEET_NAME
+        CREATE_BLOG_WP_EXCEL_FILE_FULL_PATH,
+        CREATE_BLOG_WP_EXCEL_SHEET_NAME,
+        use_snapshot=True,
+        use_cache=True,
     ):
         return
+    excel_manager.enable_blob_store(CREATE_BLOG_WP_EXCEL_BLOB_THRESHOLD)
+    excel_manager.file_handler.set_async_save(CREATE_BLOG_WP_EXCEL_ASYNC_SAVE)
 
     columns = excel_manager.search_handler.find_and_map_column_indices(
         index=CREATE_BLOG_WP_EXCEL_INDEX_ROW,
@@ -106,10 +127,6 @@ def main():
     if value_validator.any_invalid(columns):
         return
 
-    flag_end_row = excel_manager.cell_handler.get_last_row_of_column(
-        column=columns["flag"]
-    )
-
     chatgpt_handler.set_info(
         wait_time_after_prompt_long=WAIT_TIME_AFTER_PROMPT_LONG,
         wait_time_after_prompt_medium=WAIT_TIME_AFTER_PROMPT_MEDIUM,
@@ -121,14 +138,17 @@ def main():
         tab_count_4omini=TAB_COUNT_4OMINI,
         tab_count_gpts=TAB_COUNT_GPTS,
     )
-    for i in range(flag_end_row):
-        start_row = i * CREATE_BLOG_WP_EXCEL_GROUP_SIZE + CREATE_BLOG_WP_EXCEL_START_ROW
-        flag = excel_manager.cell_handler.get_cell_value(start_row, columns["flag"])
-        if value_validator.is_valid(flag):
-            logger.prominent_log(
-                f"Google get heading, processing group starting at row {start_row}"
-            )
-            get_heading(start_row, columns)
+    for start_row, group in excel_manager.iterate_flagged_groups(
+        group_size=CREATE_BLOG_WP_EXCEL_GROUP_SIZE,
+        start_row=CREATE_BLOG_WP_EXCEL_START_ROW,
+        flag_column=columns["flag"],
+        columns=columns,
+    ):
+        logger.prominent_log(
+            f"Google get heading, processing group starting at row {start_row}"
+        )
+        get_heading(start_row, columns, group)
+    excel_manager.file_handler.flush()
 
 
 if __name__ == "__main__":
@@ -10,8 +10,8 @@ from scripts.initialize import (
 )
 
 
-def get_themes(start_row, columns):
-    theme = excel_manager.cell_handler.get_cell_value(start_row, columns["theme"])
+def get_themes(start_row, columns, group):
+    theme = group["theme"][0]
 
     related_keywords = google_search_analyzer.get_related_keyword(theme)
     logger.log_related_keywords(theme, related_keywords)
@@ -37,9 +37,13 @@ def get_themes(start_row, columns):
 def main():
     try:
         if not excel_manager.set_info(
-            CREATE_BLOG_WP_EXCEL_FILE_FULL_PATH, CREATE_BLOG_WP_EXCEL_SHEET_NAME
+            CREATE_BLOG_WP_EXCEL_FILE_FULL_PATH,
+            CREATE_BLOG_WP_EXCEL_SHEET_NAME,
+            use_snapshot=True,
+            use_cache=True,
         ):
             return
+        excel_manager.enable_blob_store(CREATE_BLOG_WP_EXCEL_BLOB_THRESHOLD)
 
         columns = excel_manager.search_handler.find_and_map_column_indices(
             index=CREATE_BLOG_WP_EXCEL_INDEX_ROW,
@@ -48,19 +52,16 @@ def main():
         if value_validator.any_invalid(columns):
             return
 
-        flag_end_row = excel_manager.cell_handler.get_last_row_of_column(
-            column=columns["flag"]
-        )
-        for i in range(flag_end_row):
-            start_row = (
-                i * CREATE_BLOG_WP_EXCEL_GROUP_SIZE + CREATE_BLOG_WP_EXCEL_START_ROW
+        for start_row, group in excel_manager.iterate_flagged_groups(
+            group_size=CREATE_BLOG_WP_EXCEL_GROUP_SIZE,
+            start_row=CREATE_BLOG_WP_EXCEL_START_ROW,
+            flag_column=columns["flag"],
+            columns=columns,
+        ):
+            logger.prominent_log(
+                f"Google get theme, processing group starting at row {start_row}"
             )
-            flag = excel_manager.cell_handler.get_cell_value(start_row, columns["flag"])
-            if value_validator.is_valid(flag):
-                logger.prominent_log(
-                    f"Google get theme, processing group starting at row {start_row}"
-                )
-                get_themes(start_row, columns)
+            get_themes(start_row, columns, group)
 
     except Exception as e:
         logger.error(f"An error occurred: {str(e)}")
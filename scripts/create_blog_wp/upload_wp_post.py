@@ -13,44 +13,40 @@ from scripts.initialize import (
 )
 
 
-def upload_wp_post(start_row, columns):
+def upload_wp_post(start_row, columns, group):
     match GET_CONTENT_METHOD:
         case GetContentMethod.HTML:
-            html_array = excel_manager.cell_handler.get_range_values(
-                start_row,
-                columns["html"],
-                CREATE_BLOG_WP_EXCEL_GROUP_SIZE,
-            )
+            html_array = group["html"]
             html_array = array_combiner.merge_elements(
                 html_array, CREATE_BLOG_WP_EXCEL_GROUP_SIZE
             )
             html = html_array[0]
             h2_count = text_finder.count_occurrences(html, "<h2>")
-            html = text_replacer.replace(html, "<b>", "")
-            html = text_replacer.replace(html, "</b>", "")
-            html = text_replacer.replace(html, "<strong>", "")
-            html = text_replacer.replace(html, "</strong>", "")
+            replacements = {
+                "<b>": "",
+                "</b>": "",
+                "<strong>": "",
+                "</strong>": "",
+            }
             if h2_count < 3:
-                html = text_replacer.replace(html, "<h3>", "<h2>")
-                html = text_replacer.replace(html, "</h3>", "</h2>")
-                html = text_replacer.replace(html, "<h4>", "<h4>")
-                html = text_replacer.replace(html, "</h4>", "</h3>")
-                html = text_replacer.replace(html, "<h5>", "<h4>")
-                html = text_replacer.replace(html, "</h5>", "</h4>")
+                replacements.update(
+                    {
+                        "<h3>": "<h2>",
+                        "</h3>": "</h2>",
+                        "</h4>": "</h3>",
+                        "<h5>": "<h4>",
+                        "</h5>": "</h4>",
+                    }
+                )
+            html = text_replacer.replace_many(html, replacements)
         case GetContentMethod.SHORTCUT:
-            html_array = excel_manager.cell_handler.get_range_values(
-                start_row,
-                columns["html"],
-                CREATE_BLOG_WP_EXCEL_GROUP_SIZE,
-            )
+            html_array = group["html"]
             html = array_joiner.join_to_string(html_array)
 
-    title = excel_manager.cell_handler.get_cell_value(start_row, columns["title"])
-    description = excel_manager.cell_handler.get_cell_value(
-        start_row, columns["description"]
-    )
-    keywords = excel_manager.cell_handler.get_cell_value(start_row, columns["keywords"])
-    link = excel_manager.cell_handler.get_cell_value(start_row, columns["link"])
+    title = group["title"][0]
+    description = group["description"][0]
+    keywords = group["keywords"][0]
+    link = group["link"][0]
 
     post_id = wp_manager.create_post(
         title=title,
@@ -72,9 +68,13 @@ def upload_wp_post(start_row, columns):
 
 def main():
     if not excel_manager.set_info(
-        CREATE_BLOG_WP_EXCEL_FILE_FULL_PATH, CREATE_BLOG_WP_EXCEL_SHEET_NAME
+        CREATE_BLOG_WP_EXCEL_FILE_FULL_PATH,
+        CREATE_BLOG_WP_EXCEL_SHEET_NAME,
+        use_snapshot=True,
+        use_cache=True,
     ):
         return
+    excel_manager.enable_blob_store(CREATE_BLOG_WP_EXCEL_BLOB_THRESHOLD)
 
     columns = excel_manager.search_handler.find_and_map_column_indices(
         index=CREATE_BLOG_WP_EXCEL_INDEX_ROW,
@@ -83,15 +83,14 @@ def main():
     if value_validator.any_invalid(columns):
         return
 
-    flag_end_row = excel_manager.cell_handler.get_last_row_of_column(
-        column=columns["flag"]
-    )
-    for i in range(flag_end_row):
-        start_row = i * CREATE_BLOG_WP_EXCEL_GROUP_SIZE + CREATE_BLOG_WP_EXCEL_START_ROW
-        flag = excel_manager.cell_handler.get_cell_value(start_row, columns["flag"])
-        if value_validator.is_valid(flag):
-            logger.prominent_log(f"Processing group starting at row {start_row}")
-            upload_wp_post(start_row, columns)
+    for start_row, group in excel_manager.iterate_flagged_groups(
+        group_size=CREATE_BLOG_WP_EXCEL_GROUP_SIZE,
+        start_row=CREATE_BLOG_WP_EXCEL_START_ROW,
+        flag_column=columns["flag"],
+        columns=columns,
+    ):
+        logger.prominent_log(f"Processing group starting at row {start_row}")
+        upload_wp_post(start_row, columns, group)
 
 
 if __name__ == "__main__":
@@ -46,6 +46,12 @@ def main():
     if value_validator.any_invalid(columns):
         return
 
+    slug_mirror = excel_manager.enable_sqlite_mirror(
+        columns, CREATE_SNS_EXCEL_START_ROW, key_columns=["slug"]
+    )
+    if slug_mirror is None:
+        return
+
     all_slugs = get_blog_slugs()
 
     logger.prominent_log(f"Total slugs retrieved: {len(all_slugs)}")
@@ -55,14 +61,7 @@ def main():
             target_row, columns["slug"]
         ):
             target_row += 1
-        if (
-            excel_manager.search_handler.find_matching_index(
-                index=columns["slug"],
-                search_string=slug,
-                is_row_flag=False,
-            )
-            == None
-        ):
+        if not slug_mirror.contains("slug", slug):
             excel_manager.cell_handler.update_cell(target_row, columns["flag"], "1")
             excel_manager.cell_handler.update_cell(target_row, columns["slug"], slug)
 
@@ -48,10 +48,6 @@ def main():
     if value_validator.any_invalid(columns):
         return
 
-    flag_end_row = excel_manager.cell_handler.get_last_row_of_column(
-        column=columns["flag"]
-    )
-
     chatgpt_handler.set_info(
         wait_time_after_prompt_long=WAIT_TIME_AFTER_PROMPT_LONG,
         wait_time_after_prompt_medium=WAIT_TIME_AFTER_PROMPT_MEDIUM,
@@ -60,9 +56,12 @@ def main():
         short_wait_time=KEYBOARD_ACTION_SHORT_DELAY,
         model_type=MODEL_TYPE_GPTS,
     )
-    for start_row in range(CREATE_SNS_EXCEL_START_ROW, flag_end_row + 1):
-        flag = excel_manager.cell_handler.get_cell_value(start_row, columns["flag"])
-        if value_validator.is_valid(flag):
+    with excel_manager.transaction(save_interval=CREATE_SNS_EXCEL_SAVE_INTERVAL):
+        for start_row, _ in excel_manager.iterate_flagged_groups(
+            group_size=1,
+            start_row=CREATE_SNS_EXCEL_START_ROW,
+            flag_column=columns["flag"],
+        ):
             logger.prominent_log(
                 f"Google get heading, processing group starting at row {start_row}"
             )
@@ -69,14 +69,13 @@ def main():
     if value_validator.any_invalid(columns):
         return
 
-    flag_end_row = excel_manager.cell_handler.get_last_row_of_column(
-        column=columns["flag"]
-    )
-    for start_row in range(CREATE_SNS_EXCEL_START_ROW, flag_end_row + 1):
-        flag = excel_manager.cell_handler.get_cell_value(start_row, columns["flag"])
-        if value_validator.is_valid(flag):
-            logger.prominent_log(f"Updating GAS content, processing row {start_row}")
-            update_gas_content(start_row, columns)
+    for start_row, _ in excel_manager.iterate_flagged_groups(
+        group_size=1,
+        start_row=CREATE_SNS_EXCEL_START_ROW,
+        flag_column=columns["flag"],
+    ):
+        logger.prominent_log(f"Updating GAS content, processing row {start_row}")
+        update_gas_content(start_row, columns)
 
 
 if __name__ == "__main__":
@@ -8,12 +8,14 @@ if project_root not in sys.path:
 from scripts.load_env import *
 from src.excel_operations.excel_manager import ExcelManager
 from src.web_operations.edge_handler import EdgeHandler
+from src.file_operations.download_watcher import DownloadWatcher
 from src.input_operations.keyboard_handler import KeyboardHandler
 from src.ai_operations.chatgpt_handler import ChatGPTHandler
 from src.text_operations.prompt_generator import PromptGenerator
 from src.file_operations.file_processor import (
     FileHandler,
     FileReader,
+    FrontMatterReader,
     FileWriter,
     FilePathHandler,
     FileProcessor,
@@ -37,6 +39,7 @@ from src.folder_operations.folder_processor import (
     FolderLister,
     FolderRenamer,
 )
+from src.folder_operations.folder_index import FolderIndex
 from src.wp_operations.wp_manager import WordPressAPI
 from src.ai_operations.bing_handler import BingHandler
 from src.web_operations.web_handler import WebScraper, HTMLParser, WebFetcher
@@ -59,6 +62,8 @@ from src.gas_operations.gas_manager import GasManager
 logger = CustomLogger(__name__)
 excel_manager = ExcelManager()
 edge_handler = EdgeHandler()
+download_watcher = DownloadWatcher(DOWNLOAD_FOLDER_DIR_FULL_PATH)
+edge_handler.set_download_watcher(download_watcher)
 keyboard_handler = KeyboardHandler(short_wait_time=KEYBOARD_ACTION_SHORT_DELAY)
 chatgpt_handler = ChatGPTHandler()
 prompt_generator = PromptGenerator(
@@ -69,6 +74,8 @@ text_manager = TextManager()
 file_handler = FileHandler()
 file_writer = FileWriter()
 file_reader = FileReader()
+front_matter_reader = FrontMatterReader()
+folder_index = FolderIndex(front_matter_reader)
 file_validator = FileValidator()
 file_path_handler = FilePathHandler()
 file_processor = FileProcessor(file_handler, file_validator)
@@ -224,6 +224,12 @@ CREATE_BLOG_WP_EXCEL_SHEET_NAME = get_env("CREATE_BLOG_WP_EXCEL_SHEET_NAME")
 CREATE_BLOG_WP_EXCEL_GROUP_SIZE = get_env("CREATE_BLOG_WP_EXCEL_GROUP_SIZE", 10, int)
 CREATE_BLOG_WP_EXCEL_INDEX_ROW = get_env("CREATE_BLOG_WP_EXCEL_INDEX_ROW", 1, int)
 CREATE_BLOG_WP_EXCEL_START_ROW = get_env("CREATE_BLOG_WP_EXCEL_START_ROW", 2, int)
+CREATE_BLOG_WP_EXCEL_BLOB_THRESHOLD = get_env(
+    "CREATE_BLOG_WP_EXCEL_BLOB_THRESHOLD", 0, int
+)
+CREATE_BLOG_WP_EXCEL_ASYNC_SAVE = (
+    get_env("CREATE_BLOG_WP_EXCEL_ASYNC_SAVE", "false").lower() == "true"
+)
 CREATE_BLOG_WP_EXCEL_INDEX_STRINGS = get_env(
     "CREATE_BLOG_WP_EXCEL_INDEX_STRINGS"
 ).split(",")
@@ -338,6 +344,7 @@ CREATE_SNS_EXCEL_SHEET_NAME = get_env("CREATE_SNS_EXCEL_SHEET_NAME")
 CREATE_SNS_EXCEL_INDEX_ROW = get_env("CREATE_SNS_EXCEL_INDEX_ROW", 1, int)
 CREATE_SNS_EXCEL_START_ROW = get_env("CREATE_SNS_EXCEL_START_ROW", 2, int)
 CREATE_SNS_EXCEL_INDEX_STRINGS = get_env("CREATE_SNS_EXCEL_INDEX_STRINGS").split(",")
+CREATE_SNS_EXCEL_SAVE_INTERVAL = get_env("CREATE_SNS_EXCEL_SAVE_INTERVAL", 300, int)
 # prompt
 CREATE_SNS_PROMPT = get_env("CREATE_SNS_PROMPT")
 # gas
@@ -13,6 +13,7 @@ def main():
     if not excel_manager.set_info(
         STACKOVERFLOW_GET_SLUG_EXCEL_FILE_FULL_PATH,
         STACKOVERFLOW_GET_SLUG_EXCEL_SHEET_NAME,
+        read_only=True,
     ):
         return
     columns = excel_manager.search_handler.find_and_map_column_indices(
@@ -22,12 +23,18 @@ def main():
     if value_validator.any_invalid(columns):
         return
 
-    for row, link in excel_manager.cell_handler.iterate_column_values(
-        column=columns["link"],
-        start_row=STACKOVERFLOW_GET_SLUG_EXCEL_START_ROW,
-    ):
-        pattern = r"/questions/\d+/([^/?]+)"
-        slug = text_finder.extract_pattern(link, pattern)
+    pattern = r"/questions/\d+/([^/?]+)"
+    slugs = [
+        (row, text_finder.extract_pattern(link, pattern))
+        for row, link in excel_manager.cell_handler.iterate_column_values(
+            column=columns["link"],
+            start_row=STACKOVERFLOW_GET_SLUG_EXCEL_START_ROW,
+        )
+    ]
+
+    if not excel_manager.ensure_writable():
+        return
+    for row, slug in slugs:
         excel_manager.cell_handler.update_cell(row, columns["slug"], slug)
 
     excel_manager.file_handler.save()
@@ -18,11 +18,22 @@ from scripts.initialize import (
 def get_links(url):
     edge_handler.open_url_in_browser(url)
     html_file_name = STANDALONE_GET_ELEM_IN_HTML_FILE_NAME + EXTENSION_HTML
-    edge_handler.ui_save_html(html_file_name)
-
     html_path = DOWNLOAD_FOLDER_DIR_FULL_PATH + html_file_name
-    if file_handler.exists(html_path):
-        html_content = file_reader.read_file(html_path)
+    if not edge_handler.ui_save_html(
+        html_file_name,
+        STANDALONE_GET_ELEM_IN_HTML_FILE_NAME + DOWNLOAD_HTML_FOLDER_SUFFIX,
+    ):
+        logger.error(f"failed to save html, skip this page: {url}")
+        if file_handler.exists(html_path):
+            file_handler.delete_file(html_path)
+        folder_remover.remove_folder(
+            DOWNLOAD_FOLDER_DIR_FULL_PATH
+            + STANDALONE_GET_ELEM_IN_HTML_FILE_NAME
+            + DOWNLOAD_HTML_FOLDER_SUFFIX
+        )
+        return []
+
+    html_content = file_reader.read_file(html_path)
     html_parser.set_html_content(html_content)
     href_links = web_scraper.find_elements_with_attributes(
         html_content=html_content,
@@ -54,6 +65,12 @@ def main():
     if value_validator.any_invalid(columns):
         return
 
+    link_mirror = excel_manager.enable_sqlite_mirror(
+        columns, STANDALONE_GET_ELEM_IN_HTML_EXCEL_START_ROW, key_columns=["link"]
+    )
+    if link_mirror is None:
+        return
+
     urls = [
         f"{STANDALONE_GET_ELEM_IN_HTML_BASE_URL}page={page}&tab=Relevance&pagesize=50&q=hasaccepted%3ayes%20{CREATE_BLOG_MD_TARGET_TAG_NAME}&searchOn=3"
         for page in range(
@@ -75,14 +92,7 @@ def main():
             ):
                 target_row += 1
 
-            if (
-                excel_manager.search_handler.find_matching_index(
-                    index=columns["link"],
-                    search_string=href_link,
-                    is_row_flag=False,
-                )
-                == None
-            ):
+            if not link_mirror.contains("link", href_link):
                 excel_manager.cell_handler.update_cell(
                     target_row, columns["link"], href_link
                 )
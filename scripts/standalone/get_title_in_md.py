@@ -5,15 +5,15 @@ from scripts.initialize import (
     logger,
     excel_manager,
     value_validator,
-    file_reader,
+    front_matter_reader,
     file_path_handler,
     folder_path_handler,
     folder_lister,
-    text_finder,
 )
 
 
 def get_title_in_md(columns):
+    target_files = {}
     for row, folder_name in excel_manager.cell_handler.iterate_column_values(
         column=columns["folder_name"],
         start_row=STANDALONE_GET_TITLE_IN_MD_EXCEL_START_ROW,
@@ -29,12 +29,15 @@ def get_title_in_md(columns):
         )
 
         if index_files:
-            file_full_path = index_files[0]
-            lines = file_reader.read_file_line_list(file_full_path)
-            text = text_finder.find_line_starting_with(
-                lines, STANDALONE_GET_TITLE_IN_MD_TARGET_TEXT
-            )
-            excel_manager.cell_handler.update_cell(row, columns["title_full"], text)
+            target_files[row] = index_files[0]
+
+    titles = front_matter_reader.find_lines_starting_with(
+        list(target_files.values()), STANDALONE_GET_TITLE_IN_MD_TARGET_TEXT
+    )
+    for row, file_full_path in target_files.items():
+        excel_manager.cell_handler.update_cell(
+            row, columns["title_full"], titles[file_full_path]
+        )
 
 
 def main():
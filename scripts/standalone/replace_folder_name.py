@@ -40,14 +40,24 @@ def main():
             excel_manager.cell_handler.get_cell_value(row, columns["new_folder_name"])
         )
 
-    for i in range(len(replacement_folder_list)):
-        logger.info(folder_list[i])
-        logger.info(replacement_folder_list[i])
-        folder_renamer.rename_folder_in_directory(
-            directory=STANDALONE_REPLACE_FOLDER_NAME_TARGET_FOLDER_FULL_PATH,
-            old_name=folder_list[i],
-            new_name=replacement_folder_list[i],
-        )
+    directory = STANDALONE_REPLACE_FOLDER_NAME_TARGET_FOLDER_FULL_PATH
+    # 前回の実行が中断されていた場合は、続きから再開する
+    if folder_renamer.has_journal(directory):
+        result = folder_renamer.resume(directory)
+        logger.info(f"Renamed {result['renamed']} folders from the interrupted run")
+        if not result["completed"]:
+            return
+
+    mapping = {}
+    for folder_name, new_folder_name in zip(folder_list, replacement_folder_list):
+        if folder_name is None or new_folder_name is None:
+            continue
+        logger.info(f"{folder_name} -> {new_folder_name}")
+        mapping[str(folder_name)] = str(new_folder_name)
+    result = folder_renamer.rename_many(directory, mapping)
+    logger.info(
+        f"Renamed {result['renamed']} folders, skipped {len(result['skipped'])}"
+    )
 
 
 if __name__ == "__main__":
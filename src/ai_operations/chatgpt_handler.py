@@ -195,7 +195,8 @@ class ChatGPTHandler:
         pyperclip.copy(prompt)
         self.paste_and_send_message()
         logger.debug("Prompt sent and message generation initiated")
-        time.sleep(self.wait_time_after_prompt_long)
+        with logger.span("chatgpt.wait", seconds=self.wait_time_after_prompt_long):
+            time.sleep(self.wait_time_after_prompt_long)
 
         for i in range(repeat_count):
             edge_handler.activate_edge()
@@ -203,4 +204,7 @@ class ChatGPTHandler:
             self.move_to_generate_button()
             self.press_hotkey(["enter"])
             logger.debug(f"Generation button pressed (iteration {i+1}/{repeat_count})")
-            time.sleep(self.wait_time_after_prompt_medium)
+            with logger.span(
+                "chatgpt.wait", seconds=self.wait_time_after_prompt_medium
+            ):
+                time.sleep(self.wait_time_after_prompt_medium)
@@ -0,0 +1,85 @@
+import hashlib
+import os
+from typing import Any
+from src.log_operations.log_handlers import CustomLogger
+
+
+class ExcelBlobStore:
+    """
+    サイズの大きいセルの値をワークブックの外のファイルに保存し、
+    セルには短い参照文字列のみを書き込むためのクラス。
+    ファイルは内容の SHA-256 をファイル名とするため、同じ内容は1つのファイルにまとめられる。
+    """
+
+    REFERENCE_PREFIX = "blob:sha256:"
+
+    def __init__(self, blob_dir: str, threshold: int):
+        """
+        :param blob_dir: 値を保存するフォルダ
+        :param threshold: この文字数を超える文字列をファイルに保存する
+        """
+        self.logger = CustomLogger(__name__)
+        self.blob_dir = blob_dir
+        self.threshold = threshold
+
+    @staticmethod
+    def get_default_blob_dir(file_path: str) -> str:
+        """
+        ワークブックと同じフォルダにある「<ファイル名>_blobs」フォルダのパスを返します。
+        :param file_path: ワークブックのパス
+        :return: フォルダのパス
+        """
+        directory, file_name = os.path.split(os.path.abspath(file_path))
+        return os.path.join(directory, f"{os.path.splitext(file_name)[0]}_blobs")
+
+    def _get_blob_path(self, digest: str) -> str:
+        return os.path.join(self.blob_dir, digest[:2], digest)
+
+    def is_reference(self, value: Any) -> bool:
+        """
+        値が参照文字列かどうかを返します。
+        """
+        return isinstance(value, str) and value.startswith(self.REFERENCE_PREFIX)
+
+    def should_externalize(self, value: Any) -> bool:
+        """
+        値がファイルに保存する対象（閾値を超える文字列）かどうかを返します。
+        """
+        return isinstance(value, str) and len(value) > self.threshold
+
+    def put(self, value: str) -> str:
+        """
+        値をファイルに保存し、参照文字列を返します。同じ内容のファイルが既にある場合は書き込みません。
+        :param value: 保存する文字列
+        :return: 参照文字列
+        """
+        data = value.encode("utf-8")
+        digest = hashlib.sha256(data).hexdigest()
+        blob_path = self._get_blob_path(digest)
+        if not os.path.exists(blob_path):
+            os.makedirs(os.path.dirname(blob_path), exist_ok=True)
+            temp_path = f"{blob_path}.tmp"
+            with open(temp_path, "wb") as f:
+                f.write(data)
+            os.replace(temp_path, blob_path)
+            self.logger.debug(f"Stored blob {digest} ({len(data)} bytes)")
+        else:
+            self.logger.debug(f"Blob {digest} already exists")
+        return self.REFERENCE_PREFIX + digest
+
+    def resolve(self, value: Any) -> Any:
+        """
+        値が参照文字列の場合はファイルの内容を返し、それ以外の場合は値をそのまま返します。
+        :param value: セルの値
+        :return: 解決した値（ファイルが見つからない場合は参照文字列のまま）
+        """
+        if not self.is_reference(value):
+            return value
+        digest = value[len(self.REFERENCE_PREFIX) :]
+        blob_path = self._get_blob_path(digest)
+        try:
+            with open(blob_path, "rb") as f:
+                return f.read().decode("utf-8")
+        except OSError as e:
+            self.logger.error(f"Failed to read blob {blob_path}: {str(e)}")
+            return value
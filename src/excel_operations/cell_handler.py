@@ -1,5 +1,12 @@
+import logging
+import threading
+from bisect import bisect_right
+from typing import Dict, List, Optional
+from openpyxl.cell.cell import ILLEGAL_CHARACTERS_RE
+from openpyxl.utils.cell import column_index_from_string
 from openpyxl.utils.exceptions import IllegalCharacterError
 import pandas as pd
+from .sheet_snapshot import ExcelSheetSnapshot
 from src.log_operations.log_handlers import CustomLogger
 
 logger = CustomLogger(__name__)
@@ -12,15 +19,179 @@ class ExcelCellHandler:
         """
         self.logger = CustomLogger(__name__)
         self.worksheet = None
+        self.search_handler = None
+        self.writable_handler = None
+        self.snapshot = None
+        self.transaction = None
+        self.blob_store = None
+        self.sqlite_mirror = None
+        self.workbook_lock = threading.RLock()
+        self.write_listener = None
+        self._filled_rows: Optional[Dict[int, List[int]]] = None
+        self._non_empty_rows: Optional[Dict[int, List[int]]] = None
 
-    def set_worksheet(self, worksheet):
+    def set_worksheet(self, worksheet, keep_snapshot=False):
         """
         ワークシートを設定します。
         :param worksheet: 対象のワークシート
+        :param keep_snapshot: True の場合、同じシートを読み込み直したものとしてスナップショットを維持する
         """
         self.worksheet = worksheet
+        if not keep_snapshot:
+            self.snapshot = None
+            self.invalidate_row_index()
         self.logger.debug("Worksheet has been set successfully.")
 
+    def set_transaction(self, transaction):
+        """
+        セルの書き込みを記録するトランザクションを設定します。None で解除します。
+        :param transaction: ExcelWriteTransaction のインスタンス
+        """
+        self.transaction = transaction
+
+    def set_blob_store(self, blob_store):
+        """
+        サイズの大きい値をワークブックの外に保存する ExcelBlobStore を設定します。None で解除します。
+        設定中は閾値を超える文字列はファイルに保存され、セルには参照文字列のみが書き込まれる。
+        参照文字列は get_cell_value() や get_range_values() などの読み取り時に元の値に解決される。
+        :param blob_store: ExcelBlobStore のインスタンス
+        """
+        self.blob_store = blob_store
+
+    def set_workbook_lock(self, workbook_lock):
+        """
+        セルの書き込み時に取得するロックを設定します。バックグラウンドでの保存と書き込みが重ならないようにする。
+        :param workbook_lock: ExcelFileHandler.lock
+        """
+        self.workbook_lock = workbook_lock
+
+    def set_write_listener(self, write_listener):
+        """
+        セルの書き込みが成功した際に呼び出す関数を設定します。
+        :param write_listener: 引数なしで呼び出される関数
+        """
+        self.write_listener = write_listener
+
+    def set_sqlite_mirror(self, sqlite_mirror):
+        """
+        セル更新時に値を反映する ExcelSqliteMirror を設定します。None で解除します。
+        :param sqlite_mirror: ExcelSqliteMirror のインスタンス
+        """
+        self.sqlite_mirror = sqlite_mirror
+
+    def _resolve(self, value):
+        if self.blob_store is None:
+            return value
+        return self.blob_store.resolve(value)
+
+    def enable_snapshot(self):
+        """
+        ワークシートの使用範囲を列ごとの配列に読み込み、以降の読み取りと書き込みを配列上で行います。
+        変更は flush_snapshot() でワークシートに反映されます。
+        :return: 作成したスナップショット
+        """
+        if self.snapshot is None:
+            self.snapshot = ExcelSheetSnapshot(self.worksheet)
+        return self.snapshot
+
+    def flush_snapshot(self):
+        """
+        スナップショット上で変更されたセルのみをワークシートに書き戻します。
+        :return: 書き戻したセルの数
+        """
+        if self.snapshot is None or not self.snapshot.dirty_cells:
+            return 0
+        if getattr(self.worksheet, "read_only", False):
+            if not (self.writable_handler and self.writable_handler()):
+                logger.error("Worksheet is read-only and could not be made writable.")
+                return 0
+        with self.workbook_lock:
+            count = self.snapshot.flush(self.worksheet)
+        logger.debug(f"Wrote back {count} changed cells from snapshot")
+        return count
+
+    def build_row_index(self):
+        """
+        全列について、値が入っている行番号（None 以外）と空でない行番号（None、空文字列、NaN 以外）の
+        昇順リストをシートの1回の読み込みでまとめて作成します。
+        スナップショットがある場合はその配列から作成します。
+        """
+        source = self.snapshot or ExcelSheetSnapshot(self.worksheet)
+        self._filled_rows = {}
+        self._non_empty_rows = {}
+        for column in range(1, source.max_column + 1):
+            self._filled_rows[column] = source.filled_rows(column).tolist()
+            self._non_empty_rows[column] = source.non_empty_rows(column).tolist()
+        logger.debug(f"Built last-row index for {source.max_column} columns")
+
+    def invalidate_row_index(self):
+        """
+        最終行インデックスを破棄します。次回の参照時に作成し直されます。
+        """
+        self._filled_rows = None
+        self._non_empty_rows = None
+
+    def _ensure_row_index(self):
+        if self._filled_rows is None:
+            self.build_row_index()
+
+    @staticmethod
+    def _update_sorted_rows(rows: List[int], row: int, present: bool):
+        """
+        昇順の行番号リストに行を追加、または削除します。
+        """
+        if present:
+            if not rows or rows[-1] < row:
+                rows.append(row)
+            else:
+                index = bisect_right(rows, row)
+                if rows[index - 1] != row:
+                    rows.insert(index, row)
+        else:
+            index = bisect_right(rows, row)
+            if index and rows[index - 1] == row:
+                del rows[index - 1]
+
+    def _update_row_index(self, row: int, column: int, value):
+        """
+        セルの書き込みに合わせて最終行インデックスを更新します。
+        """
+        if self._filled_rows is None:
+            return
+        self._update_sorted_rows(
+            self._filled_rows.setdefault(column, []), row, value is not None
+        )
+        self._update_sorted_rows(
+            self._non_empty_rows.setdefault(column, []),
+            row,
+            not ExcelSheetSnapshot._is_empty(value),
+        )
+
+    def _get_value(self, row: int, column: int):
+        if self.snapshot is not None:
+            return self.snapshot.get_value(row, column)
+        return self.worksheet.cell(row=row, column=column).value
+
+    def _get_max_row(self) -> int:
+        if self.snapshot is not None:
+            return self.snapshot.max_row
+        return self.worksheet.max_row
+
+    def set_search_handler(self, search_handler):
+        """
+        セル更新時に列インデックスを更新する検索ハンドラーを設定します。
+        :param search_handler: ExcelSearchHandler のインスタンス
+        """
+        self.search_handler = search_handler
+        self.logger.debug("Search handler has been set successfully.")
+
+    def set_writable_handler(self, writable_handler):
+        """
+        読み取り専用のワークシートに書き込もうとした際に呼び出す関数を設定します。
+        :param writable_handler: 書き込み可能な状態にし、成功時に True を返す関数
+        """
+        self.writable_handler = writable_handler
+
     def update_cell(self, row, column, value):
         """
         指定されたセルに値を更新します。
@@ -29,8 +200,35 @@ class ExcelCellHandler:
         :param value: 書き込む値
         :return: True: 成功、False: エラー発生
         """
+        if self.snapshot is None and getattr(self.worksheet, "read_only", False):
+            if not (self.writable_handler and self.writable_handler()):
+                logger.error("Worksheet is read-only and could not be made writable.")
+                return False
         try:
-            self.worksheet.cell(row=row, column=column, value=value)
+            # 検索インデックスには参照文字列ではなく元の値を登録する
+            search_value = value
+            if self.blob_store is not None and self.blob_store.should_externalize(
+                value
+            ):
+                if ILLEGAL_CHARACTERS_RE.search(value):
+                    raise IllegalCharacterError(value)
+                value = self.blob_store.put(value)
+            with self.workbook_lock:
+                if self.snapshot is not None:
+                    if isinstance(value, str) and ILLEGAL_CHARACTERS_RE.search(value):
+                        raise IllegalCharacterError(value)
+                    self.snapshot.set_value(row, column, value)
+                else:
+                    self.worksheet.cell(row=row, column=column, value=value)
+                self._update_row_index(row, column, value)
+                if self.search_handler:
+                    self.search_handler.update_column_index(row, column, search_value)
+                if self.sqlite_mirror:
+                    self.sqlite_mirror.update_cell(row, column, value)
+                if self.write_listener:
+                    self.write_listener()
+            if self.transaction:
+                self.transaction.record_write(row, column)
             logger.debug(f"Successfully updated cell at row {row}, column {column}")
             return True
         except IllegalCharacterError:
@@ -50,7 +248,7 @@ class ExcelCellHandler:
         :param expected_value: チェックしたい期待値（任意）
         :return: True: 空または一致、False: 不一致
         """
-        cell_value = self.worksheet.cell(row=row, column=column).value
+        cell_value = self._resolve(self._get_value(row, column))
         if pd.isna(cell_value) or cell_value is None or cell_value == "":
             logger.debug(f"Cell at row {row}, column {column} is empty")
             return True
@@ -71,9 +269,11 @@ class ExcelCellHandler:
         :yield: (行番号, セルの値) のタプル
         """
         logger.debug(f"Iterating column {column} values from row {start_row}")
-        for row in range(start_row, self.worksheet.max_row + 1):
-            value = self.worksheet.cell(row=row, column=column).value
-            logger.debug(f"Row {row}, Column {column}: {value}")
+        debug_enabled = logger.isEnabledFor(logging.DEBUG)
+        for row in range(start_row, self._get_max_row() + 1):
+            value = self._resolve(self._get_value(row, column))
+            if debug_enabled:
+                logger.debug(f"Row {row}, Column {column}: {value}")
             yield row, value
 
     def get_column_values_to_last_row(self, column: int, start_row: int = 1):
@@ -84,10 +284,15 @@ class ExcelCellHandler:
         :param start_row: 開始行 (デフォルトは1行目)
         :return: 指定された列の開始行から最終行までの値を含むリスト
         """
-        values = []
-        for row in range(start_row, self.worksheet.max_row + 1):
-            value = self.worksheet.cell(row=row, column=column).value
-            values.append(value)
+        if self.snapshot is not None:
+            values = self.snapshot.get_range(column, start_row, self.snapshot.max_row)
+        else:
+            values = []
+            for row in range(start_row, self.worksheet.max_row + 1):
+                value = self.worksheet.cell(row=row, column=column).value
+                values.append(value)
+        if self.blob_store is not None:
+            values = [self._resolve(value) for value in values]
         logger.debug(
             f"Retrieved {len(values)} values from column {column}, starting at row {start_row}"
         )
@@ -102,8 +307,11 @@ class ExcelCellHandler:
         :return: セルの値
         """
         try:
-            value = self.worksheet.cell(row=row, column=column).value
-            logger.debug(f"Retrieved value from row {row}, column {column}: {value}")
+            value = self._resolve(self._get_value(row, column))
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(
+                    f"Retrieved value from row {row}, column {column}: {value}"
+                )
             return value
         except Exception as e:
             logger.error(
@@ -120,7 +328,9 @@ class ExcelCellHandler:
         :return: セルの値
         """
         try:
-            value = self.worksheet[f"{column_letter}{row}"].value
+            value = self._resolve(
+                self._get_value(row, column_index_from_string(column_letter))
+            )
             logger.debug(
                 f"Retrieved value from row {row}, column {column_letter}: {value}"
             )
@@ -139,10 +349,17 @@ class ExcelCellHandler:
         :param num_rows: 取得する行数
         :return: セルの値のリスト
         """
-        values = []
-        for row in range(start_row, start_row + num_rows):
-            value = self.worksheet.cell(row=row, column=column).value
-            values.append(value)
+        if self.snapshot is not None:
+            values = self.snapshot.get_range(
+                column, start_row, start_row + num_rows - 1
+            )
+        else:
+            values = []
+            for row in range(start_row, start_row + num_rows):
+                value = self.worksheet.cell(row=row, column=column).value
+                values.append(value)
+        if self.blob_store is not None:
+            values = [self._resolve(value) for value in values]
         logger.debug(
             f"Retrieved {len(values)} values from column {column}, starting at row {start_row}, for {num_rows} rows"
         )
@@ -154,14 +371,13 @@ class ExcelCellHandler:
         :param column: 列番号 (例: 3はC列)
         :return: 最終行の行番号
         """
-        last_row = self.worksheet.max_row
-        while last_row > 0:
-            if self.worksheet.cell(row=last_row, column=column).value is not None:
-                logger.debug(f"Last row with data in column {column}: {last_row}")
-                return last_row
-            last_row -= 1
-        logger.debug(f"No data found in column {column}")
-        return 0
+        self._ensure_row_index()
+        rows = self._filled_rows.get(column)
+        if not rows:
+            logger.debug(f"No data found in column {column}")
+            return 0
+        logger.debug(f"Last row with data in column {column}: {rows[-1]}")
+        return rows[-1]
 
     def get_last_non_empty_value_in_range(
         self, start_row: int, column: int, size: int
@@ -174,14 +390,17 @@ class ExcelCellHandler:
         :return: データが入っている最後の行の値、全てのセルが空の場合はNone
         """
         try:
-            end_row = min(start_row + size - 1, self.worksheet.max_row)
-            for row in range(end_row, start_row - 1, -1):
-                value = self.worksheet.cell(row=row, column=column).value
-                if value is not None and value != "":
-                    logger.debug(
-                        f"Last non-empty value found in range: row {row}, column {column}, value: {value}"
-                    )
-                    return value
+            self._ensure_row_index()
+            end_row = start_row + size - 1
+            rows = self._non_empty_rows.get(column, [])
+            index = bisect_right(rows, end_row)
+            if index and rows[index - 1] >= start_row:
+                row = rows[index - 1]
+                value = self._resolve(self._get_value(row, column))
+                logger.debug(
+                    f"Last non-empty value found in range: row {row}, column {column}, value: {value}"
+                )
+                return value
             logger.debug(
                 f"No non-empty data found in the specified range: rows {start_row}-{end_row}, column {column}"
             )
@@ -224,6 +443,13 @@ class ExcelCellHandler:
         :return: 空でないセルの数
         """
         try:
+            if self.snapshot is not None:
+                count = self.snapshot.count_nonempty(column, start_row, end_row)
+                logger.debug(
+                    f"Counted {count} non-empty cells in column {column} from row {start_row} to {end_row}"
+                )
+                return count
+
             count = sum(
                 1
                 for row in range(start_row, end_row + 1)
@@ -1,10 +1,17 @@
+from contextlib import contextmanager
 from .file_handler import ExcelFileHandler
 from .sheet_handler import ExcelSheetHandler
 from .cell_handler import ExcelCellHandler
 from .search_handler import ExcelSearchHandler
 from .pandas_handler import ExcelPandasHandler
 from .data_processor import ExcelDataProcessor
+from .streamed_sheet import ExcelStreamedSheet
+from .sheet_cache import ExcelSheetCache
+from .blob_store import ExcelBlobStore
+from .sqlite_mirror import ExcelSqliteMirror
+from .write_transaction import ExcelWriteTransaction
 from src.log_operations.log_handlers import CustomLogger
+from src.util_operations.validator import ValueValidator
 
 
 class ExcelManager:
@@ -24,13 +31,28 @@ class ExcelManager:
         self.data_processor = ExcelDataProcessor()
         self.file_handler = ExcelFileHandler()
         self.pandas_handler = ExcelPandasHandler()
+        self.sheet_cache = ExcelSheetCache()
+        self.cell_handler.set_search_handler(self.search_handler)
+        self.cell_handler.set_writable_handler(self.ensure_writable)
+        self.cell_handler.set_workbook_lock(self.file_handler.lock)
+        self.cell_handler.set_write_listener(self.file_handler.mark_modified)
+        self.file_handler.register_before_save(self.cell_handler.flush_snapshot)
+        self.file_handler.register_after_save(self.store_sheet_cache)
+        self.file_handler.register_after_save(self.update_sqlite_mirror_key)
         self.workbook = None
         self.worksheet = None
+        self.sheet_name = None
+        self.read_only = False
+        self.use_cache = False
+        self.sqlite_mirror = None
+        self.sqlite_mirror_start_row = None
 
-    def set_workbook(self, file_path=None):
+    def set_workbook(self, file_path=None, read_only=False):
         """
         操作対象のExcelファイルのパスを設定し、ワークブックを読み込む
         :param file_path: (オプション) Excelファイルのパス
+        :param read_only: True の場合は読み取り専用（ストリーミング）モードで読み込む。
+                          書き込みが必要になった時点で ensure_writable() により再読み込みされる
         """
         if file_path:
             self.file_handler.set_file_path(file_path)
@@ -41,8 +63,9 @@ class ExcelManager:
             self.logger.error("File path not set. Please set a file path first.")
             return False
 
-        self.logger.debug("Loading workbook")
-        self.workbook = self.file_handler.load()
+        self.logger.debug(f"Loading workbook (read_only={read_only})")
+        self.workbook = self.file_handler.load(read_only=read_only)
+        self.read_only = read_only
         if self.workbook:
             self.sheet_handler.set_workbook(self.workbook)
             self.logger.debug("Workbook loaded successfully")
@@ -50,28 +73,299 @@ class ExcelManager:
             self.logger.error("Failed to load workbook")
         return self.workbook is not None
 
-    def set_worksheet(self, sheet_name):
+    def set_worksheet(self, sheet_name, keep_snapshot=False):
         """
         指定されたシートをアクティブにする
         :param sheet_name: アクティブにするシートの名前
+        :param keep_snapshot: True の場合、同じシートの読み込み直しとしてスナップショットを維持する
         """
         self.logger.debug(f"Setting active sheet: {sheet_name}")
+        self.sheet_name = sheet_name
         self.worksheet = self.sheet_handler.set_active_sheet(sheet_name)
-        self.search_handler.set_worksheet(self.worksheet)
-        self.cell_handler.set_worksheet(self.worksheet)
+        if self.worksheet is not None and self.read_only:
+            self.worksheet = ExcelStreamedSheet(self.worksheet)
+        self.cell_handler.set_worksheet(self.worksheet, keep_snapshot=keep_snapshot)
+        if self.cell_handler.snapshot is None:
+            self.search_handler.set_worksheet(self.worksheet)
         if self.worksheet:
             self.logger.debug(f"Sheet '{sheet_name}' set as active")
         else:
             self.logger.error(f"Failed to set sheet '{sheet_name}' as active")
         return self.worksheet is not None
 
-    def set_info(self, file_path, sheet_name):
-        if not self.set_workbook(file_path):
-            self.logger.error("Failed to set workbook")
+    def set_info(
+        self,
+        file_path,
+        sheet_name,
+        read_only=False,
+        use_snapshot=False,
+        use_cache=False,
+    ):
+        """
+        ワークブックを読み込み、操作対象のシートを設定する
+        :param file_path: Excelファイルのパス
+        :param sheet_name: 操作対象のシート名
+        :param read_only: True の場合は読み取り専用（ストリーミング）モードで読み込む
+        :param use_snapshot: True の場合はシートをスナップショットに読み込み、読み書きを配列上で行う
+        :param use_cache: True の場合はワークブックが変更されていなければ解析済みのキャッシュから読み込む。
+                          キャッシュから読み込んだ場合は読み取り専用となり、書き込み時に再読み込みされる
+        """
+        self.use_cache = use_cache
+        if not (use_cache and self.load_from_cache(file_path, sheet_name)):
+            if not self.set_workbook(file_path, read_only=read_only):
+                self.logger.error("Failed to set workbook")
+                return None
+
+            if not self.set_worksheet(sheet_name):
+                self.logger.error("Failed to set worksheet")
+                return None
+
+            if use_cache:
+                self.store_sheet_cache()
+
+        if use_snapshot and not self.enable_snapshot():
+            self.logger.error("Failed to enable snapshot")
             return None
 
-        if not self.set_worksheet(sheet_name):
-            self.logger.error("Failed to set worksheet")
+        return True
+
+    def load_from_cache(self, file_path, sheet_name):
+        """
+        ワークブックが変更されていなければ、解析済みのシートの値をキャッシュから読み込み、
+        読み取り専用のシートとして設定する。書き込み時は ensure_writable() により再読み込みされる。
+        :param file_path: Excelファイルのパス
+        :param sheet_name: シート名
+        :return: キャッシュから読み込んだ場合は True
+        """
+        rows = self.sheet_cache.load(file_path, sheet_name)
+        if rows is None:
+            return False
+
+        self.file_handler.set_file_path(file_path)
+        self.pandas_handler.set_file_path(file_path)
+        self.file_handler.workbook = None
+        self.file_handler.read_only = True
+        self.workbook = None
+        self.read_only = True
+        self.sheet_name = sheet_name
+        self.worksheet = ExcelStreamedSheet.from_rows(sheet_name, rows)
+        self.cell_handler.set_worksheet(self.worksheet)
+        self.search_handler.set_worksheet(self.worksheet)
+        self.logger.debug(f"Sheet '{sheet_name}' loaded from cache")
+        return True
+
+    def store_sheet_cache(self):
+        """
+        アクティブなシートの現在の値を、ワークブックの現在のサイズ・更新時刻をキーとしてキャッシュに保存する。
+        set_info() で use_cache を指定した場合のみ保存し、保存後にも自動的に呼び出される。
+        """
+        if not self.use_cache or self.worksheet is None:
+            return
+        source = self.cell_handler.snapshot or self.worksheet
+        self.sheet_cache.store(
+            self.file_handler.file_path,
+            self.sheet_name,
+            source.iter_rows(values_only=True),
+        )
+
+    def enable_blob_store(self, threshold, blob_dir=None):
+        """
+        閾値を超える文字列をワークブックの外のファイルに保存し、セルには参照文字列のみを書き込むようにする。
+        読み取りと検索では、参照文字列が元の値に解決される。
+        :param threshold: この文字数を超える文字列をファイルに保存する（0 以下の場合は何もしない）
+        :param blob_dir: 保存先のフォルダ（None の場合はワークブックと同じフォルダの「<ファイル名>_blobs」）
+        :return: 有効にした場合は True
+        """
+        if threshold <= 0:
+            return False
+        if self.file_handler.file_path is None:
+            self.logger.error("File path not set. Please set a file path first.")
+            return False
+        blob_dir = blob_dir or ExcelBlobStore.get_default_blob_dir(
+            self.file_handler.file_path
+        )
+        blob_store = ExcelBlobStore(blob_dir, threshold)
+        self.cell_handler.set_blob_store(blob_store)
+        self.search_handler.set_blob_store(blob_store)
+        self.logger.debug(
+            f"Blob store enabled: {blob_dir} (threshold={threshold} characters)"
+        )
+        return True
+
+    def enable_sqlite_mirror(self, columns, start_row, key_columns=None, db_path=None):
+        """
+        アクティブなシートの指定された列を SQLite ファイルに複製し、キー列にインデックスを作成する。
+        ワークブックが前回の複製時から変更されていない場合は既存の SQLite ファイルをそのまま使用する。
+        以降のセルの更新は SQLite にも反映され、SQLite 上で変更した値は export_sqlite_mirror() でシートに書き戻す。
+        :param columns: 複製する列の辞書（列名: 列番号。find_and_map_column_indices() の結果）
+        :param start_row: データの開始行
+        :param key_columns: インデックスを作成する列名のリスト
+        :param db_path: SQLite ファイルのパス（None の場合はワークブックと同じフォルダ）
+        :return: ExcelSqliteMirror、失敗した場合は None
+        """
+        if self.worksheet is None:
+            self.logger.error("Worksheet not set. Please set a worksheet first.")
+            return None
+        file_path = self.file_handler.file_path
+        mirror = ExcelSqliteMirror(
+            db_path or ExcelSqliteMirror.get_default_db_path(file_path, self.sheet_name)
+        )
+        try:
+            mirror.open(columns, key_columns)
+            file_key = ExcelSqliteMirror.get_file_key(
+                file_path, self.sheet_name, mirror.columns, start_row
+            )
+            if mirror.get_stored_key() != file_key:
+                source = self.cell_handler.snapshot or self.worksheet
+                mirror.build(
+                    enumerate(
+                        source.iter_rows(min_row=start_row, values_only=True),
+                        start_row,
+                    ),
+                    file_key,
+                )
+            else:
+                self.logger.debug(f"Reusing SQLite mirror: {mirror.db_path}")
+        except Exception as e:
+            self.logger.error(f"Failed to enable SQLite mirror: {str(e)}")
+            mirror.close()
             return None
+        self.sqlite_mirror = mirror
+        self.sqlite_mirror_start_row = start_row
+        self.cell_handler.set_sqlite_mirror(mirror)
+        return mirror
+
+    def export_sqlite_mirror(self):
+        """
+        SQLite 上で変更した値をシートに書き戻す。ワークブックへの保存は file_handler.save() で行う。
+        :return: 書き戻したセルの数
+        """
+        if self.sqlite_mirror is None:
+            return 0
+        return self.sqlite_mirror.export(self.cell_handler)
+
+    def update_sqlite_mirror_key(self):
+        """
+        保存後のワークブックのサイズ・更新時刻を SQLite ファイルに記録し、次回の実行で複製を再利用できるようにする。
+        """
+        if self.sqlite_mirror is None:
+            return
+        self.sqlite_mirror.set_stored_key(
+            ExcelSqliteMirror.get_file_key(
+                self.file_handler.file_path,
+                self.sheet_name,
+                self.sqlite_mirror.columns,
+                self.sqlite_mirror_start_row,
+            )
+        )
+
+    def enable_snapshot(self):
+        """
+        アクティブなシートの使用範囲を列ごとの配列に一度だけ読み込み、以降の読み書きを配列上で行う。
+        変更されたセルのみが保存時にワークシートへ書き戻される。
+        :return: 成功した場合は True
+        """
+        if self.worksheet is None:
+            self.logger.error("Worksheet not set. Please set a worksheet first.")
+            return False
+        snapshot = self.cell_handler.enable_snapshot()
+        self.search_handler.set_worksheet(snapshot)
+        self.logger.debug(f"Snapshot enabled for sheet '{self.sheet_name}'")
+        return True
+
+    def ensure_writable(self):
+        """
+        読み取り専用モードで開いている場合、書き込み可能なモードでワークブックを読み込み直す。
+        書き込み可能なモードで開いている場合は何もしない。
+        :return: 書き込み可能な状態になった場合は True
+        """
+        if not self.read_only:
+            return True
+
+        self.logger.debug("Upgrading workbook to writable mode")
+        self.file_handler.close()
+        if not self.set_workbook(read_only=False):
+            self.logger.error("Failed to reload workbook in writable mode")
+            return False
+        if self.sheet_name is not None and not self.set_worksheet(
+            self.sheet_name, keep_snapshot=True
+        ):
+            self.logger.error("Failed to set worksheet in writable mode")
+            return False
+        return True
+
+    def iterate_flagged_groups(self, group_size, start_row, flag_column, columns=None):
+        """
+        シートを group_size 行ごとのグループに分け、先頭行のフラグ列が有効（ValueValidator.is_valid() と同じ判定）な
+        グループのみを返すジェネレータ。group_size に 1 を指定すると、フラグの立っている行のみを返す。
+        フラグ列は最終行まで1回だけ読み込み、フラグの立っているグループについてのみ
+        指定された列のグループ範囲の値をまとめて先読みする。
+
+        for group_start_row, group in excel_manager.iterate_flagged_groups(
+            CREATE_BLOG_WP_EXCEL_GROUP_SIZE, CREATE_BLOG_WP_EXCEL_START_ROW, columns["flag"], columns
+        ):
+            theme = group["theme"][0]
+
+        :param group_size: 1グループの行数
+        :param start_row: 最初のグループの開始行
+        :param flag_column: フラグ列の列番号
+        :param columns: 先読みする列の辞書（列名: 列番号）
+        :yield: (グループの開始行, {列名: グループ範囲の値のリスト}) のタプル
+        """
+        last_row = self.cell_handler.get_last_row_of_column(flag_column)
+        if last_row < start_row:
+            self.logger.debug(f"No flags found from row {start_row}")
+            return
+
+        flags = self.cell_handler.get_range_values(
+            start_row, flag_column, last_row - start_row + 1
+        )[::group_size]
+        flagged_rows = [
+            start_row + i * group_size
+            for i in ValueValidator.valid_indices(flags).tolist()
+        ]
+        self.logger.debug(
+            f"{len(flagged_rows)} of {len(flags)} groups are flagged in column {flag_column}"
+        )
+
+        for group_start_row in flagged_rows:
+            group = {
+                name: self.cell_handler.get_range_values(
+                    group_start_row, column, group_size
+                )
+                for name, column in (columns or {}).items()
+            }
+            yield group_start_row, group
+
+    @contextmanager
+    def transaction(self, save_every_rows=None, save_interval=None):
+        """
+        セルの書き込みをまとめ、ブロック内の保存要求を1回の保存にまとめるコンテキストマネージャ。
+        ブロックを抜ける時（例外発生時も含む）に溜まった書き込みを保存する。
+        途中保存の判定は file_handler.save() の呼び出し時に行う。
+
+        with excel_manager.transaction(save_interval=300) as transaction:
+            ...
+            excel_manager.file_handler.save()
+
+        :param save_every_rows: 書き込まれた行数がこの数に達したら途中保存する
+        :param save_interval: 前回の保存からこの秒数が経過したら途中保存する
+        :yield: ExcelWriteTransaction（summary() で集計結果を取得できる）
+        """
+        if self.file_handler.transaction is not None:
+            yield self.file_handler.transaction
+            return
 
-        return True
\ No newline at end of file
+        transaction = ExcelWriteTransaction(
+            self.file_handler,
+            save_every_rows=save_every_rows,
+            save_interval=save_interval,
+        )
+        self.file_handler.set_transaction(transaction)
+        self.cell_handler.set_transaction(transaction)
+        try:
+            yield transaction
+        finally:
+            self.file_handler.set_transaction(None)
+            self.cell_handler.set_transaction(None)
+            transaction.commit()
@@ -1,41 +1,257 @@
 import openpyxl
+import os
+import random
+import threading
 import time
+from contextlib import contextmanager
 
 from src.log_operations.log_handlers import CustomLogger
 
+if os.name == "nt":
+    import msvcrt
+else:
+    import fcntl
+
+
+@contextmanager
+def advisory_file_lock(path):
+    """
+    ロックファイルに排他ロックを取得するコンテキストマネージャ（ブロックしない）。
+    他のプロセスがロックを保持している場合は BlockingIOError または PermissionError を送出する。
+    :param path: ロックファイルのパス
+    """
+    with open(path, "a+") as lock_file:
+        if os.name == "nt":
+            lock_file.seek(0)
+            msvcrt.locking(lock_file.fileno(), msvcrt.LK_NBLCK, 1)
+        else:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        try:
+            yield
+        finally:
+            if os.name == "nt":
+                lock_file.seek(0)
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+            else:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
 
 class ExcelFileHandler:
     def __init__(self):
         self.logger = CustomLogger(__name__)
         self.file_path = None
         self.workbook = None
+        self.read_only = False
+        self.before_save_callbacks = []
+        self.after_save_callbacks = []
+        self.transaction = None
+        self.lock = threading.RLock()
+        self.modification_count = 0
+        self.async_save = False
+        self.retry_base_delay = 1.0
+        self.retry_max_delay = 30.0
+        self.last_save_succeeded = True
+        self._save_condition = threading.Condition()
+        self._save_pending = False
+        self._saving = False
+        self._save_thread = None
+        self._save_max_retries = 3
 
     def set_file_path(self, file_path):
         self.file_path = file_path
         self.logger.debug("file_path has been set successfully.")
 
-    def load(self):
+    def set_transaction(self, transaction):
+        """
+        保存要求をまとめるトランザクションを設定します。None で解除します。
+        :param transaction: ExcelWriteTransaction のインスタンス
+        """
+        self.transaction = transaction
+
+    def set_async_save(self, async_save=True):
+        """
+        保存をバックグラウンドのスレッドで行うかどうかを設定します。
+        有効にすると save() は保存を予約してすぐに戻り、flush() で保存の完了を待つ。
+        無効にする場合は予約済みの保存の完了を待つ。
+        :param async_save: True の場合はバックグラウンドで保存する
+        """
+        if not async_save:
+            self.flush()
+        self.async_save = async_save
+
+    def mark_modified(self):
+        """
+        ワークブックが変更されたことを記録します。
+        保存中に変更された場合、保存後のコールバックは次の保存まで呼び出されない。
+        """
+        with self.lock:
+            self.modification_count += 1
+
+    def register_before_save(self, callback):
+        """
+        保存の直前に呼び出す関数を登録します。
+        :param callback: 引数なしで呼び出される関数
+        """
+        self.before_save_callbacks.append(callback)
+
+    def register_after_save(self, callback):
+        """
+        保存が成功した直後に呼び出す関数を登録します。
+        :param callback: 引数なしで呼び出される関数
+        """
+        self.after_save_callbacks.append(callback)
+
+    def load(self, read_only=False):
+        """
+        Excelファイルを読み込みます。
+        :param read_only: True の場合は読み取り専用（ストリーミング）モードで読み込む
+        :return: ワークブック、失敗した場合は None
+        """
+        self.flush()
         try:
-            workbook = openpyxl.load_workbook(self.file_path)
+            with self.logger.span(
+                "excel.load", file=os.path.basename(self.file_path), read_only=read_only
+            ):
+                workbook = openpyxl.load_workbook(self.file_path, read_only=read_only)
             self.workbook = workbook
-            self.logger.debug(f"Successfully loaded Excel file: {self.file_path}")
+            self.read_only = read_only
+            self.logger.debug(
+                f"Successfully loaded Excel file: {self.file_path} (read_only={read_only})"
+            )
             return workbook
         except Exception as e:
             self.logger.error(f"Failed to load Excel file {self.file_path}: {str(e)}")
             return None
 
-    def save(self, max_retries=3):
+    def close(self):
+        """
+        読み取り専用モードで開いたワークブックのファイルハンドルを閉じます。
+        """
+        if self.workbook is not None and self.read_only:
+            self.workbook.close()
+            self.logger.debug(f"Closed read-only Excel file: {self.file_path}")
+
+    def save(self, max_retries=3, force=False):
+        """
+        ワークブックを保存します。トランザクション中はトランザクションに保存要求を渡します。
+        非同期保存が有効な場合はバックグラウンドのスレッドに保存を予約してすぐに戻ります。
+        :param max_retries: 保存先がロックされている場合の最大試行回数
+        :param force: True の場合はトランザクション中でも即座に保存する
+        :return: 保存が成功した場合（または保存要求を受け付けた場合）は True
+        """
+        if self.transaction is not None and not force:
+            return self.transaction.request_save()
+        for callback in self.before_save_callbacks:
+            callback()
+        if self.read_only:
+            self.logger.debug(
+                f"Excel file {self.file_path} is opened in read-only mode. Nothing to save."
+            )
+            return True
+        if self.async_save:
+            return self._request_async_save(max_retries)
+        return self._write_workbook(max_retries)
+
+    def flush(self, timeout=None):
+        """
+        バックグラウンドで予約されている保存が全て完了するまで待ちます。
+        :param timeout: 最大待ち時間（秒）。None の場合は完了するまで待つ
+        :return: 最後の保存が成功した場合は True
+        """
+        with self._save_condition:
+            completed = self._save_condition.wait_for(
+                lambda: not self._save_pending and not self._saving, timeout
+            )
+        if not completed:
+            self.logger.warning(
+                f"Timed out waiting for pending saves of {self.file_path}"
+            )
+            return False
+        return self.last_save_succeeded
+
+    def _request_async_save(self, max_retries):
+        with self._save_condition:
+            self._save_pending = True
+            self._save_max_retries = max_retries
+            if self._save_thread is None:
+                self._save_thread = threading.Thread(
+                    target=self._save_worker, name="ExcelSaveWorker"
+                )
+                self._save_thread.start()
+        self.logger.debug(f"Save of {self.file_path} scheduled in background")
+        return True
+
+    def _save_worker(self):
+        """
+        予約された保存を順に実行するスレッド。予約がなくなると終了する。
+        保存中に追加で予約された保存は1回にまとめられる。
+        """
+        while True:
+            with self._save_condition:
+                if not self._save_pending:
+                    self._save_thread = None
+                    self._save_condition.notify_all()
+                    return
+                self._save_pending = False
+                self._saving = True
+                max_retries = self._save_max_retries
+            result = False
+            try:
+                result = self._write_workbook(max_retries)
+            except Exception as e:
+                self.logger.error(
+                    f"Background save of {self.file_path} failed: {str(e)}"
+                )
+            finally:
+                with self._save_condition:
+                    self._saving = False
+                    self.last_save_succeeded = result
+                    self._save_condition.notify_all()
+
+    def _get_retry_delay(self, attempt):
+        """
+        指数的に増加し、揺らぎを加えた再試行までの待ち時間を返します。
+        """
+        delay = min(self.retry_max_delay, self.retry_base_delay * 2**attempt)
+        return delay * random.uniform(0.5, 1.5)
+
+    def _write_workbook(self, max_retries):
+        """
+        ワークブックを同じフォルダの一時ファイルに書き出し、ロックファイルの排他ロックを取得して
+        保存先に置き換えます。保存先が Excel などで開かれている場合は待ち時間を空けて再試行する。
+        :param max_retries: 置き換えの最大試行回数
+        :return: 保存が成功した場合は True
+        """
+        directory, file_name = os.path.split(os.path.abspath(self.file_path))
+        temp_path = os.path.join(directory, f".~{file_name}.{os.getpid()}.tmp")
+        lock_path = os.path.join(directory, f".{file_name}.lock")
+        with self.lock:
+            modification_count = self.modification_count
+            with self.logger.span("excel.save", file=file_name):
+                self.workbook.save(temp_path)
         for attempt in range(max_retries):
             try:
-                self.workbook.save(self.file_path)
+                with advisory_file_lock(lock_path):
+                    os.replace(temp_path, self.file_path)
                 self.logger.debug(f"Excel file {self.file_path} saved successfully.")
+                with self.lock:
+                    if self.modification_count == modification_count:
+                        for callback in self.after_save_callbacks:
+                            callback()
+                self.last_save_succeeded = True
                 return True
-            except PermissionError:
+            except (PermissionError, BlockingIOError):
+                if attempt + 1 == max_retries:
+                    break
+                delay = self._get_retry_delay(attempt)
                 self.logger.debug(
-                    f"PermissionError: Attempt {attempt + 1} of {max_retries} to save {self.file_path}. Retrying in 5 seconds..."
+                    f"{self.file_path} is locked: Attempt {attempt + 1} of {max_retries} to save {self.file_path}. Retrying in {delay:.1f} seconds..."
                 )
-                time.sleep(5)
+                time.sleep(delay)
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
         self.logger.error(
             f"Failed to save Excel file {self.file_path} after {max_retries} attempts."
         )
+        self.last_save_succeeded = False
         return False
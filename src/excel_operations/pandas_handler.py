@@ -1,12 +1,22 @@
+import importlib.util
+import os
+from collections import OrderedDict
 import pandas as pd
 from src.log_operations.log_handlers import CustomLogger
 
 
 class ExcelPandasHandler:
-    def __init__(self):
+    def __init__(self, cache_max_bytes=256 * 1024 * 1024):
+        """
+        :param cache_max_bytes: 読み込んだ DataFrame をキャッシュする合計サイズの上限（バイト）
+        """
         self.logger = CustomLogger(__name__)
         self.file_path = None
         self.df = None
+        self.dfs = None
+        self.cache_max_bytes = cache_max_bytes
+        self._cache = OrderedDict()
+        self._cache_bytes = 0
 
     def set_file_path(self, file_path):
         """
@@ -16,23 +26,139 @@ class ExcelPandasHandler:
         self.file_path = file_path
         self.logger.debug("file_path has been set successfully.")
 
-    def load_pandas(self, sheet_name=None):
+    def set_cache_max_bytes(self, cache_max_bytes):
+        """
+        DataFrame のキャッシュの合計サイズの上限を設定します。0 の場合はキャッシュしない。
+        :param cache_max_bytes: 上限（バイト）
+        """
+        self.cache_max_bytes = cache_max_bytes
+        self._evict()
+
+    def clear_cache(self):
+        """
+        DataFrame のキャッシュを破棄します。
+        """
+        self._cache.clear()
+        self._cache_bytes = 0
+
+    @staticmethod
+    def resolve_engine(engine):
+        """
+        読み込みに使用するエンジンを決定します。
+        "auto" の場合は python-calamine がインストールされていれば "calamine"、なければ pandas の既定。
+        :param engine: "auto"、エンジン名、または None（pandas の既定）
+        :return: pd.read_excel に渡すエンジン名または None
+        """
+        if engine != "auto":
+            return engine
+        if importlib.util.find_spec("python_calamine") is not None:
+            return "calamine"
+        return None
+
+    @staticmethod
+    def _freeze(value):
+        if isinstance(value, dict):
+            return tuple(sorted((str(k), str(v)) for k, v in value.items()))
+        if isinstance(value, (list, tuple)):
+            return tuple(value)
+        return value
+
+    def _get_cache_key(self, sheet_name, usecols, dtype, engine):
+        stat = os.stat(self.file_path)
+        return (
+            os.path.abspath(self.file_path),
+            stat.st_mtime_ns,
+            stat.st_size,
+            sheet_name,
+            self._freeze(usecols),
+            self._freeze(dtype),
+            engine,
+        )
+
+    def _store(self, key, df):
+        size = int(df.memory_usage(index=True, deep=False).sum())
+        if size > self.cache_max_bytes:
+            return
+        if key in self._cache:
+            self._cache_bytes -= self._cache.pop(key)[1]
+        self._cache[key] = (df, size)
+        self._cache_bytes += size
+        self._evict()
+
+    def _evict(self):
+        while self._cache and self._cache_bytes > self.cache_max_bytes:
+            _, (_, size) = self._cache.popitem(last=False)
+            self._cache_bytes -= size
+
+    def load_pandas(
+        self, sheet_name=None, usecols=None, dtype=None, engine=None, use_cache=True
+    ):
+        """
+        Excelファイルを pandas で読み込みます。空のセルのみを NaN とし、"NA" などの文字列はそのまま読み込む。
+        読み込んだ DataFrame はファイルの更新時刻をキーとしてキャッシュされ、
+        ファイルが変更されていなければ再読み込みしない（キャッシュされた DataFrame は変更しないこと）。
+        :param sheet_name: シート名（またはシート番号）。リストの場合は指定された全てのシートを1回のファイル読み込みで取得する。
+                           None の場合は全てのシート
+        :param usecols: 読み込む列（pd.read_excel の usecols と同じ形式）
+        :param dtype: 列の型の指定（pd.read_excel の dtype と同じ形式）
+        :param engine: 読み込みエンジン。"auto" の場合は python-calamine がインストールされていれば使用する
+        :param use_cache: False の場合はキャッシュを使用せずに読み込む
+        :return: シートが1つの場合は DataFrame、複数の場合は {シート名: DataFrame}。失敗した場合は None
+        """
+        engine = self.resolve_engine(engine)
+        multiple = sheet_name is None or isinstance(sheet_name, (list, tuple))
+        excel_file = None
         try:
-            self.df = pd.read_excel(
-                self.file_path,
-                sheet_name=sheet_name,
-                keep_default_na=False,
-                na_values=[""],
+            if sheet_name is None:
+                excel_file = pd.ExcelFile(self.file_path, engine=engine)
+                sheet_names = excel_file.sheet_names
+            else:
+                sheet_names = list(sheet_name) if multiple else [sheet_name]
+
+            frames = {}
+            keys = {}
+            for name in sheet_names:
+                keys[name] = self._get_cache_key(name, usecols, dtype, engine)
+                if use_cache and keys[name] in self._cache:
+                    self._cache.move_to_end(keys[name])
+                    frames[name] = self._cache[keys[name]][0]
+
+            missing = [name for name in sheet_names if name not in frames]
+            if missing:
+                loaded = pd.read_excel(
+                    excel_file or self.file_path,
+                    sheet_name=missing,
+                    usecols=usecols,
+                    dtype=dtype,
+                    engine=engine,
+                    keep_default_na=False,
+                    na_values=[""],
+                )
+                for name in missing:
+                    frames[name] = loaded[name]
+                    if use_cache:
+                        self._store(keys[name], loaded[name])
+            self.logger.debug(
+                f"Successfully loaded Excel file: {self.file_path} "
+                f"({len(sheet_names) - len(missing)} of {len(sheet_names)} sheets from cache)"
             )
-            self.logger.debug(f"Successfully loaded Excel file: {self.file_path}")
-            self.logger.debug(f"Pandas DataFrame shape: {self.df.shape}")
-            self.logger.debug(f"Pandas DataFrame columns: {self.df.columns.tolist()}")
-            return self.df
+
+            self.dfs = {name: frames[name] for name in sheet_names}
+            self.df = self.dfs[sheet_names[0]] if sheet_names else None
+            for name, df in self.dfs.items():
+                self.logger.debug(f"Pandas DataFrame [{name}] shape: {df.shape}")
+                self.logger.debug(
+                    f"Pandas DataFrame [{name}] columns: {df.columns.tolist()}"
+                )
+            return self.dfs if multiple else self.df
         except Exception as e:
             self.logger.error(
                 f"Failed to load Excel file {self.file_path} with pandas: {str(e)}"
             )
             return None
+        finally:
+            if excel_file is not None:
+                excel_file.close()
 
     def get_pandas_column_data(self, column_name):
         if self.df is not None and column_name in self.df.columns:
@@ -1,4 +1,6 @@
-from typing import List, Dict, Optional
+import logging
+from bisect import bisect_left, insort
+from typing import Any, List, Dict, Optional
 from src.log_operations.log_handlers import CustomLogger
 
 
@@ -9,6 +11,11 @@ class ExcelSearchHandler:
         """
         self.logger = CustomLogger(__name__)
         self.worksheet = None
+        self.blob_store = None
+        # 列番号 -> {正規化した値: 行番号の昇順リスト}
+        self._column_indexes: Dict[int, Dict[str, List[int]]] = {}
+        # 列番号 -> {行番号: 正規化した値}（更新時に古い値を外すための逆引き）
+        self._column_row_keys: Dict[int, Dict[int, str]] = {}
 
     def set_worksheet(self, worksheet):
         """
@@ -16,8 +23,120 @@ class ExcelSearchHandler:
         :param worksheet: 対象のワークシート
         """
         self.worksheet = worksheet
+        self.invalidate_column_index()
         self.logger.debug("Worksheet has been set successfully.")
 
+    def set_blob_store(self, blob_store):
+        """
+        参照文字列を元の値に解決する ExcelBlobStore を設定します。None で解除します。
+        設定中は、ワークブックの外に保存された値も元の値で検索できる。
+        :param blob_store: ExcelBlobStore のインスタンス
+        """
+        self.blob_store = blob_store
+        self.invalidate_column_index()
+
+    def _resolve(self, value: Any) -> Any:
+        if self.blob_store is None:
+            return value
+        return self.blob_store.resolve(value)
+
+    @staticmethod
+    def _normalize_key(value: Any) -> str:
+        """
+        検索で比較するための値の正規化（文字列化して前後の空白を除去）を行います。
+        :param value: 正規化する値
+        :return: 正規化された文字列
+        """
+        return str(value).strip()
+
+    def build_column_index(self, column: int) -> Dict[str, List[int]]:
+        """
+        指定された列の 値 -> 行番号 のインデックスを1回の走査で作成します。
+        作成済みの場合は既存のインデックスを返します。
+        :param column: インデックスを作成する列番号
+        :return: 正規化した値をキー、行番号の昇順リストを値とする辞書
+        """
+        if column in self._column_indexes:
+            return self._column_indexes[column]
+
+        index: Dict[str, List[int]] = {}
+        row_keys: Dict[int, str] = {}
+        for row, (value,) in enumerate(
+            self.worksheet.iter_rows(
+                min_row=1,
+                max_row=self.worksheet.max_row,
+                min_col=column,
+                max_col=column,
+                values_only=True,
+            ),
+            start=1,
+        ):
+            if value is None:
+                continue
+            key = self._normalize_key(self._resolve(value))
+            index.setdefault(key, []).append(row)
+            row_keys[row] = key
+
+        self._column_indexes[column] = index
+        self._column_row_keys[column] = row_keys
+        self.logger.debug(
+            f"Built index for column {column}: {len(row_keys)} cells, {len(index)} distinct values"
+        )
+        return index
+
+    def is_column_indexed(self, column: int) -> bool:
+        """
+        指定された列のインデックスが作成済みかどうかを返します。
+        :param column: 列番号
+        :return: 作成済みの場合は True
+        """
+        return column in self._column_indexes
+
+    def invalidate_column_index(self, column: Optional[int] = None):
+        """
+        列インデックスを破棄します。次回の検索時に再作成されます。
+        :param column: 破棄する列番号（None の場合はすべての列）
+        """
+        if column is None:
+            self._column_indexes.clear()
+            self._column_row_keys.clear()
+        else:
+            self._column_indexes.pop(column, None)
+            self._column_row_keys.pop(column, None)
+
+    def update_column_index(self, row: int, column: int, value: Any):
+        """
+        セルの更新をインデックスに反映します。インデックス未作成の列は何もしません。
+        :param row: 更新された行番号
+        :param column: 更新された列番号
+        :param value: 書き込まれた値（ExcelBlobStore を使用する場合は参照文字列に置き換える前の値）
+        """
+        index = self._column_indexes.get(column)
+        if index is None:
+            return
+        row_keys = self._column_row_keys[column]
+
+        old_key = row_keys.pop(row, None)
+        if old_key is not None:
+            rows = index[old_key]
+            del rows[bisect_left(rows, row)]
+            if not rows:
+                del index[old_key]
+
+        if value is not None:
+            key = self._normalize_key(value)
+            insort(index.setdefault(key, []), row)
+            row_keys[row] = key
+
+    def contains_value(self, column: int, search_string: Any) -> bool:
+        """
+        指定された列に、指定された文字列と一致するセルが存在するかを返します。
+        :param column: 検索する列番号
+        :param search_string: 検索する文字列
+        :return: 存在する場合は True
+        """
+        return self._normalize_key(search_string) in self.build_column_index(column)
+
     def find_matching_index(self, index, search_string, is_row_flag):
         """
         指定された行または列の中から、指定された文字列に一致する最初のセルのインデックスを返す。
@@ -28,28 +147,31 @@ class ExcelSearchHandler:
         :return: 一致するセルが見つかった場合、その列または行のインデックスを返す。見つからない場合は None を返す。
         """
         search_type = "row" if is_row_flag else "column"
-        self.logger.debug(f"Starting search: '{search_string}' in {search_type} {index}")
+        self.logger.debug(
+            f"Starting search: '{search_string}' in {search_type} {index}"
+        )
 
         if is_row_flag:
             max_range = self.worksheet.max_column
             self.logger.debug(f"Searching all {max_range} columns in row {index}")
+            debug_enabled = self.logger.isEnabledFor(logging.DEBUG)
             for col in range(1, max_range + 1):
-                cell_value = self.worksheet.cell(row=index, column=col).value
+                cell_value = self._resolve(
+                    self.worksheet.cell(row=index, column=col).value
+                )
                 if cell_value is not None:
-                    self.logger.debug(f"Cell ({index}, {col}) value: {cell_value}")
+                    if debug_enabled:
+                        self.logger.debug(f"Cell ({index}, {col}) value: {cell_value}")
                     if str(cell_value).strip() == str(search_string).strip():
                         self.logger.debug(f"Match found: column {col}")
                         return col
         else:
-            max_range = self.worksheet.max_row
-            self.logger.debug(f"Searching all {max_range} rows in column {index}")
-            for row in range(1, max_range + 1):
-                cell_value = self.worksheet.cell(row=row, column=index).value
-                if cell_value is not None:
-                    self.logger.debug(f"Cell ({row}, {index}) value: {cell_value}")
-                    if str(cell_value).strip() == str(search_string).strip():
-                        self.logger.debug(f"Match found: row {row}")
-                        return row
+            rows = self.build_column_index(index).get(
+                self._normalize_key(search_string)
+            )
+            if rows:
+                self.logger.debug(f"Match found: row {rows[0]}")
+                return rows[0]
 
         self.logger.debug(
             f"No match found for '{search_string}' in {search_type} {index}"
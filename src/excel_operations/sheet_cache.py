@@ -0,0 +1,114 @@
+import os
+import pickle
+from typing import Any, Iterable, List, Optional, Tuple
+from src.log_operations.log_handlers import CustomLogger
+
+
+class ExcelSheetCache:
+    """
+    解析済みのシートの値をバイナリ形式（pickle）でディスクにキャッシュするクラス。
+    キャッシュはワークブックのパス・サイズ・更新時刻（ナノ秒）をキーとし、
+    ワークブックが変更されていない場合のみ有効となる。
+    キャッシュファイルは既定ではワークブックと同じフォルダに「.<ファイル名>.cache」として保存される。
+    """
+
+    FORMAT_VERSION = 1
+
+    def __init__(self, cache_dir: Optional[str] = None):
+        """
+        :param cache_dir: キャッシュファイルを保存するフォルダ（None の場合はワークブックと同じフォルダ）
+        """
+        self.logger = CustomLogger(__name__)
+        self.cache_dir = cache_dir
+
+    def set_cache_dir(self, cache_dir: Optional[str]):
+        """
+        キャッシュファイルを保存するフォルダを設定します。
+        :param cache_dir: フォルダのパス（None の場合はワークブックと同じフォルダ）
+        """
+        self.cache_dir = cache_dir
+
+    def get_cache_path(self, file_path: str) -> str:
+        """
+        ワークブックに対応するキャッシュファイルのパスを返します。
+        :param file_path: ワークブックのパス
+        :return: キャッシュファイルのパス
+        """
+        directory, file_name = os.path.split(os.path.abspath(file_path))
+        return os.path.join(self.cache_dir or directory, f".{file_name}.cache")
+
+    @staticmethod
+    def _get_key(file_path: str) -> Tuple[str, int, int]:
+        stat = os.stat(file_path)
+        return os.path.abspath(file_path), stat.st_size, stat.st_mtime_ns
+
+    def _read(self, file_path: str) -> Optional[dict]:
+        cache_path = self.get_cache_path(file_path)
+        if not os.path.exists(cache_path):
+            return None
+        try:
+            with open(cache_path, "rb") as f:
+                data = pickle.load(f)
+        except Exception as e:
+            self.logger.warning(f"Failed to read sheet cache {cache_path}: {str(e)}")
+            return None
+        if data.get("version") != self.FORMAT_VERSION:
+            return None
+        return data
+
+    def load(self, file_path: str, sheet_name: str) -> Optional[List[Tuple[Any, ...]]]:
+        """
+        ワークブックが変更されていなければ、キャッシュされたシートの行を返します。
+        :param file_path: ワークブックのパス
+        :param sheet_name: シート名
+        :return: 行の値のタプルのリスト。キャッシュがない、または古い場合は None
+        """
+        try:
+            key = self._get_key(file_path)
+        except OSError:
+            return None
+        data = self._read(file_path)
+        if data is None or data.get("key") != key:
+            self.logger.debug(f"Sheet cache miss: {file_path}")
+            return None
+        rows = data["sheets"].get(sheet_name)
+        if rows is None:
+            self.logger.debug(f"Sheet cache miss: {file_path} [{sheet_name}]")
+            return None
+        self.logger.debug(
+            f"Sheet cache hit: {file_path} [{sheet_name}] ({len(rows)} rows)"
+        )
+        return rows
+
+    def store(
+        self, file_path: str, sheet_name: str, rows: Iterable[Tuple[Any, ...]]
+    ) -> bool:
+        """
+        シートの行を現在のワークブックのサイズ・更新時刻をキーとしてキャッシュに保存します。
+        同じワークブックの他のシートのキャッシュは、キーが一致する場合のみ残します。
+        :param file_path: ワークブックのパス
+        :param sheet_name: シート名
+        :param rows: 行の値のタプル（iter_rows(values_only=True) の結果）
+        :return: 保存が成功した場合は True
+        """
+        cache_path = self.get_cache_path(file_path)
+        try:
+            key = self._get_key(file_path)
+            data = self._read(file_path)
+            sheets = data["sheets"] if data and data.get("key") == key else {}
+            sheets[sheet_name] = [tuple(row) for row in rows]
+            temp_path = f"{cache_path}.tmp"
+            with open(temp_path, "wb") as f:
+                pickle.dump(
+                    {"version": self.FORMAT_VERSION, "key": key, "sheets": sheets},
+                    f,
+                    protocol=pickle.HIGHEST_PROTOCOL,
+                )
+            os.replace(temp_path, cache_path)
+            self.logger.debug(
+                f"Stored sheet cache: {cache_path} [{sheet_name}] ({len(sheets[sheet_name])} rows)"
+            )
+            return True
+        except Exception as e:
+            self.logger.warning(f"Failed to store sheet cache {cache_path}: {str(e)}")
+            return False
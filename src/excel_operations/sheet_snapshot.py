@@ -0,0 +1,202 @@
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+import numpy as np
+import pandas as pd
+from src.log_operations.log_handlers import CustomLogger
+from .streamed_sheet import StreamedCell
+
+
+class ExcelSheetSnapshot:
+    """
+    ワークシートの使用範囲を列ごとの配列として一度だけ読み込み、
+    読み取りを配列から行うためのクラス。
+    書き込みは配列上で行い、変更したセル（dirty セル）のみを flush() でワークシートに反映する。
+    ワークシートと同じ読み取りAPI（cell, iter_rows, max_row, max_column）も提供する。
+    """
+
+    def __init__(self, worksheet):
+        """
+        :param worksheet: 読み込み元のワークシート
+        """
+        self.logger = CustomLogger(__name__)
+        self.title = worksheet.title
+        rows = [tuple(row) for row in worksheet.iter_rows(values_only=True)]
+        self.max_row = len(rows)
+        self.max_column = max((len(row) for row in rows), default=0)
+        self._capacity = self.max_row
+        self._columns: List[np.ndarray] = []
+        for column in range(self.max_column):
+            values = np.empty(self._capacity, dtype=object)
+            values[:] = [row[column] if column < len(row) else None for row in rows]
+            self._columns.append(values)
+        self._none_masks: Dict[int, np.ndarray] = {}
+        self._empty_masks: Dict[int, np.ndarray] = {}
+        self.dirty_cells: Set[Tuple[int, int]] = set()
+        self.logger.debug(
+            f"Snapshot of '{self.title}' loaded: {self.max_row} rows, {self.max_column} columns"
+        )
+
+    @staticmethod
+    def _is_empty(value: Any) -> bool:
+        return (
+            value is None
+            or value == ""
+            or (isinstance(value, float) and pd.isna(value))
+        )
+
+    def _ensure_capacity(self, row: int, column: int):
+        """
+        指定されたセルを格納できるように配列を拡張します。
+        """
+        if row > self._capacity:
+            new_capacity = max(row, self._capacity * 2, 16)
+            for i, values in enumerate(self._columns):
+                grown = np.empty(new_capacity, dtype=object)
+                grown[: self._capacity] = values
+                self._columns[i] = grown
+            for masks, fill in ((self._none_masks, True), (self._empty_masks, True)):
+                for i, mask in masks.items():
+                    grown_mask = np.full(new_capacity, fill, dtype=bool)
+                    grown_mask[: self._capacity] = mask
+                    masks[i] = grown_mask
+            self._capacity = new_capacity
+        while len(self._columns) < column:
+            self._columns.append(np.empty(self._capacity, dtype=object))
+
+    def _none_mask(self, column: int) -> np.ndarray:
+        """
+        指定された列の None のセルを示すマスクを返します（列番号は1始まり）。
+        """
+        if column not in self._none_masks:
+            values = self._columns[column - 1]
+            self._none_masks[column] = np.equal(values, None)
+        return self._none_masks[column]
+
+    def _empty_mask(self, column: int) -> np.ndarray:
+        """
+        指定された列の空のセル（None、空文字列、NaN）を示すマスクを返します。
+        """
+        if column not in self._empty_masks:
+            values = self._columns[column - 1]
+            self._empty_masks[column] = pd.isna(values) | np.equal(values, "")
+        return self._empty_masks[column]
+
+    def get_value(self, row: int, column: int) -> Any:
+        """
+        指定されたセルの値を返します。範囲外の場合は None を返します。
+        :param row: 行番号（1始まり）
+        :param column: 列番号（1始まり）
+        :return: セルの値
+        """
+        if row < 1 or column < 1 or row > self.max_row or column > len(self._columns):
+            return None
+        return self._columns[column - 1][row - 1]
+
+    def get_range(self, column: int, start_row: int, end_row: int) -> List[Any]:
+        """
+        指定された列の開始行から終了行までの値をリストで返します。範囲外は None で埋めます。
+        :param column: 列番号
+        :param start_row: 開始行
+        :param end_row: 終了行（この行を含む）
+        :return: 値のリスト
+        """
+        if end_row < start_row:
+            return []
+        size = end_row - start_row + 1
+        if column < 1 or column > len(self._columns):
+            return [None] * size
+        lo = max(start_row, 1)
+        hi = min(end_row, self.max_row)
+        values = self._columns[column - 1][lo - 1 : hi].tolist() if lo <= hi else []
+        head = [None] * (lo - start_row)
+        tail = [None] * (size - len(head) - len(values))
+        return head + values + tail
+
+    def set_value(self, row: int, column: int, value: Any):
+        """
+        配列上のセルの値を更新し、dirty セルとして記録します。
+        :param row: 行番号
+        :param column: 列番号
+        :param value: 書き込む値
+        """
+        self._ensure_capacity(row, column)
+        self._columns[column - 1][row - 1] = value
+        if column in self._none_masks:
+            self._none_masks[column][row - 1] = value is None
+        if column in self._empty_masks:
+            self._empty_masks[column][row - 1] = self._is_empty(value)
+        self.max_row = max(self.max_row, row)
+        self.max_column = max(self.max_column, column)
+        self.dirty_cells.add((row, column))
+
+    def count_nonempty(self, column: int, start_row: int, end_row: int) -> int:
+        """
+        指定された範囲の空でないセル（None、空文字列、NaN 以外）の数を返します。
+        """
+        lo = max(start_row, 1)
+        hi = min(end_row, self.max_row)
+        if column > len(self._columns) or lo > hi:
+            return 0
+        return int(np.count_nonzero(~self._empty_mask(column)[lo - 1 : hi]))
+
+    def filled_rows(self, column: int) -> np.ndarray:
+        """
+        指定された列で値が None でない行番号を昇順の配列で返します。
+        """
+        if column > len(self._columns):
+            return np.empty(0, dtype=np.int64)
+        return np.flatnonzero(~self._none_mask(column)[: self.max_row]) + 1
+
+    def non_empty_rows(self, column: int) -> np.ndarray:
+        """
+        指定された列で値が空でない（None、空文字列、NaN 以外の）行番号を昇順の配列で返します。
+        """
+        if column > len(self._columns):
+            return np.empty(0, dtype=np.int64)
+        return np.flatnonzero(~self._empty_mask(column)[: self.max_row]) + 1
+
+    def flush(self, worksheet) -> int:
+        """
+        dirty セルのみをワークシートに書き戻します。
+        :param worksheet: 書き戻し先のワークシート
+        :return: 書き戻したセルの数
+        """
+        count = len(self.dirty_cells)
+        for row, column in sorted(self.dirty_cells):
+            worksheet.cell(row=row, column=column, value=self.get_value(row, column))
+        self.dirty_cells.clear()
+        self.logger.debug(f"Flushed {count} dirty cells to worksheet '{self.title}'")
+        return count
+
+    def cell(self, row: int, column: int) -> StreamedCell:
+        """
+        openpyxl の Worksheet.cell() と同じ形式で読み取り専用のセルを返します。
+        """
+        return StreamedCell(row, column, self.get_value(row, column))
+
+    def iter_rows(
+        self,
+        min_row: Optional[int] = None,
+        max_row: Optional[int] = None,
+        min_col: Optional[int] = None,
+        max_col: Optional[int] = None,
+        values_only: bool = False,
+    ) -> Iterator[Tuple[Any, ...]]:
+        """
+        openpyxl の Worksheet.iter_rows() と同じ形式で行を返します。
+        """
+        min_row = min_row or 1
+        max_row = max_row or self.max_row
+        min_col = min_col or 1
+        max_col = max_col or self.max_column
+        columns = [
+            self.get_range(column, min_row, max_row)
+            for column in range(min_col, max_col + 1)
+        ]
+        for offset, values in enumerate(zip(*columns)):
+            if values_only:
+                yield values
+            else:
+                yield tuple(
+                    StreamedCell(min_row + offset, min_col + i, value)
+                    for i, value in enumerate(values)
+                )
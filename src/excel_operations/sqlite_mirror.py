@@ -0,0 +1,325 @@
+import json
+import os
+import sqlite3
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from src.log_operations.log_handlers import CustomLogger
+
+
+class ExcelSqliteMirror:
+    """
+    シートの指定された列をローカルの SQLite ファイルに複製し、検索や絞り込みを SQL で行うためのクラス。
+    キー列にはインデックスを作成し、値の存在確認や行の検索をインデックス経由で行う。
+    SQLite 上で変更した値は export() でシートに書き戻す。
+    変更はワークブックの保存後に set_stored_key() で確定されるため、保存されなかった変更は破棄される。
+    ワークブックのパス・サイズ・更新時刻が前回と同じ場合は、既存の SQLite ファイルをそのまま使用する。
+    """
+
+    TABLE_NAME = "sheet_rows"
+    KEY_SUFFIX = "__key"
+
+    def __init__(self, db_path: str):
+        """
+        :param db_path: SQLite ファイルのパス
+        """
+        self.logger = CustomLogger(__name__)
+        self.db_path = db_path
+        self.connection: Optional[sqlite3.Connection] = None
+        self.columns: Dict[str, int] = {}
+        self.key_columns: List[str] = []
+        self._names_by_column: Dict[int, str] = {}
+
+    @staticmethod
+    def get_default_db_path(file_path: str, sheet_name: str) -> str:
+        """
+        ワークブックと同じフォルダにある「.<ファイル名>.<シート名>.sqlite」のパスを返します。
+        :param file_path: ワークブックのパス
+        :param sheet_name: シート名
+        :return: SQLite ファイルのパス
+        """
+        directory, file_name = os.path.split(os.path.abspath(file_path))
+        return os.path.join(directory, f".{file_name}.{sheet_name}.sqlite")
+
+    @staticmethod
+    def _quote(name: str) -> str:
+        return '"' + name.replace('"', '""') + '"'
+
+    @staticmethod
+    def _normalize_key(value: Any) -> Optional[str]:
+        """
+        ExcelSearchHandler の列インデックスと同じ規則でキーを正規化します。
+        """
+        if value is None:
+            return None
+        return str(value).strip()
+
+    @staticmethod
+    def _to_sql_value(value: Any) -> Any:
+        if value is None or isinstance(value, (str, int, float, bytes)):
+            return value
+        return str(value)
+
+    @staticmethod
+    def get_file_key(
+        file_path: str, sheet_name: str, columns: Dict[str, int], start_row: int
+    ) -> str:
+        """
+        ワークブックのパス・サイズ・更新時刻と対象の列・開始行から、複製が最新かどうかを判定するキーを作成します。
+        """
+        stat = os.stat(file_path)
+        return json.dumps(
+            [
+                os.path.abspath(file_path),
+                stat.st_size,
+                stat.st_mtime_ns,
+                sheet_name,
+                sorted(columns.items()),
+                start_row,
+            ]
+        )
+
+    def open(
+        self,
+        columns: Dict[str, int],
+        key_columns: Optional[List[str]] = None,
+    ):
+        """
+        SQLite ファイルを開き、列の対応を設定します。
+        :param columns: 複製する列の辞書（列名: 列番号）
+        :param key_columns: インデックスを作成する列名のリスト
+        """
+        self.close()
+        self.columns = {name: column for name, column in columns.items() if column}
+        self.key_columns = [name for name in key_columns or [] if name in self.columns]
+        self._names_by_column = {column: name for name, column in self.columns.items()}
+        self.connection = sqlite3.connect(self.db_path, check_same_thread=False)
+        self.logger.debug(f"Opened SQLite mirror: {self.db_path}")
+
+    def close(self):
+        """
+        SQLite ファイルを閉じます。
+        """
+        if self.connection is not None:
+            self.connection.close()
+            self.connection = None
+
+    def get_stored_key(self) -> Optional[str]:
+        """
+        SQLite ファイルに記録されている複製元のキーを返します。
+        """
+        try:
+            row = self.connection.execute(
+                "SELECT value FROM meta WHERE name = 'file_key'"
+            ).fetchone()
+        except sqlite3.Error:
+            return None
+        return row[0] if row else None
+
+    def set_stored_key(self, file_key: str):
+        """
+        複製元のキーを記録し、それまでの変更を確定します。
+        保存後にシートと複製が一致している場合に呼び出します。
+        """
+        self.connection.execute(
+            "INSERT OR REPLACE INTO meta (name, value) VALUES ('file_key', ?)",
+            (file_key,),
+        )
+        self.connection.commit()
+
+    def build(self, rows: Iterable[Tuple[int, Tuple[Any, ...]]], file_key: str):
+        """
+        シートの行から SQLite のテーブルを作り直します。
+        :param rows: (行番号, 行の値のタプル) のイテラブル。値の位置は列番号 - 1
+        :param file_key: get_file_key() で作成したキー
+        """
+        names = list(self.columns)
+        table = self._quote(self.TABLE_NAME)
+        definitions = ['"row" INTEGER PRIMARY KEY'] + [
+            self._quote(name) for name in names
+        ]
+        definitions += [
+            f"{self._quote(name + self.KEY_SUFFIX)} TEXT" for name in self.key_columns
+        ]
+        cursor = self.connection.cursor()
+        cursor.execute(f"DROP TABLE IF EXISTS {table}")
+        cursor.execute("DROP TABLE IF EXISTS dirty_cells")
+        cursor.execute("DROP TABLE IF EXISTS meta")
+        cursor.execute(f"CREATE TABLE {table} ({', '.join(definitions)})")
+        cursor.execute(
+            'CREATE TABLE dirty_cells ("row" INTEGER, name TEXT, PRIMARY KEY ("row", name))'
+        )
+        cursor.execute("CREATE TABLE meta (name TEXT PRIMARY KEY, value TEXT)")
+
+        insert_names = ['"row"'] + [self._quote(name) for name in names]
+        insert_names += [
+            self._quote(name + self.KEY_SUFFIX) for name in self.key_columns
+        ]
+        placeholders = ", ".join("?" * len(insert_names))
+        sql = f"INSERT INTO {table} ({', '.join(insert_names)}) VALUES ({placeholders})"
+
+        def to_record(row: int, values: Tuple[Any, ...]) -> List[Any]:
+            picked = {
+                name: values[column - 1] if column <= len(values) else None
+                for name, column in self.columns.items()
+            }
+            return (
+                [row]
+                + [self._to_sql_value(picked[name]) for name in names]
+                + [self._normalize_key(picked[name]) for name in self.key_columns]
+            )
+
+        cursor.executemany(sql, (to_record(row, values) for row, values in rows))
+        for name in self.key_columns:
+            cursor.execute(
+                f"CREATE INDEX {self._quote('idx_' + name)} ON {table} "
+                f"({self._quote(name + self.KEY_SUFFIX)})"
+            )
+        self.connection.commit()
+        self.set_stored_key(file_key)
+        count = cursor.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+        self.logger.debug(
+            f"Built SQLite mirror with {count} rows, indexed on {self.key_columns}"
+        )
+
+    def _upsert(self, row: int, name: str, value: Any):
+        table = self._quote(self.TABLE_NAME)
+        assignments = [f"{self._quote(name)} = ?"]
+        params = [self._to_sql_value(value)]
+        if name in self.key_columns:
+            assignments.append(f"{self._quote(name + self.KEY_SUFFIX)} = ?")
+            params.append(self._normalize_key(value))
+        self.connection.execute(
+            f'INSERT OR IGNORE INTO {table} ("row") VALUES (?)', (row,)
+        )
+        self.connection.execute(
+            f"UPDATE {table} SET {', '.join(assignments)} WHERE \"row\" = ?",
+            params + [row],
+        )
+
+    def update_cell(self, row: int, column: int, value: Any):
+        """
+        シートのセルが更新された際に、複製している列であれば SQLite にも反映します。
+        :param row: 行番号
+        :param column: 列番号
+        :param value: 書き込まれた値
+        """
+        name = self._names_by_column.get(column)
+        if name is None or self.connection is None:
+            return
+        self._upsert(row, name, value)
+
+    def set_value(self, row: int, name: str, value: Any):
+        """
+        SQLite 上の値を更新し、export() でシートに書き戻す対象として記録します。
+        :param row: 行番号
+        :param name: 列名
+        :param value: 書き込む値
+        """
+        self._upsert(row, name, value)
+        self.connection.execute(
+            'INSERT OR IGNORE INTO dirty_cells ("row", name) VALUES (?, ?)',
+            (row, name),
+        )
+
+    def get_value(self, row: int, name: str) -> Any:
+        """
+        指定された行と列名の値を返します。
+        """
+        result = self.connection.execute(
+            f'SELECT {self._quote(name)} FROM {self._quote(self.TABLE_NAME)} WHERE "row" = ?',
+            (row,),
+        ).fetchone()
+        return result[0] if result else None
+
+    def find_rows(self, name: str, value: Any) -> List[int]:
+        """
+        指定された列の値が一致する行番号を昇順で返します。
+        キー列の場合は前後の空白を除いた文字列としてインデックスで検索する。
+        :param name: 列名
+        :param value: 検索する値
+        :return: 行番号のリスト
+        """
+        table = self._quote(self.TABLE_NAME)
+        if name in self.key_columns:
+            column, param = self._quote(name + self.KEY_SUFFIX), self._normalize_key(
+                value
+            )
+        else:
+            column, param = self._quote(name), self._to_sql_value(value)
+        rows = self.connection.execute(
+            f'SELECT "row" FROM {table} WHERE {column} = ? ORDER BY "row"', (param,)
+        ).fetchall()
+        return [row for (row,) in rows]
+
+    def contains(self, name: str, value: Any) -> bool:
+        """
+        指定された列に値が存在するかどうかを返します。
+        """
+        return bool(self.find_rows(name, value))
+
+    def select(
+        self,
+        names: Optional[List[str]] = None,
+        where: Optional[Dict[str, Any]] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        条件に一致する行を行番号順に返します。
+        :param names: 取得する列名のリスト（None の場合は全ての列）
+        :param where: 条件の辞書（列名: 値）。値が None の場合は空のセルに一致する
+        :return: 「row」と列名をキーとする辞書のリスト
+        """
+        names = names or list(self.columns)
+        selected = ['"row"'] + [self._quote(name) for name in names]
+        conditions, params = [], []
+        for name, value in (where or {}).items():
+            if value is None:
+                conditions.append(
+                    f"({self._quote(name)} IS NULL OR {self._quote(name)} = '')"
+                )
+            else:
+                conditions.append(f"{self._quote(name)} = ?")
+                params.append(self._to_sql_value(value))
+        sql = f"SELECT {', '.join(selected)} FROM {self._quote(self.TABLE_NAME)}"
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+        sql += ' ORDER BY "row"'
+        return [
+            dict(zip(["row"] + names, record))
+            for record in self.connection.execute(sql, params)
+        ]
+
+    def query(self, sql: str, params: Tuple[Any, ...] = ()) -> List[Tuple[Any, ...]]:
+        """
+        任意の SQL を実行し、結果を返します。テーブル名は TABLE_NAME、列名はシートの列名。
+        """
+        return self.connection.execute(sql, params).fetchall()
+
+    def export(self, cell_handler) -> int:
+        """
+        set_value() で変更した値をシートに書き戻します。
+        書き戻しに失敗したセルは変更済みのまま残し、次回の export() で再度書き戻す。
+        :param cell_handler: 書き戻しに使用する ExcelCellHandler
+        :return: 書き戻したセルの数
+        """
+        dirty_cells = self.connection.execute(
+            'SELECT "row", name FROM dirty_cells ORDER BY "row"'
+        ).fetchall()
+        written = []
+        failed = []
+        for row, name in dirty_cells:
+            if cell_handler.update_cell(
+                row, self.columns[name], self.get_value(row, name)
+            ):
+                written.append((row, name))
+            else:
+                failed.append((row, name))
+        self.connection.executemany(
+            'DELETE FROM dirty_cells WHERE "row" = ? AND name = ?', written
+        )
+        self.connection.commit()
+        if failed:
+            self.logger.error(
+                f"Failed to export {len(failed)} cells from SQLite mirror: "
+                + ", ".join(f"row {row} {name}" for row, name in failed)
+            )
+        self.logger.debug(f"Exported {len(written)} cells from SQLite mirror")
+        return len(written)
@@ -0,0 +1,123 @@
+from typing import Any, Iterator, List, Optional, Tuple
+from openpyxl.utils.cell import coordinate_from_string, column_index_from_string
+from src.log_operations.log_handlers import CustomLogger
+
+
+class StreamedCell:
+    """
+    ExcelStreamedSheet.cell() が返す読み取り専用のセル。
+    openpyxl のセルと同じく value 属性で値を参照できる。
+    """
+
+    __slots__ = ("row", "column", "value")
+
+    def __init__(self, row: int, column: int, value: Any):
+        self.row = row
+        self.column = column
+        self.value = value
+
+
+class ExcelStreamedSheet:
+    """
+    読み取り専用モードで開いたワークシートを iter_rows(values_only=True) で
+    1回だけ読み込み、openpyxl のワークシートと同じ読み取りAPIで参照できるようにするクラス。
+    書き込みはできないため、書き込みが必要な場合は ExcelManager.ensure_writable() を使用する。
+    """
+
+    read_only = True
+
+    def __init__(self, worksheet):
+        """
+        :param worksheet: 読み込み元のワークシート（読み取り専用モードでも可）
+        """
+        self.logger = CustomLogger(__name__)
+        self._set_rows(
+            worksheet.title,
+            [tuple(row) for row in worksheet.iter_rows(values_only=True)],
+        )
+
+    @classmethod
+    def from_rows(cls, title: str, rows: List[Tuple[Any, ...]]) -> "ExcelStreamedSheet":
+        """
+        読み込み済みの行の値から ExcelStreamedSheet を作成します。
+        :param title: シート名
+        :param rows: 行の値のタプルのリスト
+        :return: ExcelStreamedSheet
+        """
+        sheet = cls.__new__(cls)
+        sheet.logger = CustomLogger(__name__)
+        sheet._set_rows(title, rows)
+        return sheet
+
+    def _set_rows(self, title: str, rows: List[Tuple[Any, ...]]):
+        self.title = title
+        self.rows = rows
+        self.max_row = len(self.rows)
+        self.max_column = max((len(row) for row in self.rows), default=0)
+        self.logger.debug(
+            f"Streamed sheet '{self.title}': {self.max_row} rows, {self.max_column} columns"
+        )
+
+    def get_value(self, row: int, column: int) -> Any:
+        """
+        指定されたセルの値を返します。範囲外の場合は None を返します。
+        :param row: 行番号（1始まり）
+        :param column: 列番号（1始まり）
+        :return: セルの値
+        """
+        if row < 1 or column < 1 or row > self.max_row:
+            return None
+        values = self.rows[row - 1]
+        if column > len(values):
+            return None
+        return values[column - 1]
+
+    def cell(self, row: int, column: int, value: Any = None) -> StreamedCell:
+        """
+        openpyxl の Worksheet.cell() と同じ形式でセルを返します。
+        :param row: 行番号
+        :param column: 列番号
+        :param value: 書き込む値（読み取り専用のため指定するとエラー）
+        :return: StreamedCell
+        """
+        if value is not None:
+            raise TypeError(
+                f"Sheet '{self.title}' is opened in read-only mode and cannot be written"
+            )
+        return StreamedCell(row, column, self.get_value(row, column))
+
+    def __getitem__(self, coordinate: str) -> StreamedCell:
+        column_letter, row = coordinate_from_string(coordinate)
+        return self.cell(row=row, column=column_index_from_string(column_letter))
+
+    def iter_rows(
+        self,
+        min_row: Optional[int] = None,
+        max_row: Optional[int] = None,
+        min_col: Optional[int] = None,
+        max_col: Optional[int] = None,
+        values_only: bool = False,
+    ) -> Iterator[Tuple[Any, ...]]:
+        """
+        openpyxl の Worksheet.iter_rows() と同じ形式で行を返します。
+        :param min_row: 開始行（デフォルトは1）
+        :param max_row: 終了行（デフォルトは最終行）
+        :param min_col: 開始列（デフォルトは1）
+        :param max_col: 終了列（デフォルトは最終列）
+        :param values_only: True の場合は値のタプル、False の場合はセルのタプルを返す
+        """
+        min_row = min_row or 1
+        max_row = max_row or self.max_row
+        min_col = min_col or 1
+        max_col = max_col or self.max_column
+        for row in range(min_row, max_row + 1):
+            values = tuple(
+                self.get_value(row, column) for column in range(min_col, max_col + 1)
+            )
+            if values_only:
+                yield values
+            else:
+                yield tuple(
+                    StreamedCell(row, min_col + i, value)
+                    for i, value in enumerate(values)
+                )
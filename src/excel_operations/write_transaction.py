@@ -0,0 +1,111 @@
+import time
+from typing import Dict, Optional, Set
+from src.log_operations.log_handlers import CustomLogger
+
+
+class ExcelWriteTransaction:
+    """
+    トランザクション中のセル書き込みをメモリ上に溜め、保存要求をまとめて1回の保存にするクラス。
+    トランザクション中の ExcelFileHandler.save() は即座には保存せず、
+    コミット時、または指定された時間間隔・行数に達した時点でまとめて保存する。
+    """
+
+    def __init__(
+        self,
+        file_handler,
+        save_every_rows: Optional[int] = None,
+        save_interval: Optional[float] = None,
+    ):
+        """
+        :param file_handler: 保存を行う ExcelFileHandler
+        :param save_every_rows: 書き込まれた行数がこの数に達したら途中保存する（None の場合はコミット時のみ）
+        :param save_interval: 前回の保存からこの秒数が経過したら途中保存する（None の場合はコミット時のみ）
+        """
+        self.logger = CustomLogger(__name__)
+        self.file_handler = file_handler
+        self.save_every_rows = save_every_rows
+        self.save_interval = save_interval
+        self.cells_written = 0
+        self.saves_requested = 0
+        self.saves_performed = 0
+        self._pending_cells = 0
+        self._pending_rows: Set[int] = set()
+        self._last_flush_time = time.monotonic()
+
+    def record_write(self, row: int, column: int):
+        """
+        セルの書き込みを記録します。
+        :param row: 書き込まれた行番号
+        :param column: 書き込まれた列番号
+        """
+        self.cells_written += 1
+        self._pending_cells += 1
+        self._pending_rows.add(row)
+
+    def request_save(self) -> bool:
+        """
+        保存要求を受け付けます。途中保存の条件を満たした場合のみ実際に保存します。
+        :return: 保存に失敗した場合のみ False
+        """
+        self.saves_requested += 1
+        if self._should_flush():
+            return self.flush()
+        self.logger.debug(
+            f"Save request deferred ({self._pending_cells} cells in {len(self._pending_rows)} rows pending)"
+        )
+        return True
+
+    def _should_flush(self) -> bool:
+        if not self._pending_cells:
+            return False
+        if (
+            self.save_every_rows is not None
+            and len(self._pending_rows) >= self.save_every_rows
+        ):
+            return True
+        if (
+            self.save_interval is not None
+            and time.monotonic() - self._last_flush_time >= self.save_interval
+        ):
+            return True
+        return False
+
+    def flush(self) -> bool:
+        """
+        溜まっている書き込みがあればワークブックを保存します。
+        :return: 保存が成功した場合（または保存するものがない場合）は True
+        """
+        if not self._pending_cells:
+            return True
+        result = self.file_handler.save(force=True)
+        self.saves_performed += 1
+        self._last_flush_time = time.monotonic()
+        if result:
+            self._pending_cells = 0
+            self._pending_rows.clear()
+        return result
+
+    def commit(self) -> bool:
+        """
+        トランザクションを確定し、溜まっている書き込みを保存します。
+        :return: 保存が成功した場合は True
+        """
+        result = self.flush()
+        summary = self.summary()
+        self.logger.info(
+            f"Excel transaction committed: {summary['cells_written']} cells written, "
+            f"{summary['saves_requested']} save requests coalesced into {summary['saves_performed']} saves"
+        )
+        return result
+
+    def summary(self) -> Dict[str, int]:
+        """
+        書き込みと保存の集計結果を返します。
+        :return: 書き込んだセル数、保存要求数、実際の保存回数、まとめられた保存要求数の辞書
+        """
+        return {
+            "cells_written": self.cells_written,
+            "saves_requested": self.saves_requested,
+            "saves_performed": self.saves_performed,
+            "saves_coalesced": max(self.saves_requested - self.saves_performed, 0),
+        }
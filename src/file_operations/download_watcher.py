@@ -0,0 +1,323 @@
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional, Set, Tuple
+from src.log_operations.log_handlers import CustomLogger
+
+logger = CustomLogger(__name__)
+
+# inotify のイベント（linux/inotify.h）
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_Q_OVERFLOW = 0x00004000
+IN_ISDIR = 0x40000000
+INOTIFY_EVENT = struct.Struct("iIII")
+WATCH_MASK = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE
+
+
+class DownloadWatcher:
+    """
+    ダウンロードフォルダを監視し、ブラウザが保存したファイルの書き込みが終わるまで待機するクラス。
+    Linux では inotify（ctypes 経由）で、ファイルと「_files」フォルダ内のファイルが
+    閉じられた時点で待機を終了する。それ以外の環境や inotify が使えない場合は、
+    ファイルとフォルダの合計サイズと更新時刻が一定時間変化しなくなるまでポーリングする。
+    保存の操作を行う前に start() を呼び出し、操作の後に wait_for_download() で待機する。
+    """
+
+    BACKEND_AUTO = "auto"
+    BACKEND_INOTIFY = "inotify"
+    BACKEND_POLLING = "polling"
+    # start() より前に更新されたファイルを古いファイルとみなす際の、更新時刻の誤差の許容範囲
+    MTIME_TOLERANCE_NS = 2_000_000_000
+
+    def __init__(
+        self,
+        folder_path: Optional[str] = None,
+        backend: str = BACKEND_AUTO,
+        poll_interval: float = 0.2,
+        stable_time: float = 1.0,
+        quiet_time: float = 0.3,
+    ):
+        """
+        :param folder_path: 監視するフォルダのパス
+        :param backend: "auto"・"inotify"・"polling" のいずれか
+        :param poll_interval: ポーリングの間隔（秒）
+        :param stable_time: ポーリングの際、サイズが変化しなくなってから完了とみなすまでの時間（秒）
+        :param quiet_time: inotify の際、ファイルが閉じられた後にイベントがないことを確認する時間（秒）
+        """
+        self.folder_path = folder_path
+        self.backend = self.resolve_backend(backend)
+        self.poll_interval = poll_interval
+        self.stable_time = stable_time
+        self.quiet_time = quiet_time
+        self._libc = None
+        self._fd: Optional[int] = None
+        self._watches: Dict[int, str] = {}
+        self._start_time_ns: Optional[int] = None
+
+    def set_folder_path(self, folder_path: str):
+        """
+        監視するフォルダのパスを設定します。
+        :param folder_path: 監視するフォルダのパス
+        """
+        self.folder_path = folder_path
+
+    def set_backend(self, backend: str):
+        """
+        監視の方法を設定します。
+        :param backend: "auto"・"inotify"・"polling" のいずれか
+        """
+        self.backend = self.resolve_backend(backend)
+
+    @classmethod
+    def resolve_backend(cls, backend: str = BACKEND_AUTO) -> str:
+        """
+        "auto" の場合、inotify が使用できれば "inotify"、そうでなければ "polling" を返します。
+        :param backend: "auto"・"inotify"・"polling" のいずれか
+        :return: 使用する監視の方法
+        """
+        if backend == cls.BACKEND_AUTO:
+            return (
+                cls.BACKEND_INOTIFY
+                if cls._load_libc() is not None
+                else cls.BACKEND_POLLING
+            )
+        if backend not in (cls.BACKEND_INOTIFY, cls.BACKEND_POLLING):
+            raise ValueError(f"Unknown download watcher backend: {backend}")
+        return backend
+
+    @staticmethod
+    def _load_libc():
+        if not sys.platform.startswith("linux"):
+            return None
+        try:
+            libc = ctypes.CDLL(
+                ctypes.util.find_library("c") or "libc.so.6", use_errno=True
+            )
+        except OSError:
+            return None
+        if not hasattr(libc, "inotify_init1"):
+            return None
+        return libc
+
+    def start(self):
+        """
+        監視を開始します。ブラウザで保存の操作を行う前に呼び出す。
+        """
+        self.stop()
+        self._start_time_ns = time.time_ns()
+        if self.backend != self.BACKEND_INOTIFY:
+            return
+        self._libc = self._load_libc()
+        fd = self._libc.inotify_init1(os.O_NONBLOCK | getattr(os, "O_CLOEXEC", 0))
+        if fd < 0:
+            logger.warning(
+                f"inotify_init1 failed ({os.strerror(ctypes.get_errno())}), falling back to polling"
+            )
+            return
+        self._fd = fd
+        if self._add_watch(self.folder_path, "") is None:
+            self.stop()
+            self._start_time_ns = time.time_ns()
+
+    def stop(self):
+        """
+        監視を終了します。
+        """
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+        self._watches = {}
+        self._start_time_ns = None
+
+    @contextmanager
+    def watch(self) -> Iterator["DownloadWatcher"]:
+        """
+        with ブロックの間だけ監視を行うコンテキストマネージャー。
+        """
+        self.start()
+        try:
+            yield self
+        finally:
+            self.stop()
+
+    def _add_watch(self, path: str, relative_path: str) -> Optional[int]:
+        wd = self._libc.inotify_add_watch(
+            self._fd, os.fsencode(path), ctypes.c_uint32(WATCH_MASK)
+        )
+        if wd < 0:
+            logger.warning(
+                f"inotify_add_watch failed for '{path}': {os.strerror(ctypes.get_errno())}"
+            )
+            return None
+        self._watches[wd] = relative_path
+        return wd
+
+    def _read_events(self, timeout: float) -> Iterator[Tuple[str, int, str]]:
+        """
+        inotify のイベントを (フォルダの相対パス, マスク, 名前) として返します。
+        timeout 秒以内にイベントがなければ何も返さない。
+        """
+        readable, _, _ = select.select([self._fd], [], [], max(timeout, 0))
+        if not readable:
+            return
+        try:
+            data = os.read(self._fd, 64 * 1024)
+        except BlockingIOError:
+            return
+        offset = 0
+        while offset + INOTIFY_EVENT.size <= len(data):
+            wd, mask, _, length = INOTIFY_EVENT.unpack_from(data, offset)
+            offset += INOTIFY_EVENT.size
+            name = os.fsdecode(data[offset : offset + length].rstrip(b"\0"))
+            offset += length
+            yield self._watches.get(wd, ""), mask, name
+
+    def wait_for_download(
+        self,
+        file_name: str,
+        folder_name: Optional[str] = None,
+        timeout: float = 60.0,
+    ) -> bool:
+        """
+        監視フォルダにファイル（と関連ファイルのフォルダ）が保存され、書き込みが終わるまで待機します。
+        :param file_name: 保存されるファイルの名前
+        :param folder_name: ファイルと一緒に保存されるフォルダの名前（例: 「<名前>_files」）
+        :param timeout: 最大待機時間（秒）
+        :return: タイムアウト前に保存が完了した場合は True、そうでない場合は False
+        """
+        deadline = time.monotonic() + timeout
+        with logger.span("download.wait", file=file_name, backend=self.backend) as span:
+            if self._fd is not None:
+                result = self._wait_inotify(file_name, folder_name, deadline)
+                if result is None:
+                    # イベントの取りこぼしが発生した場合は残りの時間をポーリングで待機する
+                    result = self._wait_polling(file_name, folder_name, deadline)
+            else:
+                result = self._wait_polling(file_name, folder_name, deadline)
+            span["completed"] = result
+        if result:
+            logger.debug(f"Download completed: {file_name}")
+        else:
+            logger.warning(
+                f"Download did not complete within {timeout} seconds: {file_name}"
+            )
+        return result
+
+    def _wait_inotify(
+        self, file_name: str, folder_name: Optional[str], deadline: float
+    ) -> Optional[bool]:
+        """
+        ファイルが閉じられ、フォルダ内で作成されたファイルもすべて閉じられた後、
+        quiet_time の間イベントがなければ完了とする。
+        フォルダの監視を始める前にファイルが作成されていた場合は、
+        最後に quiet_time の間サイズが変化しないことをポーリングで確認する。
+        :return: 完了した場合は True、タイムアウトの場合は False、イベントを取りこぼした場合は None
+        """
+        file_closed = False
+        pending: Set[str] = set()
+        # フォルダの監視を始める前に作成されたファイルがある場合、書き込みの終了を検知できない
+        unobserved_files = False
+        last_event = time.monotonic()
+        while True:
+            now = time.monotonic()
+            if file_closed and not pending and now - last_event >= self.quiet_time:
+                if unobserved_files:
+                    return self._wait_polling(
+                        file_name, folder_name, deadline, self.quiet_time
+                    )
+                return True
+            if now >= deadline:
+                return False
+            wait = deadline - now
+            if file_closed and not pending:
+                wait = min(wait, self.quiet_time - (now - last_event))
+            for folder, mask, name in self._read_events(wait):
+                if mask & IN_Q_OVERFLOW:
+                    logger.warning("inotify event queue overflowed")
+                    return None
+                if folder == "" and name == file_name:
+                    last_event = time.monotonic()
+                    file_closed = bool(mask & (IN_CLOSE_WRITE | IN_MOVED_TO))
+                elif folder == "" and folder_name and name == folder_name:
+                    last_event = time.monotonic()
+                    if mask & IN_ISDIR and mask & (IN_CREATE | IN_MOVED_TO):
+                        folder_path = os.path.join(self.folder_path, folder_name)
+                        self._add_watch(folder_path, folder_name)
+                        try:
+                            unobserved_files = unobserved_files or bool(
+                                os.listdir(folder_path)
+                            )
+                        except OSError:
+                            pass
+                elif folder and folder == folder_name:
+                    last_event = time.monotonic()
+                    if mask & IN_CREATE and not mask & IN_ISDIR:
+                        pending.add(name)
+                    elif mask & (IN_CLOSE_WRITE | IN_MOVED_TO):
+                        pending.discard(name)
+
+    def _snapshot(
+        self, file_path: str, folder_path: Optional[str]
+    ) -> Optional[Tuple[int, int, int, int]]:
+        """
+        ファイルのサイズと更新時刻、フォルダ内のファイル数と合計サイズを返します。
+        ファイルが存在しない場合や start() より前のファイルの場合は None を返す。
+        """
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            return None
+        if (
+            self._start_time_ns is not None
+            and stat.st_mtime_ns < self._start_time_ns - self.MTIME_TOLERANCE_NS
+        ):
+            return None
+        count = 0
+        total_size = 0
+        if folder_path and os.path.isdir(folder_path):
+            for root, _, files in os.walk(folder_path):
+                for name in files:
+                    try:
+                        total_size += os.stat(os.path.join(root, name)).st_size
+                    except OSError:
+                        continue
+                    count += 1
+        return stat.st_size, stat.st_mtime_ns, count, total_size
+
+    def _wait_polling(
+        self,
+        file_name: str,
+        folder_name: Optional[str],
+        deadline: float,
+        stable_time: Optional[float] = None,
+    ) -> bool:
+        """
+        ファイルが存在し、ファイルとフォルダの状態が stable_time の間変化しなければ完了とする。
+        """
+        if stable_time is None:
+            stable_time = self.stable_time
+        file_path = os.path.join(self.folder_path, file_name)
+        folder_path = (
+            os.path.join(self.folder_path, folder_name) if folder_name else None
+        )
+        last_snapshot = None
+        stable_since = None
+        while True:
+            snapshot = self._snapshot(file_path, folder_path)
+            now = time.monotonic()
+            if snapshot is None or snapshot != last_snapshot:
+                stable_since = now if snapshot is not None else None
+            elif now - stable_since >= stable_time:
+                return True
+            last_snapshot = snapshot
+            if now >= deadline:
+                return False
+            time.sleep(min(self.poll_interval, max(deadline - now, 0)))
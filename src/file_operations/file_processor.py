@@ -1,8 +1,23 @@
 import os
+import re
 import json
-from typing import Callable, List, Dict, Optional
+import pickle
+import types
+import hashlib
+import functools
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    as_completed,
+    wait,
+)
+from typing import Any, Callable, IO, Iterable, Iterator, List, Dict, Optional, Tuple
 from src.log_operations.log_handlers import CustomLogger
-import time
+from src.text_operations.text_replacer import TextReplacePipeline
+from src.folder_operations.folder_walker import FolderWalker
+from src.file_operations.download_watcher import DownloadWatcher
 import glob
 import shutil
 
@@ -53,26 +68,27 @@ class FileHandler:
             logger.debug(f"File not found: {file_path}")
         return result
 
+    @staticmethod
     def wait_for_file(
         file_path: str, timeout: int = 60, check_interval: float = 1.0
     ) -> bool:
         """
-        指定されたファイルが存在するまで一定時間待機します。
+        指定されたファイルが存在し、書き込みが終わる（サイズと更新時刻が変化しなくなる）まで待機します。
+        ブラウザの保存などを待つ場合は、保存の操作の前に監視を開始できる DownloadWatcher を使用する。
 
         :param file_path: 存在確認するファイルのパス
         :param timeout: 最大待機時間（秒）
         :param check_interval: チェック間隔（秒）
         :return: タイムアウト前にファイルが見つかった場合はTrue、そうでない場合はFalse
         """
-        start_time = time.time()
-        while time.time() - start_time < timeout:
-            if os.path.exists(file_path):
-                logger.debug(f"File found: {file_path}")
-                return True
-            time.sleep(check_interval)
-
-        logger.debug(f"File not found within {timeout} seconds: {file_path}")
-        return False
+        folder_path, file_name = os.path.split(os.path.abspath(file_path))
+        watcher = DownloadWatcher(
+            folder_path,
+            backend=DownloadWatcher.BACKEND_POLLING,
+            poll_interval=check_interval,
+            stable_time=check_interval,
+        )
+        return watcher.wait_for_download(file_name, timeout=timeout)
 
     @staticmethod
     def check_file_with_interval(
@@ -80,26 +96,16 @@ class FileHandler:
     ) -> bool:
         """
         指定された間隔でファイルの存在を確認し、指定された回数だけ繰り返します。
+        ファイルが見つかった場合は、書き込みが終わるまで待機する。
 
         :param file_path: 存在確認するファイルのパス
         :param interval: 確認間隔（秒）
         :param max_attempts: 最大試行回数
         :return: ファイルが見つかった場合はTrue、そうでない場合はFalse
         """
-        for attempt in range(max_attempts):
-            logger.debug(
-                f"Attempt {attempt + 1}/{max_attempts}: Waiting {interval} seconds before checking for file: {file_path}"
-            )
-            time.sleep(interval)
-
-            if os.path.exists(file_path):
-                logger.debug(f"File found after {attempt + 1} attempts: {file_path}")
-                return True
-
-            logger.debug(f"File not found on attempt {attempt + 1}: {file_path}")
-
-        logger.debug(f"File not found after {max_attempts} attempts: {file_path}")
-        return False
+        return FileHandler.wait_for_file(
+            file_path, timeout=interval * max_attempts, check_interval=interval
+        )
 
     @staticmethod
     def create_empty_files(folder_path: str, file_names: list):
@@ -154,11 +160,7 @@ class FileHandler:
         :param extension: 検索する拡張子（例: '.webp'）
         :return: 指定された拡張子を持つファイルの完全パスのリスト
         """
-        matching_files = []
-        for root, dirs, files in os.walk(folder_path):
-            for file in files:
-                if file.endswith(extension):
-                    matching_files.append(os.path.join(root, file))
+        matching_files = list(FolderWalker.iter_files(folder_path, extension))
         logger.debug(
             f"Found {len(matching_files)} files with extension {extension} in {folder_path}"
         )
@@ -177,13 +179,15 @@ class FileHandler:
         :return: 移動したファイルの数
         """
         moved_count = 0
-        for root, dirs, files in os.walk(source_folder):
-            for file in files:
-                if name_contains in file:
-                    source_path = os.path.join(root, file)
-                    dest_path = os.path.join(dest_folder, file)
-                    if FileHandler.move_file(source_path, dest_path):
-                        moved_count += 1
+        source_paths = [
+            file_path
+            for file_path in FolderWalker.iter_files(source_folder)
+            if name_contains in os.path.basename(file_path)
+        ]
+        for source_path in source_paths:
+            dest_path = os.path.join(dest_folder, os.path.basename(source_path))
+            if FileHandler.move_file(source_path, dest_path):
+                moved_count += 1
         logger.debug(
             f"Moved {moved_count} files containing '{name_contains}' from {source_folder} to {dest_folder}"
         )
@@ -230,6 +234,194 @@ class FileReader:
         return None
 
 
+class FrontMatterReader:
+    """
+    Markdown / MDX ファイルの先頭にあるフロントマター（「---」で囲まれた部分）のみを読み込むクラス。
+    ファイルは1行ずつ読み込み、閉じる「---」または目的の行が見つかった時点で読み込みを終了するため、
+    本文は読み込まない。複数のファイルはスレッドプールで並行して読み込むことができる。
+    """
+
+    MARKER = "---"
+
+    def __init__(self, max_workers: int = 8):
+        """
+        :param max_workers: 複数のファイルを読み込む際のスレッド数
+        """
+        self.max_workers = max_workers
+
+    def set_max_workers(self, max_workers: int):
+        """
+        複数のファイルを読み込む際のスレッド数を設定します。
+        :param max_workers: スレッド数
+        """
+        self.max_workers = max_workers
+
+    @classmethod
+    def _iter_front_matter_lines(cls, file: IO[str]) -> Iterator[str]:
+        """
+        フロントマターの行（開始・終了の「---」を除く）を返します。
+        ファイルの先頭が「---」でない場合は何も返さない。
+        """
+        first_line = file.readline()
+        if first_line.strip() != cls.MARKER:
+            return
+        for line in file:
+            if line.strip() == cls.MARKER:
+                return
+            yield line
+
+    @staticmethod
+    def _parse_scalar(value: str) -> str:
+        value = value.strip()
+        if len(value) >= 2 and value[0] == value[-1] and value[0] in ("'", '"'):
+            return value[1:-1]
+        return value
+
+    @classmethod
+    def _parse_value(cls, value: str) -> Any:
+        value = value.strip()
+        if value.startswith("[") and value.endswith("]"):
+            inner = value[1:-1].strip()
+            return (
+                [cls._parse_scalar(item) for item in inner.split(",")] if inner else []
+            )
+        return cls._parse_scalar(value)
+
+    @classmethod
+    def parse(cls, lines: Iterable[str]) -> Dict[str, Any]:
+        """
+        フロントマターの行を辞書に変換します（「key: value」形式の簡易的な YAML）。
+        値の前後の引用符は取り除き、「[a, b]」形式と「- item」形式の値はリストにする。
+        :param lines: フロントマターの行（「---」を除く）
+        :return: キーと値の辞書
+        """
+        result: Dict[str, Any] = {}
+        key = None
+        for line in lines:
+            stripped = line.strip()
+            if not stripped or stripped.startswith("#"):
+                continue
+            if line[0] in (" ", "\t") or stripped.startswith("- "):
+                if key is not None and stripped.startswith("- "):
+                    if not isinstance(result[key], list):
+                        result[key] = [result[key]] if result[key] else []
+                    result[key].append(cls._parse_scalar(stripped[2:]))
+                continue
+            name, separator, value = stripped.partition(":")
+            if not separator:
+                continue
+            key = name.strip()
+            result[key] = cls._parse_value(value)
+        return result
+
+    def read(self, file_path: str, encoding: str = "utf-8") -> Optional[Dict[str, Any]]:
+        """
+        ファイルのフロントマターを読み込み、辞書として返します。
+        :param file_path: 読み込むファイルのパス
+        :param encoding: ファイルのエンコーディング（デフォルトはUTF-8）
+        :return: フロントマターの辞書（フロントマターがない場合は空の辞書）。エラーの場合はNone
+        """
+        try:
+            with open(file_path, "r", encoding=encoding) as file:
+                return self.parse(self._iter_front_matter_lines(file))
+        except (OSError, UnicodeDecodeError) as e:
+            logger.error(f"Failed to read front matter of '{file_path}': {e}")
+            return None
+
+    def read_lines(
+        self, file_path: str, encoding: str = "utf-8"
+    ) -> Optional[List[str]]:
+        """
+        ファイルのフロントマターの行（「---」を除く）を読み込みます。
+        :param file_path: 読み込むファイルのパス
+        :param encoding: ファイルのエンコーディング（デフォルトはUTF-8）
+        :return: フロントマターの行のリスト（フロントマターがない場合は空のリスト）。エラーの場合はNone
+        """
+        try:
+            with open(file_path, "r", encoding=encoding) as file:
+                return list(self._iter_front_matter_lines(file))
+        except (OSError, UnicodeDecodeError) as e:
+            logger.error(f"Failed to read front matter of '{file_path}': {e}")
+            return None
+
+    def find_line_starting_with(
+        self, file_path: str, start_string: str, encoding: str = "utf-8"
+    ) -> Optional[str]:
+        """
+        指定された文字列で始まる行を探し、その内容を返します（TextFinder.find_line_starting_with と同じ形式）。
+        フロントマターがあるファイルでは、閉じる「---」までに見つからなければ読み込みを終了する。
+        :param file_path: 読み込むファイルのパス
+        :param start_string: 検索する行の開始文字列
+        :param encoding: ファイルのエンコーディング（デフォルトはUTF-8）
+        :return: 見つかった行の内容（開始文字列を除く）。見つからない場合やエラーの場合はNone
+        """
+        try:
+            with open(file_path, "r", encoding=encoding) as file:
+                in_front_matter = False
+                for number, line in enumerate(file):
+                    if line.startswith(start_string):
+                        return line.split(start_string)[1].strip()
+                    if line.strip() == self.MARKER:
+                        if number == 0:
+                            in_front_matter = True
+                        elif in_front_matter:
+                            break
+        except (OSError, UnicodeDecodeError) as e:
+            logger.error(f"Failed to read '{file_path}': {e}")
+            return None
+        logger.debug(f"'{start_string}' で始まる行が見つかりませんでした: {file_path}")
+        return None
+
+    def _map(
+        self, function: Callable[[str], Any], file_paths: List[str]
+    ) -> Dict[str, Any]:
+        if len(file_paths) <= 1 or self.max_workers <= 1:
+            return {file_path: function(file_path) for file_path in file_paths}
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            return dict(zip(file_paths, executor.map(function, file_paths)))
+
+    def read_many(
+        self, file_paths: List[str], encoding: str = "utf-8"
+    ) -> Dict[str, Optional[Dict[str, Any]]]:
+        """
+        複数のファイルのフロントマターをスレッドプールで並行して読み込みます。
+        :param file_paths: 読み込むファイルのパスのリスト
+        :param encoding: ファイルのエンコーディング（デフォルトはUTF-8）
+        :return: ファイルのパスとフロントマターの辞書（エラーの場合はNone）の辞書
+        """
+        return self._map(lambda file_path: self.read(file_path, encoding), file_paths)
+
+    def read_lines_many(
+        self, file_paths: List[str], encoding: str = "utf-8"
+    ) -> Dict[str, Optional[List[str]]]:
+        """
+        複数のファイルのフロントマターの行をスレッドプールで並行して読み込みます。
+        :param file_paths: 読み込むファイルのパスのリスト
+        :param encoding: ファイルのエンコーディング（デフォルトはUTF-8）
+        :return: ファイルのパスとフロントマターの行のリスト（エラーの場合はNone）の辞書
+        """
+        return self._map(
+            lambda file_path: self.read_lines(file_path, encoding), file_paths
+        )
+
+    def find_lines_starting_with(
+        self, file_paths: List[str], start_string: str, encoding: str = "utf-8"
+    ) -> Dict[str, Optional[str]]:
+        """
+        複数のファイルから、指定された文字列で始まる行をスレッドプールで並行して探します。
+        :param file_paths: 読み込むファイルのパスのリスト
+        :param start_string: 検索する行の開始文字列
+        :param encoding: ファイルのエンコーディング（デフォルトはUTF-8）
+        :return: ファイルのパスと見つかった行の内容（見つからない場合はNone）の辞書
+        """
+        return self._map(
+            lambda file_path: self.find_line_starting_with(
+                file_path, start_string, encoding
+            ),
+            file_paths,
+        )
+
+
 class FileValidator:
     """
     FileValidator クラスは、ファイルの処理可否を判断するメソッドや、
@@ -332,14 +524,198 @@ class FolderFilter:
     def get_matching_subfolders(self) -> List[str]:
         """
         プレフィックスに一致するサブフォルダを再帰的に取得します。
+        プレフィックスに一致しないサブフォルダの中は走査しない。
         :return: プレフィックスに一致するサブフォルダのリスト
         """
-        matching_folders = []
-        for root, dirs, _ in os.walk(self.root_folder):
-            for dir in dirs:
-                if dir.startswith(self.folder_prefix):
-                    matching_folders.append(os.path.join(root, dir))
-        return matching_folders
+        return FolderWalker.list_folders(self.root_folder, self.folder_prefix)
+
+
+class FileManifest:
+    """
+    前回の処理で確認したファイルの状態（サイズ・更新時刻・内容のハッシュ・ルールのフィンガープリント）を
+    対象フォルダ内の JSON ファイルに記録するクラス。
+    FileProcessor は、状態とフィンガープリントが前回と同じファイルを読み込まずに読み飛ばす。
+    更新時刻のみが変わったファイルは、内容のハッシュが同じであれば処理を行わない。
+    """
+
+    FILE_NAME = ".file_manifest.json"
+    VERSION = 1
+
+    def __init__(self, root_path: str, file_name: str = FILE_NAME):
+        """
+        :param root_path: 対象フォルダのパス（マニフェストはこのフォルダに保存される）
+        :param file_name: マニフェストのファイル名
+        """
+        self.root_path = os.path.abspath(root_path)
+        self.manifest_path = os.path.join(self.root_path, file_name)
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        self._dirty = False
+
+    @staticmethod
+    def hash_content(content: str) -> str:
+        """
+        ファイルの内容のハッシュを返します。
+        """
+        return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+    @classmethod
+    def _describe(cls, value: Any) -> Any:
+        """
+        フィンガープリントの計算のため、値を JSON に変換できる形式にします。
+        関数はモジュール名・修飾名・バイトコードと定数で表す（関数から呼び出す別の関数の変更は含まれない）。
+        """
+        if isinstance(value, (str, int, float, bool)) or value is None:
+            return value
+        if isinstance(value, (list, tuple)):
+            return [cls._describe(item) for item in value]
+        if isinstance(value, (set, frozenset)):
+            return sorted(json.dumps(cls._describe(item)) for item in value)
+        if isinstance(value, dict):
+            return sorted(
+                [str(key), cls._describe(item)] for key, item in value.items()
+            )
+        if isinstance(value, re.Pattern):
+            return ["pattern", value.pattern, value.flags]
+        if isinstance(value, functools.partial):
+            return [
+                "partial",
+                cls._describe(value.func),
+                cls._describe(value.args),
+                cls._describe(value.keywords),
+            ]
+        if isinstance(value, types.MethodType):
+            return [
+                "method",
+                type(value.__self__).__qualname__,
+                cls._describe(value.__func__),
+            ]
+        if isinstance(value, types.CodeType):
+            return [
+                "code",
+                value.co_code.hex(),
+                cls._describe(value.co_consts),
+                list(value.co_names),
+            ]
+        if isinstance(value, types.FunctionType):
+            return [
+                "function",
+                value.__module__,
+                value.__qualname__,
+                cls._describe(value.__code__),
+            ]
+        if callable(value):
+            return ["callable", getattr(value, "__module__", None), repr(value)]
+        return repr(value)
+
+    @classmethod
+    def fingerprint(cls, value: Any) -> str:
+        """
+        処理の内容（関数や TextReplacePipeline.get_signature() の値など）からフィンガープリントを作成します。
+        :param value: 処理の内容を表す値
+        :return: フィンガープリント
+        """
+        described = json.dumps(cls._describe(value), ensure_ascii=False)
+        return hashlib.sha256(described.encode("utf-8")).hexdigest()
+
+    def _key(self, file_path: str) -> str:
+        return os.path.relpath(os.path.abspath(file_path), self.root_path).replace(
+            os.sep, "/"
+        )
+
+    def load(self) -> bool:
+        """
+        マニフェストを読み込みます。ファイルがない場合や形式が異なる場合は空のマニフェストとする。
+        :return: 読み込めたら True、そうでなければ False
+        """
+        self.entries = {}
+        self._dirty = False
+        try:
+            with open(self.manifest_path, "r", encoding="utf-8") as file:
+                data = json.load(file)
+        except FileNotFoundError:
+            return False
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignored unreadable manifest '{self.manifest_path}': {e}")
+            return False
+        if not isinstance(data, dict) or data.get("version") != self.VERSION:
+            logger.debug(f"Ignored manifest with another version: {self.manifest_path}")
+            return False
+        self.entries = data.get("files", {})
+        logger.debug(f"Loaded manifest with {len(self.entries)} files")
+        return True
+
+    def save(self) -> bool:
+        """
+        変更があった場合に、マニフェストを一時ファイルに書き込んでから置き換えます。
+        :return: 成功した（または変更がなかった）場合は True、失敗した場合は False
+        """
+        if not self._dirty:
+            return True
+        temp_path = f"{self.manifest_path}.{os.getpid()}.tmp"
+        try:
+            with open(temp_path, "w", encoding="utf-8") as file:
+                json.dump(
+                    {"version": self.VERSION, "files": self.entries},
+                    file,
+                    ensure_ascii=False,
+                    separators=(",", ":"),
+                )
+            os.replace(temp_path, self.manifest_path)
+        except OSError as e:
+            logger.error(f"Failed to save manifest '{self.manifest_path}': {e}")
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            return False
+        self._dirty = False
+        return True
+
+    def is_unchanged(
+        self, file_path: str, stat: os.stat_result, fingerprint: str
+    ) -> bool:
+        """
+        ファイルのサイズ・更新時刻とフィンガープリントが前回の記録と同じかを確認します。
+        """
+        entry = self.entries.get(self._key(file_path))
+        return (
+            entry is not None
+            and entry["fingerprint"] == fingerprint
+            and entry["size"] == stat.st_size
+            and entry["mtime_ns"] == stat.st_mtime_ns
+        )
+
+    def get_hash(self, file_path: str, fingerprint: str) -> Optional[str]:
+        """
+        同じフィンガープリントで記録された、ファイルの内容のハッシュを返します。
+        """
+        entry = self.entries.get(self._key(file_path))
+        if entry is None or entry["fingerprint"] != fingerprint:
+            return None
+        return entry["hash"]
+
+    def update(
+        self,
+        file_path: str,
+        stat: os.stat_result,
+        content_hash: str,
+        fingerprint: str,
+    ):
+        """
+        処理を終えたファイルの状態を記録します。
+        """
+        self.entries[self._key(file_path)] = {
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "hash": content_hash,
+            "fingerprint": fingerprint,
+        }
+        self._dirty = True
+
+    def remove(self, file_path: str):
+        """
+        ファイルの記録を削除します。
+        """
+        if self.entries.pop(self._key(file_path), None) is not None:
+            self._dirty = True
 
 
 class FileProcessor:
@@ -352,6 +728,59 @@ class FileProcessor:
         self.file_handler = file_handler
         self.file_validator = file_validator
 
+    FILE_UPDATED = "updated"
+    FILE_UNCHANGED = "unchanged"
+    FILE_SKIPPED = "skipped"
+    FILE_ERROR = "error"
+    EXECUTOR_THREAD = "thread"
+    EXECUTOR_PROCESS = "process"
+    # 並列処理の際に、ワーカー数に対して同時に投入しておくファイル数の倍率
+    IN_FLIGHT_PER_WORKER = 4
+
+    @classmethod
+    def _process_file_status(
+        cls,
+        file_handler: FileHandler,
+        file_validator: FileValidator,
+        file_path: str,
+        process_function: Callable[[str], str],
+        with_hash: bool = False,
+        known_hash: Optional[str] = None,
+    ) -> Tuple[str, Optional[str], Optional[str]]:
+        """
+        ファイルを読み込み、指定された関数で処理し、変更があれば書き込みます。
+        プロセスプールのワーカーでも実行できるよう、ログは出力せず結果とエラー内容を返す。
+        :param with_hash: True の場合、処理後の内容のハッシュを返す
+        :param known_hash: 前回の処理後の内容のハッシュ。読み込んだ内容と一致する場合は処理を行わない
+        :return: 処理結果（FILE_UPDATED など）・エラーの内容・処理後の内容のハッシュのタプル
+        """
+        try:
+            file_name = os.path.basename(file_path)
+            if not file_validator.is_processable_file(file_name, file_path):
+                return cls.FILE_SKIPPED, None, None
+            content = file_handler.read_file(file_path)
+            if with_hash or known_hash:
+                content_hash = FileManifest.hash_content(content)
+                if content_hash == known_hash:
+                    return cls.FILE_UNCHANGED, None, content_hash
+            processed_content = process_function(content)
+            if processed_content != content:
+                file_handler.write_file(file_path, processed_content)
+                if with_hash:
+                    content_hash = FileManifest.hash_content(processed_content)
+                return cls.FILE_UPDATED, None, content_hash if with_hash else None
+            return cls.FILE_UNCHANGED, None, content_hash if with_hash else None
+        except Exception as e:
+            return cls.FILE_ERROR, str(e), None
+
+    def _log_file_status(self, file_path: str, status: str, error: Optional[str]):
+        if status == self.FILE_ERROR:
+            logger.error(f"Error occurred while processing file {file_path}: {error}")
+        elif status == self.FILE_UPDATED:
+            logger.debug(f"File updated: {file_path}")
+        elif status == self.FILE_SKIPPED:
+            logger.debug(f"Skipped non-processable file: {file_path}")
+
     def process_file(
         self, file_path: str, process_function: Callable[[str], str]
     ) -> bool:
@@ -361,22 +790,169 @@ class FileProcessor:
         :param process_function: ファイル内容を処理する関数
         :return: ファイルが更新された場合は True、そうでなければ False を返す
         """
-        try:
-            # Check if the file is processable
-            file_name = os.path.basename(file_path)
-            if not self.file_validator.is_processable_file(file_name, file_path):
-                logger.debug(f"Skipped non-processable file: {file_path}")
-                return False
-            content = self.file_handler.read_file(file_path)
-            processed_content = process_function(content)
-            if processed_content != content:
-                self.file_handler.write_file(file_path, processed_content)
-                logger.debug(f"File updated: {file_path}")
-                return True
-            return False
-        except Exception as e:
-            logger.error(f"Error occurred while processing file {file_path}: {e}")
-            return False
+        status, error, _ = self._process_file_status(
+            self.file_handler, self.file_validator, file_path, process_function
+        )
+        self._log_file_status(file_path, status, error)
+        return status == self.FILE_UPDATED
+
+    def _iter_folder_files(
+        self, root: str, files: List[str], required_files: List[str]
+    ) -> Iterator[str]:
+        """
+        必要なファイルがすべて存在するフォルダについて、処理可能なファイルのパスを返します。
+        """
+        if not self.file_validator.has_required_files(root, required_files):
+            logger.debug(
+                f"Skipped folder (missing required files): {os.path.basename(root)}"
+            )
+            return
+        for file in files:
+            file_path = os.path.join(root, file)
+            if self.file_validator.is_processable_file(file, file_path):
+                yield file_path
+            else:
+                logger.debug(f"Skipped file (not processable): {file}")
+
+    def _iter_matching_files(
+        self, folder_path: str, folder_prefix: str, required_files: List[str]
+    ) -> Iterator[str]:
+        """
+        フォルダ名が指定されたプレフィックスで始まるフォルダ内の、処理可能なファイルのパスを返します。
+        プレフィックスに一致しないサブフォルダの中は走査しない。
+        """
+        for root, dirs, files in FolderWalker.walk(folder_path, folder_prefix):
+            yield from self._iter_folder_files(root, files, required_files)
+
+    def _iter_file_statuses(
+        self,
+        tasks: Iterable[Tuple[str, Optional[str]]],
+        process_function: Callable[[str], str],
+        workers: int,
+        executor: str,
+        with_hash: bool,
+    ) -> Iterator[Tuple[str, str, Optional[str], Optional[str]]]:
+        """
+        (ファイルのパス, 前回の内容のハッシュ) ごとにファイルを処理し、
+        (ファイルのパス, 処理結果, エラーの内容, 処理後の内容のハッシュ) を処理が終わった順に返します。
+        workers が2以上の場合はスレッドプールまたはプロセスプールで並行して処理する。
+        未完了のファイル数は workers * IN_FLIGHT_PER_WORKER までに制限し、
+        フォルダの走査が処理より先に進みすぎないようにする。
+        """
+        if workers <= 1:
+            for file_path, known_hash in tasks:
+                yield (
+                    file_path,
+                    *self._process_file_status(
+                        self.file_handler,
+                        self.file_validator,
+                        file_path,
+                        process_function,
+                        with_hash,
+                        known_hash,
+                    ),
+                )
+            return
+
+        if executor == self.EXECUTOR_PROCESS:
+            # pickle できない関数はファイルごとに失敗するため、プールを作成する前に1回だけ確認する
+            try:
+                pickle.dumps(process_function)
+            except Exception as e:
+                raise ValueError(
+                    f"process_function cannot be used with executor='process': {e}"
+                ) from e
+            executor_class = ProcessPoolExecutor
+        elif executor == self.EXECUTOR_THREAD:
+            executor_class = ThreadPoolExecutor
+        else:
+            raise ValueError(f"Unknown executor: {executor}")
+
+        def result_of(future: Future) -> Tuple[str, Optional[str], Optional[str]]:
+            try:
+                return future.result()
+            except Exception as e:
+                # ワーカープロセスが終了した場合など
+                return self.FILE_ERROR, str(e), None
+
+        max_in_flight = workers * self.IN_FLIGHT_PER_WORKER
+        with executor_class(max_workers=workers) as pool:
+            pending: Dict[Future, str] = {}
+            for file_path, known_hash in tasks:
+                if len(pending) >= max_in_flight:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        yield (pending.pop(future), *result_of(future))
+                future = pool.submit(
+                    self._process_file_status,
+                    self.file_handler,
+                    self.file_validator,
+                    file_path,
+                    process_function,
+                    with_hash,
+                    known_hash,
+                )
+                pending[future] = file_path
+            for future in as_completed(pending):
+                yield (pending[future], *result_of(future))
+
+    def _process_files(
+        self,
+        file_paths: Iterable[str],
+        process_function: Callable[[str], str],
+        workers: int = 1,
+        executor: str = EXECUTOR_THREAD,
+        manifest: Optional[FileManifest] = None,
+        fingerprint: Optional[str] = None,
+    ) -> Dict[str, int]:
+        processed_files = 0
+        updated_files = 0
+        error_files = 0
+        skipped_files = 0
+
+        def tasks() -> Iterator[Tuple[str, Optional[str]]]:
+            nonlocal skipped_files
+            for file_path in file_paths:
+                if manifest is None:
+                    yield file_path, None
+                    continue
+                try:
+                    stat = os.stat(file_path)
+                except OSError:
+                    stat = None
+                if stat is not None and manifest.is_unchanged(
+                    file_path, stat, fingerprint
+                ):
+                    skipped_files += 1
+                    continue
+                yield file_path, manifest.get_hash(file_path, fingerprint)
+
+        for file_path, status, error, content_hash in self._iter_file_statuses(
+            tasks(), process_function, workers, executor, manifest is not None
+        ):
+            self._log_file_status(file_path, status, error)
+            processed_files += 1
+            if status == self.FILE_UPDATED:
+                updated_files += 1
+            elif status == self.FILE_ERROR:
+                error_files += 1
+            if manifest is None:
+                continue
+            if status == self.FILE_ERROR:
+                manifest.remove(file_path)
+            elif content_hash is not None:
+                try:
+                    manifest.update(
+                        file_path, os.stat(file_path), content_hash, fingerprint
+                    )
+                except OSError:
+                    manifest.remove(file_path)
+        return {
+            "processed_files": processed_files,
+            "updated_files": updated_files,
+            "error_files": error_files,
+            "skipped_files": skipped_files,
+        }
 
     def process_files_in_folder(
         self,
@@ -394,32 +970,9 @@ class FileProcessor:
         :param process_function: ファイルを処理するための関数
         :return: 処理結果を示すディクショナリ
         """
-        processed_files = 0
-        updated_files = 0
-        error_files = 0
-
-        if self.file_validator.has_required_files(root, required_files):
-            for file in files:
-                if self.file_validator.is_processable_file(
-                    file, os.path.join(root, file)
-                ):
-                    file_path = os.path.join(root, file)
-                    success = self.process_file(file_path, process_function)
-                    if success:
-                        updated_files += 1
-                    processed_files += 1
-                else:
-                    logger.debug(f"Skipped file (not processable): {file}")
-        else:
-            logger.debug(
-                f"Skipped folder (missing required files): {os.path.basename(root)}"
-            )
-
-        return {
-            "processed_files": processed_files,
-            "updated_files": updated_files,
-            "error_files": error_files,
-        }
+        return self._process_files(
+            self._iter_folder_files(root, files, required_files), process_function
+        )
 
     def process_all_matching_files(
         self,
@@ -427,46 +980,115 @@ class FileProcessor:
         folder_prefix: str,
         process_function: Callable[[str], str],
         required_files: List[str],
+        workers: int = 1,
+        executor: str = EXECUTOR_THREAD,
+        use_manifest: bool = False,
+        fingerprint: Optional[str] = None,
     ) -> Dict[str, int]:
         """
         指定されたフォルダパスの中で、フォルダ名が指定されたプレフィックスで始まる
         すべてのフォルダ内のファイルを処理します。
+        use_manifest が True の場合、フォルダパスに保存した FileManifest を使用し、
+        前回の処理からサイズ・更新時刻・処理の内容（フィンガープリント）が変わっていないファイルを読み飛ばす。
+        workers が2以上の場合、ファイルごとの処理（読み込み・変換・変更時の書き込み）を並行して行う。
+        正規表現や変換など CPU の負荷が高い処理には executor="process" を指定する。
+        その場合 process_function は pickle 可能である必要があり（できない場合は ValueError）、
+        関数内で保持する状態（TextReplacePipeline のヒット数など）は呼び出し元に反映されない。
         :param folder_path: 親フォルダのパス
         :param folder_prefix: 処理対象フォルダのプレフィックス
         :param process_function: ファイルを処理するための関数
         :param required_files: 必要なファイルリスト
-        :return: 処理結果を示すディクショナリ
+        :param workers: 並行して処理するワーカー数（1の場合は逐次処理）
+        :param executor: "thread"（スレッドプール）または "process"（プロセスプール）
+        :param use_manifest: True の場合、前回から変更のないファイルを読み飛ばす
+        :param fingerprint: 処理の内容を表すフィンガープリント（省略時は process_function から作成）。
+            process_function が参照する外部のデータや関数が変わる場合は明示的に指定する
+        :return: 処理結果を示すディクショナリ（読み飛ばしたファイル数 skipped_files を含む）
+        :raises ValueError: executor が不正な場合や、executor="process" で process_function を pickle できない場合
         """
         logger.debug(f"Starting search in folder: {folder_path}")
         logger.debug(f"Folder prefix: {folder_prefix}")
         logger.debug(f"Required files: {', '.join(required_files)}")
 
-        total_processed_files = 0
-        total_updated_files = 0
-        total_error_files = 0
+        manifest = None
+        if use_manifest:
+            manifest = FileManifest(folder_path)
+            manifest.load()
+            fingerprint = fingerprint or FileManifest.fingerprint(process_function)
 
-        for root, dirs, files in os.walk(folder_path, topdown=False):
-            folder_name = os.path.basename(root)
-            if folder_name.startswith(folder_prefix):
-                results = self.process_files_in_folder(
-                    root, files, required_files, process_function
-                )
-                total_processed_files += results["processed_files"]
-                total_updated_files += results["updated_files"]
-                total_error_files += results["error_files"]
-            else:
-                logger.debug(f"Skipped folder (prefix doesn't match): {folder_name}")
+        try:
+            results = self._process_files(
+                self._iter_matching_files(folder_path, folder_prefix, required_files),
+                process_function,
+                workers,
+                executor,
+                manifest,
+                fingerprint,
+            )
+        finally:
+            if manifest is not None:
+                manifest.save()
 
-        if total_processed_files == 0:
+        if results["skipped_files"]:
+            logger.info(
+                f"Skipped {results['skipped_files']} files unchanged since the last run"
+            )
+
+        if results["processed_files"] == 0:
             logger.debug(
                 f"Warning: No processable files found in folders starting with '{folder_prefix}'."
             )
+        if results["error_files"]:
+            logger.warning(
+                f"{results['error_files']} of {results['processed_files']} files failed to process"
+            )
 
-        return {
-            "processed_files": total_processed_files,
-            "updated_files": total_updated_files,
-            "error_files": total_error_files,
-        }
+        return results
+
+    def apply_pipeline(
+        self,
+        folder_path: str,
+        folder_prefix: str,
+        pipeline: TextReplacePipeline,
+        required_files: List[str],
+        use_manifest: bool = False,
+        workers: int = 1,
+        executor: str = EXECUTOR_THREAD,
+    ) -> Dict[str, Any]:
+        """
+        TextReplacePipeline の全てのルールを、フォルダの走査1回で対象の全ファイルに適用します。
+        各ファイルは1回だけ読み込まれ、全てのルールをメモリ上で適用した後、変更があった場合のみ1回書き込まれます。
+        executor="process" の場合、ルールの適用はワーカープロセス内で行われるため、ルールごとのヒット数は集計されない。
+        :param folder_path: 親フォルダのパス
+        :param folder_prefix: 処理対象フォルダのプレフィックス
+        :param pipeline: 適用する TextReplacePipeline
+        :param required_files: 必要なファイルリスト
+        :param use_manifest: True の場合、前回から変更がなくルールも同じファイルを読み飛ばす
+        :param workers: 並行して処理するワーカー数（1の場合は逐次処理）
+        :param executor: "thread"（スレッドプール）または "process"（プロセスプール）
+        :return: process_all_matching_files の結果に、ルールごとのヒット数（rule_hits）を加えたディクショナリ。
+            ヒット数を集計しない場合、rule_hits は None
+        """
+        count_hits = workers <= 1 or executor != self.EXECUTOR_PROCESS
+        pipeline.reset_hit_counts()
+        results = self.process_all_matching_files(
+            folder_path,
+            folder_prefix,
+            pipeline.apply,
+            required_files,
+            workers=workers,
+            executor=executor,
+            use_manifest=use_manifest,
+            fingerprint=FileManifest.fingerprint(pipeline.get_signature()),
+        )
+        results["rule_hits"] = pipeline.get_hit_counts() if count_hits else None
+        logger.info(
+            f"Applied {len(pipeline.rules)} rules: {results['updated_files']} of "
+            f"{results['processed_files']} files updated"
+        )
+        for name, count in (results["rule_hits"] or {}).items():
+            logger.info(f"  {name}: {count} hits")
+        return results
 
 
 class FilePathHandler:
@@ -0,0 +1,465 @@
+import json
+import os
+import sqlite3
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from src.log_operations.log_handlers import CustomLogger
+from src.file_operations.file_processor import FrontMatterReader
+
+
+class FolderIndex:
+    """
+    記事フォルダの構成（フォルダ・ファイル名・サイズ・更新時刻・フロントマター）を
+    SQLite ファイルに保存し、フォルダを走査せずに検索できるようにするクラス。
+    refresh() では各フォルダの更新時刻を前回と比較し、変化したフォルダのみを読み直す。
+    更新時刻が変わっていないフォルダは、記録済みのファイルの stat のみで変更を確認する。
+    フロントマターは Markdown / MDX ファイルが変更された場合にのみ読み直す。
+    フォルダのパスはルートフォルダからの相対パス（区切り文字は「/」）で扱う。
+    フォルダとファイルは os.path.normcase で正規化したキーで検索するため、
+    os.path.exists と同じく Windows では大文字と小文字を区別しない。元の名前は表示用に保持する。
+    """
+
+    FRONT_MATTER_EXTENSIONS = (".md", ".mdx")
+    SCHEMA_VERSION = "2"
+
+    def __init__(self, front_matter_reader: Optional[FrontMatterReader] = None):
+        """
+        :param front_matter_reader: フロントマターの読み込みに使用する FrontMatterReader
+        """
+        self.logger = CustomLogger(__name__)
+        self.front_matter_reader = front_matter_reader or FrontMatterReader()
+        self.root_path: Optional[str] = None
+        self.db_path: Optional[str] = None
+        self.thumbnail_file_name: Optional[str] = None
+        self.connection: Optional[sqlite3.Connection] = None
+
+    @staticmethod
+    def get_default_db_path(root_path: str) -> str:
+        """
+        ルートフォルダと同じ階層にある「.<フォルダ名>.folder_index.sqlite」のパスを返します。
+        ルートフォルダの中に置くと、索引の更新でルートフォルダの更新時刻が変わるため外に置く。
+        :param root_path: ルートフォルダのパス
+        :return: SQLite ファイルのパス
+        """
+        directory, folder_name = os.path.split(os.path.abspath(root_path))
+        return os.path.join(directory, f".{folder_name}.folder_index.sqlite")
+
+    @staticmethod
+    def normalize_folder(folder: Any) -> str:
+        """
+        Excel などから取得したフォルダ名を索引の相対パスの形式（区切り文字は「/」）に変換します。
+        :param folder: フォルダ名または相対パス
+        :return: 相対パス
+        """
+        return "/".join(
+            part for part in str(folder).replace("\\", "/").split("/") if part
+        )
+
+    @classmethod
+    def _key(cls, folder: Any) -> str:
+        # ファイルシステムと同じく大文字と小文字を区別するかを合わせた検索用のキー
+        return os.path.normcase(cls.normalize_folder(folder))
+
+    @staticmethod
+    def _join(parent: str, name: str) -> str:
+        return f"{parent}/{name}" if parent else name
+
+    def set_info(
+        self,
+        root_path: str,
+        thumbnail_file_name: Optional[str] = None,
+        db_path: Optional[str] = None,
+        refresh: bool = True,
+    ) -> bool:
+        """
+        索引の対象となるルートフォルダを設定し、SQLite ファイルを開きます。
+        :param root_path: ルートフォルダのパス
+        :param thumbnail_file_name: サムネイル画像のファイル名（has_thumbnail で使用）
+        :param db_path: SQLite ファイルのパス（省略時は get_default_db_path() のパス）
+        :param refresh: True の場合、開いた後に refresh() を実行する
+        :return: 成功したらTrue、失敗したらFalse
+        """
+        if not os.path.isdir(root_path):
+            self.logger.error(f"Folder not found: {root_path}")
+            return False
+        self.close()
+        self.root_path = os.path.abspath(root_path)
+        self.thumbnail_file_name = thumbnail_file_name
+        self.db_path = db_path or self.get_default_db_path(self.root_path)
+        try:
+            self.connection = sqlite3.connect(self.db_path, check_same_thread=False)
+            self._create_tables()
+        except sqlite3.Error as e:
+            self.logger.error(f"Failed to open folder index '{self.db_path}': {e}")
+            self.close()
+            return False
+        self.logger.debug(f"Opened folder index: {self.db_path}")
+        if refresh:
+            self.refresh()
+        return True
+
+    def close(self):
+        """
+        SQLite ファイルを閉じます。
+        """
+        if self.connection is not None:
+            self.connection.close()
+            self.connection = None
+
+    def _create_tables(self):
+        cursor = self.connection.cursor()
+        cursor.execute(
+            "CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value TEXT)"
+        )
+        stored = dict(cursor.execute("SELECT name, value FROM meta").fetchall())
+        if stored.get("root_path") != self.root_path or (
+            stored.get("schema_version") != self.SCHEMA_VERSION
+        ):
+            # ルートフォルダや形式が異なる索引は使用せず作り直す
+            cursor.execute("DROP TABLE IF EXISTS folders")
+            cursor.execute("DROP TABLE IF EXISTS files")
+        cursor.execute(
+            "CREATE TABLE IF NOT EXISTS folders (key TEXT PRIMARY KEY, path TEXT, "
+            "parent_key TEXT, name TEXT, mtime_ns INTEGER)"
+        )
+        cursor.execute(
+            "CREATE TABLE IF NOT EXISTS files (folder_key TEXT, name_key TEXT, "
+            "name TEXT, size INTEGER, mtime_ns INTEGER, front_matter TEXT, "
+            "PRIMARY KEY (folder_key, name_key))"
+        )
+        cursor.execute(
+            "CREATE INDEX IF NOT EXISTS idx_folders_parent ON folders (parent_key)"
+        )
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_folders_name ON folders (name)")
+        cursor.executemany(
+            "INSERT OR REPLACE INTO meta (name, value) VALUES (?, ?)",
+            [
+                ("root_path", self.root_path),
+                ("schema_version", self.SCHEMA_VERSION),
+            ],
+        )
+        self.connection.commit()
+
+    def get_path(self, folder: str) -> str:
+        """
+        相対パスのフォルダの絶対パスを返します。
+        :param folder: ルートフォルダからの相対パス
+        :return: フォルダの絶対パス
+        """
+        if not folder:
+            return self.root_path
+        return os.path.join(self.root_path, *folder.split("/"))
+
+    def _is_front_matter_file(self, name: str) -> bool:
+        return name.lower().endswith(self.FRONT_MATTER_EXTENSIONS)
+
+    def refresh(self) -> Dict[str, int]:
+        """
+        前回からの変更を索引に反映します。
+        更新時刻が変わったフォルダのみ中身を読み直し、消えたフォルダは索引から削除する。
+        :return: 読み直したフォルダ数・変更のなかったフォルダ数・更新したファイル数・削除したフォルダ数
+        """
+        stats = {"scanned": 0, "unchanged": 0, "updated_files": 0, "removed": 0}
+        with self.logger.span("folder_index.refresh", root=self.root_path) as span:
+            cursor = self.connection.cursor()
+            stored = {
+                key: (mtime_ns, path)
+                for key, mtime_ns, path in cursor.execute(
+                    "SELECT key, mtime_ns, path FROM folders"
+                ).fetchall()
+            }
+            seen = set()
+            pending_front_matter: List[Tuple[str, str]] = []
+            stack = [""]
+            while stack:
+                folder = stack.pop()
+                try:
+                    mtime_ns = os.stat(self.get_path(folder)).st_mtime_ns
+                except OSError:
+                    continue
+                key = self._key(folder)
+                seen.add(key)
+                if key in stored and stored[key][0] == mtime_ns:
+                    stats["unchanged"] += 1
+                    if stored[key][1] != folder:
+                        # 大文字と小文字だけが変わったフォルダ名を更新する
+                        cursor.execute(
+                            "UPDATE folders SET path = ?, name = ? WHERE key = ?",
+                            (folder, folder.rpartition("/")[2], key),
+                        )
+                    stack.extend(
+                        row[0]
+                        for row in cursor.execute(
+                            "SELECT path FROM folders WHERE parent_key = ? AND key != ''",
+                            (key,),
+                        )
+                    )
+                    changed = self._check_known_files(folder)
+                else:
+                    stats["scanned"] += 1
+                    subfolders, changed = self._scan_folder(folder, mtime_ns)
+                    stack.extend(subfolders)
+                stats["updated_files"] += len(changed)
+                pending_front_matter.extend(
+                    (folder, name)
+                    for name in changed
+                    if self._is_front_matter_file(name)
+                )
+
+            self._read_front_matter(pending_front_matter)
+            removed = [key for key in stored if key not in seen]
+            cursor.executemany(
+                "DELETE FROM folders WHERE key = ?", ((key,) for key in removed)
+            )
+            cursor.executemany(
+                "DELETE FROM files WHERE folder_key = ?", ((key,) for key in removed)
+            )
+            stats["removed"] = len(removed)
+            self.connection.commit()
+            span.update(stats)
+        self.logger.debug(f"Refreshed folder index: {stats}")
+        return stats
+
+    def _scan_folder(self, folder: str, mtime_ns: int) -> Tuple[List[str], List[str]]:
+        """
+        フォルダの中身を読み、ファイルの記録を更新します。
+        :return: サブフォルダの相対パスのリストと、追加または変更されたファイル名のリスト
+        """
+        subfolders = []
+        current: Dict[str, Tuple[int, int]] = {}
+        try:
+            with os.scandir(self.get_path(folder)) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            subfolders.append(self._join(folder, entry.name))
+                        elif entry.is_file():
+                            stat = entry.stat()
+                            current[entry.name] = (stat.st_size, stat.st_mtime_ns)
+                    except OSError:
+                        continue
+        except OSError as e:
+            self.logger.error(f"Failed to scan folder '{folder}': {e}")
+            return [], []
+
+        cursor = self.connection.cursor()
+        folder_key = self._key(folder)
+        known = {
+            name: (size, file_mtime_ns)
+            for name, size, file_mtime_ns in cursor.execute(
+                "SELECT name, size, mtime_ns FROM files WHERE folder_key = ?",
+                (folder_key,),
+            )
+        }
+        changed = [name for name, stat in current.items() if known.get(name) != stat]
+        # 名前の大文字と小文字だけが変わったファイルは、削除した後に追加し直す
+        cursor.executemany(
+            "DELETE FROM files WHERE folder_key = ? AND name_key = ?",
+            ((folder_key, self._key(name)) for name in known if name not in current),
+        )
+        cursor.executemany(
+            "INSERT OR REPLACE INTO files (folder_key, name_key, name, size, mtime_ns) "
+            "VALUES (?, ?, ?, ?, ?)",
+            ((folder_key, self._key(name), name, *current[name]) for name in changed),
+        )
+        parent, _, name = folder.rpartition("/")
+        cursor.execute(
+            "INSERT OR REPLACE INTO folders (key, path, parent_key, name, mtime_ns) "
+            "VALUES (?, ?, ?, ?, ?)",
+            (folder_key, folder, self._key(parent) if folder else None, name, mtime_ns),
+        )
+        return subfolders, changed
+
+    def _check_known_files(self, folder: str) -> List[str]:
+        """
+        更新時刻が変わっていないフォルダについて、記録済みのファイルのサイズと更新時刻を確認します。
+        ファイルの内容の変更ではフォルダの更新時刻が変わらないため、stat で確認する。
+        :return: 変更されたファイル名のリスト
+        """
+        cursor = self.connection.cursor()
+        folder_path = self.get_path(folder)
+        folder_key = self._key(folder)
+        changed = []
+        for name_key, name, size, mtime_ns in cursor.execute(
+            "SELECT name_key, name, size, mtime_ns FROM files WHERE folder_key = ?",
+            (folder_key,),
+        ).fetchall():
+            try:
+                stat = os.stat(os.path.join(folder_path, name))
+            except OSError:
+                cursor.execute(
+                    "DELETE FROM files WHERE folder_key = ? AND name_key = ?",
+                    (folder_key, name_key),
+                )
+                continue
+            if (stat.st_size, stat.st_mtime_ns) != (size, mtime_ns):
+                cursor.execute(
+                    "UPDATE files SET size = ?, mtime_ns = ?, front_matter = NULL "
+                    "WHERE folder_key = ? AND name_key = ?",
+                    (stat.st_size, stat.st_mtime_ns, folder_key, name_key),
+                )
+                changed.append(name)
+        return changed
+
+    def _read_front_matter(self, targets: List[Tuple[str, str]]):
+        """
+        変更されたファイルのフロントマターの行をまとめて読み込み、記録します。
+        """
+        if not targets:
+            return
+        paths = {
+            os.path.join(self.get_path(folder), name): (folder, name)
+            for folder, name in targets
+        }
+        lines = self.front_matter_reader.read_lines_many(list(paths))
+        self.connection.executemany(
+            "UPDATE files SET front_matter = ? WHERE folder_key = ? AND name_key = ?",
+            (
+                (
+                    (
+                        json.dumps(lines[path], ensure_ascii=False)
+                        if lines[path] is not None
+                        else None
+                    ),
+                    self._key(folder),
+                    self._key(name),
+                )
+                for path, (folder, name) in paths.items()
+            ),
+        )
+
+    def folder_exists(self, folder: str) -> bool:
+        """
+        フォルダが索引に存在するかを確認します。
+        :param folder: ルートフォルダからの相対パス
+        :return: 存在すれば True、そうでなければ False
+        """
+        row = self.connection.execute(
+            "SELECT 1 FROM folders WHERE key = ? AND key != ''",
+            (self._key(folder),),
+        ).fetchone()
+        return row is not None
+
+    def list_folders(self, folder_prefix: str = "") -> List[str]:
+        """
+        フォルダ名が指定されたプレフィックスで始まるフォルダを、すべての階層から返します。
+        FolderProcessor と同じく、深い階層のフォルダから順に返す。
+        :param folder_prefix: フォルダ名のプレフィックス
+        :return: ルートフォルダからの相対パスのリスト
+        """
+        rows = self.connection.execute(
+            "SELECT path FROM folders WHERE key != '' AND substr(name, 1, ?) = ? "
+            "ORDER BY path DESC",
+            (len(folder_prefix), folder_prefix),
+        ).fetchall()
+        return [row[0] for row in rows]
+
+    def get_files(self, folder: str) -> Dict[str, Dict[str, int]]:
+        """
+        フォルダ内のファイルのサイズと更新時刻を返します。
+        :param folder: ルートフォルダからの相対パス
+        :return: ファイル名と {"size": サイズ, "mtime_ns": 更新時刻} の辞書
+        """
+        return {
+            name: {"size": size, "mtime_ns": mtime_ns}
+            for name, size, mtime_ns in self.connection.execute(
+                "SELECT name, size, mtime_ns FROM files WHERE folder_key = ? "
+                "ORDER BY name",
+                (self._key(folder),),
+            )
+        }
+
+    def has_files(self, folder: str, file_names: Iterable[str]) -> bool:
+        """
+        フォルダ内に指定されたファイルがすべて存在するかを確認します。
+        :param folder: ルートフォルダからの相対パス
+        :param file_names: ファイル名のリスト
+        :return: すべて存在すれば True、そうでなければ False
+        """
+        file_names = {self._key(name) for name in file_names}
+        if not file_names:
+            return True
+        placeholders = ", ".join("?" * len(file_names))
+        count = self.connection.execute(
+            "SELECT COUNT(*) FROM files "
+            f"WHERE folder_key = ? AND name_key IN ({placeholders})",
+            (self._key(folder), *file_names),
+        ).fetchone()[0]
+        return count == len(file_names)
+
+    def has_thumbnail(self, folder: str) -> bool:
+        """
+        フォルダ内にサムネイル画像が存在するかを確認します。
+        :param folder: ルートフォルダからの相対パス
+        :return: 存在すれば True、そうでなければ False
+        """
+        if not self.thumbnail_file_name:
+            return False
+        return self.has_files(folder, [self.thumbnail_file_name])
+
+    def find_folders_with_files(
+        self, file_names: Iterable[str], folder_prefix: str = ""
+    ) -> List[str]:
+        """
+        指定されたファイルがすべて存在するフォルダを返します。
+        :param file_names: ファイル名のリスト
+        :param folder_prefix: フォルダ名のプレフィックス
+        :return: ルートフォルダからの相対パスのリスト（深い階層のフォルダから順）
+        """
+        file_names = list(file_names)
+        return [
+            folder
+            for folder in self.list_folders(folder_prefix)
+            if self.has_files(folder, file_names)
+        ]
+
+    def get_front_matter_lines(
+        self, folder: str, file_name: str
+    ) -> Optional[List[str]]:
+        """
+        索引に記録されたファイルのフロントマターの行を返します。
+        :param folder: ルートフォルダからの相対パス
+        :param file_name: ファイル名
+        :return: フロントマターの行のリスト。ファイルがない場合や読み込めなかった場合はNone
+        """
+        row = self.connection.execute(
+            "SELECT front_matter FROM files WHERE folder_key = ? AND name_key = ?",
+            (self._key(folder), self._key(file_name)),
+        ).fetchone()
+        if row is None or row[0] is None:
+            return None
+        return json.loads(row[0])
+
+    def get_front_matter(self, folder: str, file_name: str) -> Optional[Dict[str, Any]]:
+        """
+        索引に記録されたファイルのフロントマターを辞書として返します。
+        :param folder: ルートフォルダからの相対パス
+        :param file_name: ファイル名
+        :return: フロントマターの辞書。ファイルがない場合や読み込めなかった場合はNone
+        """
+        lines = self.get_front_matter_lines(folder, file_name)
+        if lines is None:
+            return None
+        return FrontMatterReader.parse(lines)
+
+    def find_front_matter_line(
+        self, folder: str, file_name: str, start_string: str
+    ) -> Optional[str]:
+        """
+        フロントマターから指定された文字列で始まる行を探し、その内容を返します
+        （FrontMatterReader.find_line_starting_with と同じ形式）。
+        索引にはフロントマターの行のみを記録するため、フロントマターがないファイルは
+        FrontMatterReader.find_line_starting_with でファイル全体から探す。
+        :param folder: ルートフォルダからの相対パス
+        :param file_name: ファイル名
+        :param start_string: 検索する行の開始文字列
+        :return: 見つかった行の内容（開始文字列を除く）。見つからない場合はNone
+        """
+        lines = self.get_front_matter_lines(folder, file_name)
+        if lines == []:
+            return self.front_matter_reader.find_line_starting_with(
+                os.path.join(self.get_path(folder), file_name), start_string
+            )
+        for line in lines or []:
+            if line.startswith(start_string):
+                return line.split(start_string)[1].strip()
+        return None
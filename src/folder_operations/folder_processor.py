@@ -1,8 +1,11 @@
 import os
+import json
 import shutil
-from typing import List, Callable
+from collections import deque
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
 
 from src.log_operations.log_handlers import CustomLogger
+from src.folder_operations.folder_walker import FolderWalker
 
 logger = CustomLogger(__name__)
 
@@ -190,16 +193,16 @@ class FolderProcessor:
     def process_all_matching_folders(self, process_function: Callable[[str], bool]):
         """
         指定されたプレフィックスにマッチするすべてのフォルダに対して処理を実行します。
+        フォルダの移動や削除ができるよう、サブフォルダを親フォルダより先に処理する。
+        プレフィックスに一致しないサブフォルダの中は走査しない。
         :param process_function: 各フォルダに対して実行する処理関数
         """
-        for root, _, _ in os.walk(self.folder_path, topdown=False):
-            folder_name = os.path.basename(root)
-            if folder_name.startswith(self.folder_prefix):
-                process_function(root)
-                self.processed_folders += 1
-                logger.debug(f"Processed folder: {root}")
-            else:
-                logger.debug(f"Skipped folder (prefix doesn't match): {folder_name}")
+        for root, _, _ in FolderWalker.walk(
+            self.folder_path, self.folder_prefix, bottom_up=True
+        ):
+            process_function(root)
+            self.processed_folders += 1
+            logger.debug(f"Processed folder: {root}")
 
         if self.processed_folders == 0:
             logger.debug(
@@ -287,7 +290,13 @@ class FolderPathHandler:
 
 
 class FolderRenamer:
-    """フォルダの名前を変更するクラス"""
+    """
+    フォルダの名前を変更するクラス
+    rename_many() は、1つのディレクトリ内の多数のフォルダの名前を、ディレクトリの走査1回でまとめて変更する。
+    """
+
+    JOURNAL_FILE_NAME = ".rename_journal.jsonl"
+    TEMP_PREFIX = ".rename_tmp_"
 
     @staticmethod
     def rename_folder(old_name: str, new_name: str) -> bool:
@@ -328,3 +337,311 @@ class FolderRenamer:
         new_path = os.path.join(directory, new_name)
         return FolderRenamer.rename_folder(old_path, new_path)
 
+    @staticmethod
+    def _key(name: str) -> str:
+        # 大文字と小文字を区別しないファイルシステム（Windows）でも衝突を検出できるよう正規化する
+        return os.path.normcase(name)
+
+    @classmethod
+    def get_journal_path(cls, directory: str) -> str:
+        """
+        ディレクトリの名前の変更のジャーナルのパスを返します。
+        :param directory: フォルダが存在するディレクトリのパス
+        :return: ジャーナルのパス
+        """
+        return os.path.join(directory, cls.JOURNAL_FILE_NAME)
+
+    @classmethod
+    def has_journal(cls, directory: str) -> bool:
+        """
+        中断された名前の変更のジャーナルがあるかを確認します。
+        :param directory: フォルダが存在するディレクトリのパス
+        :return: ジャーナルがあれば True、なければ False
+        """
+        return os.path.exists(cls.get_journal_path(directory))
+
+    @classmethod
+    def _validate(
+        cls, names: Set[str], folders: Set[str], mapping: Dict[str, str]
+    ) -> Tuple[Dict[str, str], Dict[str, str]]:
+        """
+        名前の変更の対応を検証します。
+        :param names: ディレクトリ内のすべての名前（正規化済み）
+        :param folders: ディレクトリ内のフォルダ名（正規化済み）
+        :param mapping: 変更前のフォルダ名と変更後のフォルダ名の辞書
+        :return: 実行する対応と、実行しない変更前のフォルダ名と理由の辞書
+        """
+        skipped: Dict[str, str] = {}
+        renames: Dict[str, str] = {}
+        target_counts: Dict[str, int] = {}
+        for old_name, new_name in mapping.items():
+            if not old_name or not new_name:
+                skipped[old_name] = "empty name"
+            elif old_name == new_name:
+                skipped[old_name] = "unchanged"
+            elif os.path.basename(new_name) != new_name or new_name in (".", ".."):
+                skipped[old_name] = f"invalid new name: {new_name}"
+            elif cls._key(old_name) not in folders:
+                skipped[old_name] = "folder does not exist"
+            else:
+                renames[old_name] = new_name
+                target_counts[cls._key(new_name)] = (
+                    target_counts.get(cls._key(new_name), 0) + 1
+                )
+        for old_name, new_name in list(renames.items()):
+            if target_counts[cls._key(new_name)] > 1:
+                skipped[old_name] = f"several folders would be renamed to {new_name}"
+                del renames[old_name]
+
+        # 変更後の名前が既に使われている場合、その名前のフォルダも変更される場合のみ実行できる。
+        # 変更されないことが決まったフォルダによって、連鎖する変更も実行できなくなる
+        changed = True
+        while changed:
+            changed = False
+            sources = {cls._key(old_name) for old_name in renames}
+            for old_name, new_name in list(renames.items()):
+                target = cls._key(new_name)
+                if (
+                    target in names
+                    and target not in sources
+                    and target != cls._key(old_name)
+                ):
+                    skipped[old_name] = f"{new_name} already exists"
+                    del renames[old_name]
+                    changed = True
+        return renames, skipped
+
+    @classmethod
+    def plan_renames(
+        cls, names: Set[str], renames: Dict[str, str]
+    ) -> List[Tuple[str, str]]:
+        """
+        名前の変更を安全に実行できる順序に並べます。
+        A→B と B→C のような連鎖は後ろから実行し、A→B と B→A のような循環は一時的な名前を経由する。
+        :param names: ディレクトリ内のすべての名前（正規化済み）
+        :param renames: 検証済みの変更前のフォルダ名と変更後のフォルダ名の辞書
+        :return: (変更前の名前, 変更後の名前) のリスト
+        """
+        pending = {
+            cls._key(old_name): (old_name, new_name)
+            for old_name, new_name in renames.items()
+        }
+        # 変更後の名前 → その名前に変更するフォルダ
+        waiting_for = {
+            cls._key(new_name): key for key, (_, new_name) in pending.items()
+        }
+        ready = deque(
+            key
+            for key, (old_name, new_name) in pending.items()
+            if cls._key(new_name) not in pending or cls._key(new_name) == key
+        )
+        steps: List[Tuple[str, str]] = []
+        used_names = set(names)
+        temp_index = 0
+
+        def release(key: str):
+            # key の名前が空いたため、その名前に変更するフォルダを実行できるようにする
+            follower = waiting_for.get(key)
+            if follower is not None and follower in pending and follower != key:
+                ready.append(follower)
+
+        while pending:
+            if not ready:
+                # 残りはすべて循環しているため、1つを一時的な名前に変更して循環を切る
+                key, (old_name, new_name) = next(iter(pending.items()))
+                while True:
+                    temp_name = f"{cls.TEMP_PREFIX}{temp_index}"
+                    temp_index += 1
+                    if cls._key(temp_name) not in used_names:
+                        break
+                used_names.add(cls._key(temp_name))
+                steps.append((old_name, temp_name))
+                del pending[key]
+                pending[cls._key(temp_name)] = (temp_name, new_name)
+                waiting_for[cls._key(new_name)] = cls._key(temp_name)
+                release(key)
+                continue
+            key = ready.popleft()
+            if key not in pending:
+                continue
+            old_name, new_name = pending.pop(key)
+            steps.append((old_name, new_name))
+            release(key)
+        return steps
+
+    @classmethod
+    def _write_journal(
+        cls, journal_path: str, directory: str, steps: List[Tuple[str, str]]
+    ):
+        with open(journal_path, "w", encoding="utf-8") as journal:
+            journal.write(
+                json.dumps(
+                    {"directory": os.path.abspath(directory), "steps": steps},
+                    ensure_ascii=False,
+                )
+                + "\n"
+            )
+            journal.flush()
+            os.fsync(journal.fileno())
+
+    @classmethod
+    def _read_journal(cls, directory: str) -> Tuple[List[Tuple[str, str]], int]:
+        """
+        ジャーナルから名前の変更の手順と、完了が記録された手順の数を読み込みます。
+        """
+        with open(cls.get_journal_path(directory), "r", encoding="utf-8") as journal:
+            lines = journal.read().splitlines()
+        steps = [tuple(step) for step in json.loads(lines[0])["steps"]]
+        completed = 0
+        for line in lines[1:]:
+            try:
+                completed = max(completed, json.loads(line)["done"] + 1)
+            except (ValueError, KeyError, TypeError):
+                # 書き込みの途中で中断された行は無視する
+                continue
+        return steps, completed
+
+    @classmethod
+    def _execute(
+        cls,
+        directory: str,
+        steps: List[Tuple[str, str]],
+        start: int,
+        journal_path: str,
+    ) -> Tuple[int, Optional[str]]:
+        """
+        手順を start 番目から順に実行し、完了した手順をジャーナルに追記します。
+        中断後の再開に備え、変更前の名前がなく変更後の名前がある手順は完了済みとみなす。
+        :return: 変更後の名前になったフォルダの数（一時的な名前への変更は数えない）と、
+            エラーの内容（エラーがない場合はNone）
+        """
+        renamed = 0
+        with open(journal_path, "a", encoding="utf-8") as journal:
+            for index in range(start, len(steps)):
+                old_name, new_name = steps[index]
+                old_path = os.path.join(directory, old_name)
+                new_path = os.path.join(directory, new_name)
+                try:
+                    if os.path.lexists(old_path):
+                        os.rename(old_path, new_path)
+                        if not new_name.startswith(cls.TEMP_PREFIX):
+                            renamed += 1
+                        logger.debug(
+                            f"Folder renamed from '{old_name}' to '{new_name}'"
+                        )
+                    elif not os.path.lexists(new_path):
+                        raise FileNotFoundError(f"'{old_name}' does not exist")
+                except OSError as e:
+                    journal.flush()
+                    return renamed, (
+                        f"Error occurred while renaming folder from '{old_name}' "
+                        f"to '{new_name}': {e}"
+                    )
+                journal.write(json.dumps({"done": index}) + "\n")
+            journal.flush()
+        return renamed, None
+
+    @classmethod
+    def rename_many(cls, directory: str, mapping: Dict[str, str]) -> Dict[str, Any]:
+        """
+        ディレクトリ内の複数のフォルダの名前をまとめて変更します。
+        ディレクトリは1回だけ走査し、対応全体を検証してから、連鎖や循環を考慮した順序で変更する。
+        手順はディレクトリ内のジャーナルに記録し、中断された場合は resume() で再開、
+        rollback() で元に戻すことができる。すべての変更が完了するとジャーナルは削除される。
+        :param directory: フォルダが存在するディレクトリのパス
+        :param mapping: 変更前のフォルダ名と変更後のフォルダ名の辞書
+        :return: 変更したフォルダ数（renamed）・変更しなかったフォルダと理由（skipped）・
+            すべての手順が完了したか（completed）のディクショナリ
+        """
+        if cls.has_journal(directory):
+            logger.error(
+                f"An interrupted rename batch exists in '{directory}'. "
+                "Resume or roll it back first."
+            )
+            return {"renamed": 0, "skipped": {}, "completed": False}
+
+        names: Set[str] = set()
+        folders: Set[str] = set()
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    names.add(cls._key(entry.name))
+                    if entry.is_dir():
+                        folders.add(cls._key(entry.name))
+        except OSError as e:
+            logger.error(f"Failed to list directory '{directory}': {e}")
+            return {"renamed": 0, "skipped": {}, "completed": False}
+
+        renames, skipped = cls._validate(names, folders, mapping)
+        for old_name, reason in skipped.items():
+            if reason != "unchanged":
+                logger.warning(f"Skipped renaming folder '{old_name}': {reason}")
+        steps = cls.plan_renames(names, renames)
+        if not steps:
+            return {"renamed": 0, "skipped": skipped, "completed": True}
+
+        journal_path = cls.get_journal_path(directory)
+        cls._write_journal(journal_path, directory, steps)
+        renamed, error = cls._execute(directory, steps, 0, journal_path)
+        if error is not None:
+            logger.error(error)
+            logger.error(
+                f"Rename batch interrupted after renaming {renamed} folders; "
+                f"the journal is kept at '{journal_path}'"
+            )
+            return {"renamed": renamed, "skipped": skipped, "completed": False}
+        os.remove(journal_path)
+        logger.info(f"Renamed {renamed} folders in {len(steps)} steps")
+        return {"renamed": renamed, "skipped": skipped, "completed": True}
+
+    @classmethod
+    def resume(cls, directory: str) -> Dict[str, Any]:
+        """
+        中断された名前の変更を、ジャーナルの続きから再開します。
+        :param directory: フォルダが存在するディレクトリのパス
+        :return: 再開後に変更したフォルダ数（renamed）と、
+            すべての手順が完了したか（completed）のディクショナリ
+        """
+        journal_path = cls.get_journal_path(directory)
+        try:
+            steps, completed = cls._read_journal(directory)
+        except (OSError, ValueError, IndexError, KeyError) as e:
+            logger.error(f"Failed to read rename journal '{journal_path}': {e}")
+            return {"renamed": 0, "completed": False}
+        renamed, error = cls._execute(directory, steps, completed, journal_path)
+        if error is not None:
+            logger.error(error)
+            return {"renamed": renamed, "completed": False}
+        os.remove(journal_path)
+        logger.info(f"Resumed rename batch: renamed {renamed} folders")
+        return {"renamed": renamed, "completed": True}
+
+    @classmethod
+    def rollback(cls, directory: str) -> bool:
+        """
+        中断された名前の変更を、完了した手順から逆順に元に戻します。
+        :param directory: フォルダが存在するディレクトリのパス
+        :return: すべての手順を元に戻した場合は True、それ以外は False を返す
+        """
+        journal_path = cls.get_journal_path(directory)
+        try:
+            steps, _ = cls._read_journal(directory)
+        except (OSError, ValueError, IndexError, KeyError) as e:
+            logger.error(f"Failed to read rename journal '{journal_path}': {e}")
+            return False
+        # ジャーナルへの記録の前に中断された手順も戻すため、すべての手順を逆順に確認する
+        for old_name, new_name in reversed(steps):
+            old_path = os.path.join(directory, old_name)
+            new_path = os.path.join(directory, new_name)
+            if os.path.lexists(old_path) or not os.path.lexists(new_path):
+                continue
+            try:
+                os.rename(new_path, old_path)
+            except OSError as e:
+                logger.error(
+                    f"Error occurred while renaming folder from '{new_name}' back to '{old_name}': {e}"
+                )
+                return False
+        os.remove(journal_path)
+        logger.info(f"Rolled back rename batch in '{directory}'")
+        return True
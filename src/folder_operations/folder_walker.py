@@ -0,0 +1,146 @@
+import os
+from typing import Iterable, Iterator, List, Optional, Tuple, Union
+from src.log_operations.log_handlers import CustomLogger
+
+logger = CustomLogger(__name__)
+
+
+class FolderWalker:
+    """
+    os.scandir でフォルダを走査し、フォルダ名のプレフィックスに一致するフォルダの中身を返すクラス。
+    os.walk と異なり、プレフィックスに一致しないサブフォルダの中には入らない（開始フォルダの直下は常に走査する）。
+    ファイルの種類と拡張子は DirEntry にキャッシュされた情報とファイル名で判定し、stat を呼び出さない。
+    すべてのメソッドは classmethod / staticmethod として実装されている。
+    """
+
+    @staticmethod
+    def _normalize_extensions(
+        extensions: Optional[Union[str, Iterable[str]]],
+    ) -> Optional[Tuple[str, ...]]:
+        if extensions is None:
+            return None
+        if isinstance(extensions, str):
+            extensions = [extensions]
+        return tuple(extension.lower() for extension in extensions)
+
+    @staticmethod
+    def _scan(folder_path: str) -> Tuple[List[os.DirEntry], List[str]]:
+        """
+        フォルダの直下を読み、サブフォルダの DirEntry とファイル名を返します。
+        os.walk と同じく、フォルダへのシンボリックリンクはサブフォルダとして返す（中には入らない）。
+        """
+        folders = []
+        files = []
+        try:
+            with os.scandir(folder_path) as entries:
+                for entry in entries:
+                    try:
+                        is_dir = entry.is_dir()
+                    except OSError:
+                        is_dir = False
+                    if is_dir:
+                        folders.append(entry)
+                    else:
+                        files.append(entry.name)
+        except OSError as e:
+            logger.debug(f"Skipped unreadable folder: {folder_path}: {e}")
+        return folders, files
+
+    @staticmethod
+    def _can_descend(entry: os.DirEntry) -> bool:
+        try:
+            return not entry.is_symlink()
+        except OSError:
+            return False
+
+    @classmethod
+    def walk(
+        cls,
+        root_path: str,
+        folder_prefix: str = "",
+        extensions: Optional[Union[str, Iterable[str]]] = None,
+        bottom_up: bool = False,
+        prune: bool = True,
+    ) -> Iterator[Tuple[str, List[str], List[str]]]:
+        """
+        フォルダ名がプレフィックスで始まるフォルダについて、os.walk と同じ
+        (フォルダのパス, サブフォルダ名のリスト, ファイル名のリスト) を返します。
+        開始フォルダは、フォルダ名がプレフィックスで始まる場合のみ返す。
+        :param root_path: 走査を開始するフォルダのパス
+        :param folder_prefix: 対象のフォルダ名のプレフィックス
+        :param extensions: 返すファイルの拡張子（例: ".mdx"。大文字と小文字は区別しない）。None の場合はすべて
+        :param bottom_up: True の場合、サブフォルダを親フォルダより先に返す（移動や削除を行う場合に使用する）
+        :param prune: True の場合、プレフィックスに一致しないサブフォルダの中は走査しない
+        :return: (フォルダのパス, サブフォルダ名のリスト, ファイル名のリスト) のイテレーター
+        """
+        extensions = cls._normalize_extensions(extensions)
+
+        def result(
+            folder_path: str, folders: List[os.DirEntry], files: List[str]
+        ) -> Tuple[str, List[str], List[str]]:
+            if extensions is not None:
+                files = [name for name in files if name.lower().endswith(extensions)]
+            return folder_path, [entry.name for entry in folders], files
+
+        # (フォルダのパス, 走査済みの場合はその結果)
+        stack: List[Tuple[str, Optional[Tuple[List[os.DirEntry], List[str]]]]] = [
+            (root_path, None)
+        ]
+        while stack:
+            folder_path, scanned = stack.pop()
+            matches = os.path.basename(folder_path).startswith(folder_prefix)
+            if scanned is not None:
+                yield result(folder_path, *scanned)
+                continue
+
+            folders, files = cls._scan(folder_path)
+            if bottom_up and matches:
+                stack.append((folder_path, (folders, files)))
+            elif matches:
+                yield result(folder_path, folders, files)
+
+            children = [
+                entry.path
+                for entry in folders
+                if cls._can_descend(entry)
+                and (not prune or entry.name.startswith(folder_prefix))
+            ]
+            # スタックから取り出す順序を scandir の順序に合わせる
+            stack.extend((child, None) for child in reversed(children))
+
+    @classmethod
+    def iter_files(
+        cls,
+        root_path: str,
+        extensions: Optional[Union[str, Iterable[str]]] = None,
+        folder_prefix: str = "",
+    ) -> Iterator[str]:
+        """
+        フォルダ内のファイルのパスを再帰的に返します。
+        :param root_path: 走査を開始するフォルダのパス
+        :param extensions: 返すファイルの拡張子。None の場合はすべて
+        :param folder_prefix: 対象のフォルダ名のプレフィックス
+        :return: ファイルのパスのイテレーター
+        """
+        for folder_path, _, files in cls.walk(root_path, folder_prefix, extensions):
+            for name in files:
+                yield os.path.join(folder_path, name)
+
+    @classmethod
+    def list_folders(
+        cls, root_path: str, folder_prefix: str = "", bottom_up: bool = False
+    ) -> List[str]:
+        """
+        フォルダ名がプレフィックスで始まるサブフォルダのパスを再帰的に返します（開始フォルダは含まない）。
+        :param root_path: 走査を開始するフォルダのパス
+        :param folder_prefix: 対象のフォルダ名のプレフィックス
+        :param bottom_up: True の場合、サブフォルダを親フォルダより先に返す
+        :return: フォルダのパスのリスト
+        """
+        return [
+            folder_path
+            for folder_path, _, _ in cls.walk(
+                root_path, folder_prefix, bottom_up=bottom_up
+            )
+            if folder_path != root_path
+        ]
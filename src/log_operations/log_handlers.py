@@ -1,10 +1,29 @@
+import atexit
+import functools
+import json
 import logging
+import logging.handlers
+import queue
+import sys
+import time
+import uuid
 import colorama
 import os
-from typing import List, Dict, Union
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Callable, Iterator, List, Dict, Tuple, Union, Optional
 
 colorama.init(autoreset=True)
 
+LOG_FORMAT = "%(asctime)s [%(levelname)s] %(message)s"
+LOG_DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+LOG_FILE_NAME = "execution.log"
+LOG_FILE_MAX_BYTES = 10 * 1024 * 1024
+LOG_FILE_BACKUP_COUNT = 5
+METRICS_FILE_NAME = "metrics.jsonl"
+RUN_ID_ENV = "PIPELINE_RUN_ID"
+
 
 class ColoredFormatter(logging.Formatter):
     """Colored formatter class for adding colors to log levels."""
@@ -22,9 +41,207 @@ class ColoredFormatter(logging.Formatter):
         return f"{self.COLORS.get(record.levelname, '')}{log_message}{colorama.Style.RESET_ALL}"
 
 
+class QueueLogBackend:
+    """
+    Shared log output for all CustomLogger instances. Loggers only put records
+    on a queue; formatting and console/file output happen on one QueueListener
+    background thread per log folder.
+    Each process writes to its own rotating file in the log folder, named after
+    the running script (execution.<script>.log). ScriptExecutor runs every step
+    as a child process while the parent keeps its file open, and on Windows a
+    rollover cannot rename a file that another process holds open.
+    """
+
+    _lock = threading.Lock()
+    # absolute log folder -> (queue, listener)
+    _backends: Dict[str, Tuple[queue.SimpleQueue, logging.handlers.QueueListener]] = {}
+
+    @classmethod
+    def get_queue(cls, log_folder: str) -> queue.SimpleQueue:
+        """
+        Returns the queue for the given log folder. The output handlers and the
+        listener for a folder are started on the first call for that folder.
+
+        :param log_folder: Folder to save log files
+        :return: The queue that log records are put on
+        """
+        key = os.path.abspath(log_folder)
+        with cls._lock:
+            backend = cls._backends.get(key)
+            if backend is None:
+                log_queue = queue.SimpleQueue()
+                listener = logging.handlers.QueueListener(
+                    log_queue,
+                    cls._create_console_handler(),
+                    cls._create_file_handler(log_folder),
+                    respect_handler_level=True,
+                )
+                listener.start()
+                if not cls._backends:
+                    atexit.register(cls.stop)
+                backend = cls._backends[key] = (log_queue, listener)
+            return backend[0]
+
+    @classmethod
+    def stop(cls):
+        """
+        Writes out all records left on the queues and stops the listeners.
+        """
+        with cls._lock:
+            for _, listener in cls._backends.values():
+                listener.stop()
+                for handler in listener.handlers:
+                    handler.close()
+            cls._backends.clear()
+
+    @staticmethod
+    def get_log_file_name() -> str:
+        """
+        Returns the log file name for the current process, based on the name of
+        the running script.
+
+        :return: The log file name, e.g. "execution.replace_text.log"
+        """
+        script = os.path.splitext(os.path.basename(sys.argv[0]))[0] if sys.argv else ""
+        base, extension = os.path.splitext(LOG_FILE_NAME)
+        return f"{base}.{script or 'python'}{extension}"
+
+    @staticmethod
+    def _create_console_handler() -> logging.Handler:
+        console_handler = logging.StreamHandler()
+        console_handler.setFormatter(
+            ColoredFormatter(LOG_FORMAT, datefmt=LOG_DATE_FORMAT)
+        )
+        return console_handler
+
+    @classmethod
+    def _create_file_handler(cls, log_folder: str) -> logging.Handler:
+        if not os.path.exists(log_folder):
+            os.makedirs(log_folder)
+
+        file_handler = logging.handlers.RotatingFileHandler(
+            os.path.join(log_folder, cls.get_log_file_name()),
+            maxBytes=LOG_FILE_MAX_BYTES,
+            backupCount=LOG_FILE_BACKUP_COUNT,
+            encoding="utf-8",
+        )
+        file_handler.setFormatter(
+            logging.Formatter(LOG_FORMAT, datefmt=LOG_DATE_FORMAT)
+        )
+        return file_handler
+
+
+def get_run_id() -> str:
+    """
+    Returns the id of the current pipeline run. The id is read from the
+    PIPELINE_RUN_ID environment variable; if it is not set, a new id is created
+    and exported so that child processes report spans under the same run.
+
+    :return: The run id
+    """
+    run_id = os.environ.get(RUN_ID_ENV)
+    if not run_id:
+        run_id = f"{datetime.now():%Y%m%d-%H%M%S}-{uuid.uuid4().hex[:8]}"
+        os.environ[RUN_ID_ENV] = run_id
+    return run_id
+
+
+def _get_peak_working_set() -> Optional[int]:
+    """
+    Returns the peak working set size of the current process in bytes on
+    Windows, read with GetProcessMemoryInfo through ctypes.
+    """
+    import ctypes
+    from ctypes import wintypes
+
+    class PROCESS_MEMORY_COUNTERS(ctypes.Structure):
+        _fields_ = [
+            ("cb", wintypes.DWORD),
+            ("PageFaultCount", wintypes.DWORD),
+            ("PeakWorkingSetSize", ctypes.c_size_t),
+            ("WorkingSetSize", ctypes.c_size_t),
+            ("QuotaPeakPagedPoolUsage", ctypes.c_size_t),
+            ("QuotaPagedPoolUsage", ctypes.c_size_t),
+            ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t),
+            ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+            ("PagefileUsage", ctypes.c_size_t),
+            ("PeakPagefileUsage", ctypes.c_size_t),
+        ]
+
+    try:
+        kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)
+        # K32GetProcessMemoryInfo is exported by kernel32 since Windows 7
+        get_process_memory_info = kernel32.K32GetProcessMemoryInfo
+    except (OSError, AttributeError):
+        return None
+    get_process_memory_info.argtypes = [
+        wintypes.HANDLE,
+        ctypes.POINTER(PROCESS_MEMORY_COUNTERS),
+        wintypes.DWORD,
+    ]
+    get_process_memory_info.restype = wintypes.BOOL
+    kernel32.GetCurrentProcess.restype = wintypes.HANDLE
+
+    counters = PROCESS_MEMORY_COUNTERS()
+    counters.cb = ctypes.sizeof(counters)
+    if not get_process_memory_info(
+        kernel32.GetCurrentProcess(), ctypes.byref(counters), counters.cb
+    ):
+        return None
+    return counters.PeakWorkingSetSize
+
+
+def get_peak_rss() -> Optional[int]:
+    """
+    Returns the peak resident set size of the current process in bytes, or None
+    if it cannot be determined on this platform. On Windows the peak working
+    set size is used.
+    """
+    if sys.platform == "win32":
+        return _get_peak_working_set()
+    try:
+        import resource
+    except ImportError:
+        return None
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is reported in bytes on macOS and in kilobytes elsewhere
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+class MetricsWriter:
+    """
+    Appends span records as JSON lines to log_folder/metrics.jsonl.
+    Every record carries the run id and the script name, so the file can be
+    aggregated per run and per script. Each record is written with a single
+    append, so several processes of one run can share the file.
+    """
+
+    _lock = threading.Lock()
+
+    @classmethod
+    def write(cls, log_folder: str, record: Dict[str, Any]):
+        """
+        Appends one record to the metrics file.
+
+        :param log_folder: Folder to save the metrics file
+        :param record: The record to write
+        """
+        line = json.dumps(record, ensure_ascii=False, default=str) + "\n"
+        with cls._lock:
+            os.makedirs(log_folder, exist_ok=True)
+            with open(
+                os.path.join(log_folder, METRICS_FILE_NAME), "a", encoding="utf-8"
+            ) as f:
+                f.write(line)
+
+
 class CustomLogger(logging.Logger):
     """
     CustomLogger class sets up a logger with colored console output and file output.
+    Records are handed to the shared QueueLogBackend, so formatting and I/O happen
+    on a background thread. Hot loops should guard expensive debug messages with
+    ``isEnabledFor(logging.DEBUG)``.
     """
 
     def __init__(self, name: str, level=logging.INFO, log_folder="logs"):
@@ -36,6 +253,7 @@ class CustomLogger(logging.Logger):
         :param log_folder: Folder to save log files (default is 'logs')
         """
         super().__init__(name, level)
+        self.log_folder = log_folder
 
         # Avoid adding multiple handlers to the logger if they already exist
         if not self.hasHandlers():
@@ -43,51 +261,84 @@ class CustomLogger(logging.Logger):
 
     def _initialize_logger(self, level, log_folder):
         """
-        Initializes the logger with both console and file handlers.
+        Initializes the logger with a queue handler that forwards records to the
+        shared console and file output.
         """
         self.setLevel(level)
         self.propagate = False
 
-        # Setup console handler with colored output
-        self._add_console_handler(level)
-
-        # Setup file handler
-        self._add_file_handler(level, log_folder)
+        queue_handler = logging.handlers.QueueHandler(
+            QueueLogBackend.get_queue(log_folder)
+        )
+        queue_handler.setLevel(level)
+        self.addHandler(queue_handler)
 
-    def _add_console_handler(self, level):
+    @contextmanager
+    def span(self, name: str, **fields: Any) -> Iterator[Dict[str, Any]]:
         """
-        Adds a console handler with colored formatting to the logger.
+        Measures the wall time, CPU time and peak RSS of the enclosed block and
+        writes them to the metrics file as one JSON line.
 
-        :param level: Logging level for the console output
-        """
-        console_handler = logging.StreamHandler()
-        console_handler.setLevel(level)
-        console_handler.setFormatter(
-            ColoredFormatter(
-                "%(asctime)s [%(levelname)s] %(message)s", datefmt="%Y-%m-%d %H:%M:%S"
-            )
-        )
-        self.addHandler(console_handler)
+        Usage::
 
-    def _add_file_handler(self, level, log_folder):
+            with logger.span("http.fetch", url=url) as span:
+                response = requests.get(url)
+                span["http_status"] = response.status_code
+
+        :param name: Name of the stage (e.g. "excel.load", "chatgpt.wait")
+        :param fields: Additional fields to record with the span
+        :return: A dict that the block can add fields to (keys that clash with the
+                 standard fields such as "status" are ignored)
+        """
+        extra = dict(fields)
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        status = "ok"
+        try:
+            yield extra
+        except BaseException:
+            status = "error"
+            raise
+        finally:
+            record = {
+                "time": datetime.now().isoformat(timespec="milliseconds"),
+                "run_id": get_run_id(),
+                "script": os.path.basename(sys.argv[0]) if sys.argv else "",
+                "pid": os.getpid(),
+                "span": name,
+                "wall_s": round(time.perf_counter() - wall_start, 6),
+                "cpu_s": round(time.process_time() - cpu_start, 6),
+                "peak_rss": get_peak_rss(),
+                "status": status,
+            }
+            record.update({k: v for k, v in extra.items() if k not in record})
+            try:
+                MetricsWriter.write(self.log_folder, record)
+            except OSError as e:
+                self.warning(f"Failed to write span '{name}': {str(e)}")
+            if self.isEnabledFor(logging.DEBUG):
+                self.debug(
+                    f"Span {name}: wall {record['wall_s']:.3f}s, cpu {record['cpu_s']:.3f}s"
+                )
+
+    def timed(self, name: Optional[str] = None) -> Callable:
         """
-        Adds a file handler for saving log messages to a file.
+        Decorator that records every call of the decorated function as a span.
 
-        :param level: Logging level for the file output
-        :param log_folder: Folder to save log files
+        :param name: Name of the stage (default is the function's qualified name)
         """
-        if not os.path.exists(log_folder):
-            os.makedirs(log_folder)
 
-        log_file_path = os.path.join(log_folder, f"{self.name}.log")
-        file_handler = logging.FileHandler(log_file_path)
-        file_handler.setLevel(level)
-        file_handler.setFormatter(
-            logging.Formatter(
-                "%(asctime)s [%(levelname)s] %(message)s", datefmt="%Y-%m-%d %H:%M:%S"
-            )
-        )
-        self.addHandler(file_handler)
+        def decorator(function: Callable) -> Callable:
+            span_name = name or f"{function.__module__}.{function.__qualname__}"
+
+            @functools.wraps(function)
+            def wrapper(*args, **kwargs):
+                with self.span(span_name):
+                    return function(*args, **kwargs)
+
+            return wrapper
+
+        return decorator
 
     def prominent_log(self, message: str, level=logging.INFO, box_width=60):
         """
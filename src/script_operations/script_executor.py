@@ -1,7 +1,7 @@
 import subprocess
 import sys
 import os
-from src.log_operations.log_handlers import CustomLogger
+from src.log_operations.log_handlers import CustomLogger, get_run_id
 
 logger = CustomLogger(__name__)
 
@@ -18,6 +18,8 @@ class ScriptExecutor:
         :param python_executable: 使用するPythonインタープリタのパス。デフォルトは現在のPythonインタープリタ。
         """
         self.python_executable = python_executable
+        # 子プロセスのスパンが同じ実行として集計されるよう、実行 ID を環境変数に設定しておく
+        self.run_id = get_run_id()
         logger.debug(
             f"ScriptExecutor initialized with Python executable: {self.python_executable}"
         )
@@ -37,12 +39,13 @@ class ScriptExecutor:
             script_name = os.path.splitext(os.path.basename(script_path))[0]
 
             logger.highlighted_log(f"Starting execution of script: {script_name}")
-            result = subprocess.run(
-                [self.python_executable, script_path],
-                check=True,
-                stdout=None,
-                stderr=None,
-            )
+            with logger.span("script.run", target=script_name):
+                result = subprocess.run(
+                    [self.python_executable, script_path],
+                    check=True,
+                    stdout=None,
+                    stderr=None,
+                )
             logger.info(f"Script {script_name} executed successfully")
             return result.returncode
         except subprocess.CalledProcessError as e:
@@ -63,12 +66,15 @@ class ScriptExecutor:
 
         try:
             logger.info(f"Starting execution of {script_path} with args: {args}")
-            result = subprocess.run(
-                [self.python_executable, "-u", script_path] + args,
-                check=True,
-                stdout=None,
-                stderr=None,
-            )
+            with logger.span(
+                "script.run", target=os.path.basename(script_path), args=args
+            ):
+                result = subprocess.run(
+                    [self.python_executable, "-u", script_path] + args,
+                    check=True,
+                    stdout=None,
+                    stderr=None,
+                )
             logger.info(f"Script {script_path} executed successfully with args: {args}")
             return result.returncode
         except subprocess.CalledProcessError as e:
@@ -0,0 +1,169 @@
+from typing import List
+from lxml import etree
+from lxml import html as lxml_html
+from src.log_operations.log_handlers import CustomLogger
+
+logger = CustomLogger(__name__)
+
+ASCII_SPACES = "\x20\x0a\x09\x0c\x0d"
+PRESERVE_WHITESPACE_TAGS = ("pre", "textarea")
+
+
+class LxmlMarkdownConverter:
+    """
+    lxml のツリー上で HTML を Markdown に変換するクラス。
+    TextConverter.convert_to_markdown（BeautifulSoup 版）と同じ Markdown を出力する。
+    各要素は1度だけ走査し、見出しや段落などのテキストは lxml の itertext で取得する。
+    すべてのメソッドは classmethod / staticmethod として実装されている。
+    """
+
+    @staticmethod
+    def parse(content: str) -> etree._Element:
+        """
+        HTML 文字列を lxml のツリーに変換します。
+
+        :param content: HTML 文字列
+        :return: ルート要素
+        """
+        try:
+            return lxml_html.document_fromstring(content)
+        except ValueError:
+            # エンコーディング宣言を含む文字列は lxml が受け付けないため、バイト列として解析する
+            parser = lxml_html.HTMLParser(encoding="utf-8")
+            return lxml_html.document_fromstring(content.encode("utf-8"), parser=parser)
+
+    @staticmethod
+    def find_elements(
+        root: etree._Element, tag_name: str, class_list: List[str]
+    ) -> List[etree._Element]:
+        """
+        指定されたタグ名で、指定されたクラスを全て持つ要素を文書順に返します。
+
+        :param root: 検索するツリーのルート要素
+        :param tag_name: タグ名
+        :param class_list: 要素が持つべきクラスのリスト
+        :return: 条件に合致する要素のリスト
+        """
+        conditions = ["normalize-space(@class)"]
+        variables = {"tag": tag_name}
+        for i, class_name in enumerate(class_list):
+            conditions.append(
+                f"contains(concat(' ', normalize-space(@class), ' '), $class{i})"
+            )
+            variables[f"class{i}"] = f" {class_name} "
+        return root.xpath(
+            f"//*[name() = $tag and {' and '.join(conditions)}]", **variables
+        )
+
+    @staticmethod
+    def to_html(element: etree._Element) -> str:
+        """
+        要素を HTML 文字列に変換します（後続のテキストは含めない）。
+        """
+        return etree.tostring(
+            element, encoding="unicode", method="html", with_tail=False
+        )
+
+    @staticmethod
+    def _get_text(el: etree._Element) -> str:
+        """
+        BeautifulSoup の get_text(strip=True) と同じく、子孫のテキストを前後の空白を除いて連結します。
+        """
+        return "".join(text.strip() for text in el.itertext())
+
+    @staticmethod
+    def _normalize_whitespace(el: etree._Element, text: str) -> str:
+        """
+        BeautifulSoup と同じく、空白のみの文字列を1つの改行（改行を含む場合）または空白に置き換えます。
+        pre と textarea の中では置き換えない。
+        """
+        if text.strip(ASCII_SPACES):
+            return text
+        if el.tag in PRESERVE_WHITESPACE_TAGS or any(
+            True for _ in el.iterancestors(*PRESERVE_WHITESPACE_TAGS)
+        ):
+            return text
+        return "\n" if "\n" in text else " "
+
+    @classmethod
+    def _iter_children(cls, el: etree._Element):
+        """
+        BeautifulSoup の children と同じ順序で、テキストと子要素を返します。
+        """
+        if el.text:
+            yield cls._normalize_whitespace(el, el.text)
+        for child in el:
+            yield child
+            if child.tail:
+                yield cls._normalize_whitespace(el, child.tail)
+
+    @classmethod
+    def convert(cls, element: etree._Element) -> str:
+        """
+        lxml の要素を Markdown に変換します（TextConverter の後処理を行う前の文字列）。
+
+        :param element: 変換する要素
+        :return: Markdown 文字列
+        """
+        return cls._process_element(element)
+
+    @classmethod
+    def _process_element(cls, el, level: int = 0) -> str:
+        if isinstance(el, str):
+            return el
+        tag = el.tag
+        if not isinstance(tag, str):
+            # コメントや処理命令は BeautifulSoup と同じく中身の文字列のみを出力する
+            return el.text or ""
+
+        if tag == "h1":
+            return f"# {cls._get_text(el)}\n\n"
+        if tag == "h2":
+            return f"## {cls._get_text(el)}\n\n"
+        if tag == "h3":
+            return f"### {cls._get_text(el)}\n\n"
+        if tag == "p":
+            return f"{cls._get_text(el)}\n\n"
+        if tag == "ul":
+            return "".join(cls._process_list(el, level, is_ordered=False))
+        if tag == "ol":
+            return "".join(cls._process_list(el, level, is_ordered=True))
+        if tag == "li":
+            return cls._process_list_item(el, level)
+        if tag == "a":
+            return f"[{cls._get_text(el)}]({el.get('href', '')})"
+        if tag in ("strong", "b"):
+            return f"**{cls._get_text(el)}**"
+        if tag in ("em", "i"):
+            return f"*{cls._get_text(el)}*"
+        if tag == "code":
+            return f"`{cls._get_text(el)}`"
+        if tag == "pre":
+            return f"```\n{cls._get_text(el)}\n```\n\n"
+        return "".join(
+            cls._process_element(child, level) for child in cls._iter_children(el)
+        )
+
+    @classmethod
+    def _process_list(cls, el, level: int, is_ordered: bool) -> List[str]:
+        result = []
+        items = [child for child in el if child.tag == "li"]
+        for i, li in enumerate(items, 1):
+            prefix = f"{i}. " if is_ordered else "- "
+            content = cls._process_list_item(li, level + 1)
+            result.append(f"{'  ' * level}{prefix}{content}\n")
+        return result
+
+    @classmethod
+    def _process_list_item(cls, el, level: int) -> str:
+        content = []
+        for child in cls._iter_children(el):
+            if isinstance(child, str):
+                content.append(child.strip())
+            elif child.tag in ("ul", "ol"):
+                content.append(
+                    "\n" + "".join(cls._process_list(child, level, child.tag == "ol"))
+                )
+            else:
+                content.append(cls._process_element(child, level).strip())
+        return " ".join(content).strip()
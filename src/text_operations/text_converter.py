@@ -1,6 +1,7 @@
 from bs4 import Tag, NavigableString
+import importlib.util
 import re
-from typing import List
+from typing import Any, List
 import html
 from bs4 import BeautifulSoup
 from src.log_operations.log_handlers import CustomLogger
@@ -9,16 +10,86 @@ logger = CustomLogger(__name__)
 
 
 class TextConverter:
+    MARKDOWN_BACKEND_BS4 = "bs4"
+    MARKDOWN_BACKEND_LXML = "lxml"
+
     @classmethod
-    def convert_to_markdown(cls, element: Tag) -> str:
+    def resolve_markdown_backend(cls, backend: str = "auto") -> str:
+        """
+        HTMLの解析とMarkdown変換に使用するバックエンドを決定します。
+        "auto" の場合は lxml がインストールされていれば "lxml"、なければ "bs4"。
+
+        :param backend: "auto"、"lxml"、または "bs4"
+        :return: 使用するバックエンド名
+        """
+        if backend != "auto":
+            return backend
+        if importlib.util.find_spec("lxml") is not None:
+            return cls.MARKDOWN_BACKEND_LXML
+        return cls.MARKDOWN_BACKEND_BS4
+
+    @classmethod
+    def find_elements(
+        cls, content: str, tag_name: str, class_list: List[str], backend: str = "auto"
+    ) -> List[Any]:
+        """
+        HTMLを解析し、指定されたタグ名で指定されたクラスを全て持つ要素を返します。
+        返した要素は convert_to_markdown と element_to_html にそのまま渡せる。
+
+        :param content: HTML文字列
+        :param tag_name: タグ名
+        :param class_list: 要素が持つべきクラスのリスト
+        :param backend: "auto"、"lxml"（lxml の要素を返す）、または "bs4"（BeautifulSoup の Tag を返す）
+        :return: 条件に合致する要素のリスト
+        """
+        if cls.resolve_markdown_backend(backend) == cls.MARKDOWN_BACKEND_LXML:
+            from src.text_operations.lxml_markdown_converter import (
+                LxmlMarkdownConverter,
+            )
+
+            root = LxmlMarkdownConverter.parse(content)
+            elements = LxmlMarkdownConverter.find_elements(root, tag_name, class_list)
+        else:
+            soup = BeautifulSoup(content, "html.parser")
+            elements = soup.find_all(
+                tag_name,
+                class_=lambda x: x and all(c in x.split() for c in class_list),
+            )
+        logger.debug(f"{len(elements)} 個の要素が見つかりました。")
+        return elements
+
+    @staticmethod
+    def element_to_html(element: Any) -> str:
+        """
+        find_elements で取得した要素をHTML文字列に変換します。
+
+        :param element: BeautifulSoup の Tag または lxml の要素
+        :return: HTML文字列
+        """
+        if isinstance(element, (Tag, NavigableString)):
+            return str(element)
+        from src.text_operations.lxml_markdown_converter import LxmlMarkdownConverter
+
+        return LxmlMarkdownConverter.to_html(element)
+
+    @classmethod
+    def convert_to_markdown(cls, element: Any) -> str:
         """
         HTMLエレメントをMarkdown形式に変換します。
+        lxml の要素が渡された場合は LxmlMarkdownConverter で変換する（出力は同じ）。
 
-        :param element: 変換するBeautifulSoupのTagオブジェクト
+        :param element: 変換するBeautifulSoupのTagオブジェクト、または lxml の要素
         :return: 変換されたMarkdown文字列
         """
         logger.debug("HTMLエレメントのMarkdown変換を開始します。")
-        markdown = cls._process_element(element)
+        if isinstance(element, (Tag, NavigableString)):
+            markdown = cls._process_element(element)
+        else:
+            from src.text_operations.lxml_markdown_converter import (
+                LxmlMarkdownConverter,
+            )
+
+            markdown = LxmlMarkdownConverter.convert(element)
         markdown = re.sub(r"\n{3,}", "\n\n", markdown)
         markdown = re.sub(r"<[^>]+>", "", markdown)
         markdown = (
@@ -41,9 +112,9 @@ class TextConverter:
         elif el.name == "p":
             result.append(f"{el.get_text(strip=True)}\n\n")
         elif el.name == "ul":
-            result.extend(cls._process_list(el, level, is_ordered=False))
+            result.extend(cls._process_html_list(el, level, is_ordered=False))
         elif el.name == "ol":
-            result.extend(cls._process_list(el, level, is_ordered=True))
+            result.extend(cls._process_html_list(el, level, is_ordered=True))
         elif el.name == "li":
             result.append(cls._process_list_item(el, level))
         elif el.name == "a":
@@ -66,7 +137,7 @@ class TextConverter:
         return "".join(result)
 
     @classmethod
-    def _process_list(cls, el: Tag, level: int, is_ordered: bool) -> List[str]:
+    def _process_html_list(cls, el: Tag, level: int, is_ordered: bool) -> List[str]:
         result = []
         for i, li in enumerate(el.find_all("li", recursive=False), 1):
             prefix = f"{i}. " if is_ordered else "- "
@@ -82,7 +153,9 @@ class TextConverter:
                 if child.name in ["ul", "ol"]:
                     content.append(
                         "\n"
-                        + "".join(cls._process_list(child, level, child.name == "ol"))
+                        + "".join(
+                            cls._process_html_list(child, level, child.name == "ol")
+                        )
                     )
                 else:
                     content.append(cls._process_element(child, level).strip())
@@ -90,103 +163,91 @@ class TextConverter:
                 content.append(child.strip())
         return " ".join(content).strip()
 
+    ORDERED_LIST_PATTERN = re.compile(r"\d+\. ")
+    PARAGRAPH_BREAK_PREFIXES = ("#", "-", "*", "1")
+
     @classmethod
     def convert_to_html(cls, markdown_text: str) -> str:
         """
         Markdown形式のテキストをHTML形式に変換します。
+        各行を1度だけ前後の空白を除いてから、先頭から1回の走査で見出し・リスト・段落を判定します。
 
         :param markdown_text: 変換するMarkdownテキスト
         :return: 変換されたHTML文字列
         """
         logger.debug("Markdownテキストのhtml変換を開始します。")
-        lines = markdown_text.splitlines()
+        lines = [line.strip() for line in markdown_text.splitlines()]
         html_parts = []
-        in_list = False
         list_type = None
         current_list = []
 
         i = 0
-        while i < len(lines):
-            line = lines[i].strip()
-
-            if not line:
-                if in_list:
-                    html_parts.append(cls._process_list(current_list, list_type))
-                    current_list = []
-                    in_list = False
-                    list_type = None
-                html_parts.append("")
-                i += 1
-                continue
-
-            if line.startswith("###"):
-                if in_list:
-                    html_parts.append(cls._process_list(current_list, list_type))
-                    current_list = []
-                    in_list = False
-                    list_type = None
+        line_count = len(lines)
+        while i < line_count:
+            line = lines[i]
+
+            if line.startswith(("- ", "* ")):
+                item_type, item = "ul", line[2:]
+            elif cls.ORDERED_LIST_PATTERN.match(line):
+                item_type, item = "ol", line[line.index(".") + 2 :]
+            else:
+                item_type = None
+
+            if list_type is not None and item_type != list_type:
+                html_parts.append(cls._process_list(current_list, list_type))
+                current_list = []
+                list_type = None
+
+            if item_type is not None:
+                list_type = item_type
+                current_list.append(item)
+            elif not line:
+                pass
+            elif line.startswith("###"):
                 html_parts.append(f"<h3>{line[3:].strip()}</h3>")
             elif line.startswith("##"):
-                if in_list:
-                    html_parts.append(cls._process_list(current_list, list_type))
-                    current_list = []
-                    in_list = False
-                    list_type = None
                 html_parts.append(f"<h2>{line[2:].strip()}</h2>")
             elif line.startswith("#"):
-                if in_list:
-                    html_parts.append(cls._process_list(current_list, list_type))
-                    current_list = []
-                    in_list = False
-                    list_type = None
                 html_parts.append(f"<h1>{line[1:].strip()}</h1>")
-
-            elif line.startswith("- ") or line.startswith("* "):
-                if not in_list or list_type != "ul":
-                    if in_list:
-                        html_parts.append(cls._process_list(current_list, list_type))
-                        current_list = []
-                    in_list = True
-                    list_type = "ul"
-                current_list.append(line[2:])
-
-            elif re.match(r"^\d+\. ", line):
-                if not in_list or list_type != "ol":
-                    if in_list:
-                        html_parts.append(cls._process_list(current_list, list_type))
-                        current_list = []
-                    in_list = True
-                    list_type = "ol"
-                current_list.append(line[line.index(".") + 2 :])
-
             else:
-                if in_list:
-                    html_parts.append(cls._process_list(current_list, list_type))
-                    current_list = []
-                    in_list = False
-                    list_type = None
-
-                paragraph = line
+                paragraph = [line]
                 while (
-                    i + 1 < len(lines)
-                    and lines[i + 1].strip()
-                    and not lines[i + 1].strip().startswith(("#", "-", "*", "1"))
+                    i + 1 < line_count
+                    and lines[i + 1]
+                    and not lines[i + 1].startswith(cls.PARAGRAPH_BREAK_PREFIXES)
                 ):
                     i += 1
-                    paragraph += " " + lines[i].strip()
+                    paragraph.append(lines[i])
 
-                paragraph = cls._process_inline_elements(paragraph)
-                html_parts.append(f"<p>{paragraph}</p>")
+                html_parts.append(
+                    f"<p>{cls._process_inline_elements(' '.join(paragraph))}</p>"
+                )
 
             i += 1
 
-        if in_list:
+        if list_type is not None:
             html_parts.append(cls._process_list(current_list, list_type))
 
         html = "\n".join(filter(None, html_parts))
         logger.debug("Markdownテキストの変換が完了しました。")
         return html
 
+    @staticmethod
+    def _replace_markers(text: str, marker: str, open_tag: str, close_tag: str) -> str:
+        """
+        最初のマーカーを開始タグに、以降の全てのマーカーを終了タグに置き換えます。
+
+        :param text: 処理するテキスト
+        :param marker: マーカー（"**" など）
+        :param open_tag: 開始タグ
+        :param close_tag: 終了タグ
+        :return: 置き換え後のテキスト
+        """
+        parts = text.split(marker)
+        if len(parts) == 1:
+            return text
+        return parts[0] + open_tag + close_tag.join(parts[1:])
+
     @classmethod
     def _process_inline_elements(cls, text: str) -> str:
         """
@@ -195,17 +256,9 @@ class TextConverter:
         :param text: 処理するテキスト
         :return: HTML形式に変換されたテキスト
         """
-        text = text.replace("**", "<strong>", 1)
-        while "**" in text:
-            text = text.replace("**", "</strong>", 1)
-
-        text = text.replace("*", "<em>", 1)
-        while "*" in text:
-            text = text.replace("*", "</em>", 1)
-        text = text.replace("`", "<code>", 1)
-        while "`" in text:
-            text = text.replace("`", "</code>", 1)
-
+        text = cls._replace_markers(text, "**", "<strong>", "</strong>")
+        text = cls._replace_markers(text, "*", "<em>", "</em>")
+        text = cls._replace_markers(text, "`", "<code>", "</code>")
         return text
 
     @classmethod
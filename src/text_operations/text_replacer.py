@@ -1,9 +1,69 @@
+import logging
 import re
-from typing import Optional, Union
+import threading
+from functools import lru_cache, partial
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Union
 from src.log_operations.log_handlers import CustomLogger
 
 logger = CustomLogger(__name__)
 
+ReplacementTable = Union[Dict[str, str], Iterable[Tuple[str, str]]]
+
+
+class MultiLiteralReplacer:
+    """
+    複数の (置換対象, 置換後) の組を1つのパターンにコンパイルし、テキストを1回の走査で置換するクラス。
+    同じ位置から始まる置換対象が複数ある場合は最も長いものを選ぶ（最左最長一致）。
+    置換後のテキストは再度走査しないため、置換の結果が別の置換対象になる場合は
+    1組ずつ順番に置換した場合と結果が異なる。
+    """
+
+    def __init__(self, mapping: ReplacementTable):
+        """
+        :param mapping: 置換表（辞書、または (置換対象, 置換後) のイテラブル。同じ置換対象は後のものが優先）
+        :raises ValueError: 空文字列の置換対象が含まれる場合
+        """
+        self.mapping: Dict[str, str] = dict(mapping)
+        if "" in self.mapping:
+            raise ValueError("Replacement targets must not be empty.")
+        # 長い順に並べることで、同じ位置では最も長い置換対象が優先される
+        targets = sorted(self.mapping, key=len, reverse=True)
+        self.pattern = (
+            re.compile("|".join(re.escape(target) for target in targets))
+            if targets
+            else None
+        )
+
+    def _replacement(self, match: re.Match) -> str:
+        return self.mapping[match.group()]
+
+    def replace(self, content: str) -> str:
+        """
+        置換表の全ての組を1回の走査で置換する。
+
+        :param content: 置換を行う元のテキスト
+        :return: 置換後のテキスト
+        """
+        return self.subn(content)[0]
+
+    def subn(self, content: str) -> Tuple[str, int]:
+        """
+        置換表の全ての組を1回の走査で置換し、置換した箇所の数とともに返す。
+
+        :param content: 置換を行う元のテキスト
+        :return: (置換後のテキスト, 置換した箇所の数)
+        """
+        if self.pattern is None:
+            return content, 0
+        return self.pattern.subn(self._replacement, content)
+
+
+@lru_cache(maxsize=64)
+def _get_multi_literal_replacer(
+    items: Tuple[Tuple[str, str], ...],
+) -> MultiLiteralReplacer:
+    return MultiLiteralReplacer(items)
+
 
 class TextReplacer:
     """
@@ -29,6 +89,23 @@ class TextReplacer:
         )
         return result
 
+    @staticmethod
+    def replace_many(content: str, mapping: ReplacementTable) -> str:
+        """
+        置換表の全ての組を、テキストの1回の走査で置換する（最左最長一致）。
+        コンパイルした置換表はキャッシュされ、同じ置換表での呼び出しでは再利用される。
+        置換の結果が別の置換対象を含む場合は、replace_content を順番に呼び出した場合と結果が異なる。
+
+        :param content: 置換を行う元のテキスト
+        :param mapping: 置換表（辞書、または (置換対象, 置換後) のイテラブル）
+        :return: 置換後のテキスト
+        """
+        items = tuple(mapping.items() if isinstance(mapping, dict) else mapping)
+        result, count = _get_multi_literal_replacer(items).subn(content)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"Replaced {count} occurrences of {len(items)} targets")
+        return result
+
     @staticmethod
     def replace_content_regex(
         content: str, pattern: str, replacement: str, flags: int = re.DOTALL
@@ -291,3 +368,181 @@ class TextReplacer:
         else:
             logger.debug(f"No occurrence of '{target_text}' found in the content")
             return content
+
+
+def _pattern_rule(
+    pattern: re.Pattern, replacement: str, content: str
+) -> Tuple[str, int]:
+    return pattern.subn(replacement, content)
+
+
+def _function_rule(
+    process_function: Callable[[str], str], content: str
+) -> Tuple[str, int]:
+    result = process_function(content)
+    return result, int(result != content)
+
+
+class TextReplacePipeline:
+    """
+    複数の置換ルールを登録順に1つのテキストへ適用するためのクラス。
+    パターンはルールの登録時に1度だけコンパイルされ、apply() の呼び出しごとに
+    全てのルールをメモリ上で順番に適用する。ルールごとのヒット数を集計する。
+    ヒット数は、文字列・正規表現のルールでは置換した箇所の数、
+    関数のルールでは内容を変更したテキストの数とする。
+    ルールはモジュールの最上位の関数の functools.partial として保持するため、
+    関数のルールが pickle 可能であれば、パイプラインごとプロセスプールへ渡すことができる。
+    """
+
+    def __init__(self):
+        self.rules: List[Tuple[str, Callable[[str], Tuple[str, int]]]] = []
+        self.signatures: List[Tuple[Any, ...]] = []
+        self.hit_counts: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def __getstate__(self) -> Dict[str, Any]:
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def _add(
+        self,
+        name: str,
+        rule: Callable[[str], Tuple[str, int]],
+        signature: Tuple[Any, ...],
+    ):
+        if name in self.hit_counts:
+            name = f"{name} #{len(self.rules) + 1}"
+        self.rules.append((name, rule))
+        self.signatures.append(signature)
+        self.hit_counts[name] = 0
+        return self
+
+    def add_literal(
+        self, target_text: str, replacement_text: str, name: Optional[str] = None
+    ) -> "TextReplacePipeline":
+        """
+        テキスト全体の文字列を置換するルールを追加する（replace_content と同じ動作）。
+
+        :param target_text: 置換対象のテキスト
+        :param replacement_text: 置換後のテキスト
+        :param name: ヒット数の集計に使用するルール名（省略時は置換対象から作成）
+        :return: 自身（メソッドチェーン用）
+        """
+        target_pattern = re.compile(re.escape(target_text))
+        return self._add(
+            name or f"literal {target_text!r}",
+            partial(_pattern_rule, target_pattern, replacement_text),
+            ("literal", target_text, replacement_text),
+        )
+
+    def add_literals(
+        self, mapping: ReplacementTable, name: Optional[str] = None
+    ) -> "TextReplacePipeline":
+        """
+        置換表の全ての組を1回の走査で置換するルールを追加する（replace_many と同じ動作）。
+        置換の結果が別の置換対象を含まない置換表に使用すること。
+
+        :param mapping: 置換表（辞書、または (置換対象, 置換後) のイテラブル）
+        :param name: ヒット数の集計に使用するルール名（省略時は置換対象の数から作成）
+        :return: 自身（メソッドチェーン用）
+        """
+        replacer = MultiLiteralReplacer(mapping)
+        return self._add(
+            name or f"literals ({len(replacer.mapping)} targets)",
+            replacer.subn,
+            ("literals", sorted(replacer.mapping.items())),
+        )
+
+    def add_regex(
+        self,
+        pattern: str,
+        replacement: str,
+        flags: int = re.DOTALL,
+        name: Optional[str] = None,
+    ) -> "TextReplacePipeline":
+        """
+        正規表現で置換するルールを追加する（replace_content_regex と同じ動作）。
+
+        :param pattern: 置換対象の正規表現パターン
+        :param replacement: 置換後のテキスト
+        :param flags: 正規表現フラグ
+        :param name: ヒット数の集計に使用するルール名（省略時はパターンから作成）
+        :return: 自身（メソッドチェーン用）
+        """
+        compiled_pattern = re.compile(pattern, flags)
+        return self._add(
+            name or f"regex {pattern!r}",
+            partial(_pattern_rule, compiled_pattern, replacement),
+            ("regex", pattern, replacement, flags),
+        )
+
+    def add_function(
+        self, name: str, process_function: Callable[[str], str]
+    ) -> "TextReplacePipeline":
+        """
+        テキストを受け取り置換後のテキストを返す関数をルールとして追加する。
+        TextReplacer の各メソッドを functools.partial で引数を固定して渡すことを想定している。
+
+        :param name: ヒット数の集計に使用するルール名
+        :param process_function: テキストを処理する関数
+        :return: 自身（メソッドチェーン用）
+        """
+        return self._add(
+            name,
+            partial(_function_rule, process_function),
+            ("function", process_function),
+        )
+
+    def apply(self, content: str) -> str:
+        """
+        登録されたルールを順番にテキストへ適用する。
+        ルールの実行中にエラーが発生した場合は、一部のルールだけを適用したテキストが
+        書き込まれないよう、例外を送出する（ヒット数も集計しない）。
+
+        :param content: 置換を行う元のテキスト
+        :return: 全てのルールを適用した後のテキスト
+        :raises RuntimeError: いずれかのルールの実行中にエラーが発生した場合
+        """
+        hits = []
+        for name, rule in self.rules:
+            try:
+                content, count = rule(content)
+            except Exception as e:
+                raise RuntimeError(f"Replacement rule '{name}' failed: {e}") from e
+            if count:
+                hits.append((name, count))
+        with self._lock:
+            for name, count in hits:
+                self.hit_counts[name] += count
+        return content
+
+    def get_signature(self) -> List[Tuple[Any, ...]]:
+        """
+        登録されたルールの種類と引数を登録順に返す（ルールの組み合わせが変わったかの判定に使用する）。
+        関数のルールには関数そのものが含まれる。
+
+        :return: ルールごとの (種類, 引数...) のタプルのリスト
+        """
+        return list(self.signatures)
+
+    def get_hit_counts(self) -> Dict[str, int]:
+        """
+        ルールごとのヒット数を登録順に返す。
+
+        :return: ルール名とヒット数の辞書
+        """
+        with self._lock:
+            return dict(self.hit_counts)
+
+    def reset_hit_counts(self):
+        """
+        ルールごとのヒット数を0に戻す。
+        """
+        with self._lock:
+            for name in self.hit_counts:
+                self.hit_counts[name] = 0
@@ -1,4 +1,6 @@
-from typing import List, Any, Union, Dict, Callable
+import logging
+from typing import List, Any, Union, Dict, Callable, Optional
+import numpy as np
 from src.log_operations.log_handlers import CustomLogger
 from src.text_operations.text_replacer import TextReplacer
 from src.text_operations.text_handler import TextHandler
@@ -27,12 +29,16 @@ class ValueValidator:
         :param custom_check: カスタム検証関数（オプション）。値を受け取り、Falseを返せば無効と判断
         :return: 値が有効な場合はTrue、そうでない場合はFalse
         """
-        display_value = text_handler.generate_display_value(value, 10)
-        if value in invalid_values or (custom_check and not custom_check(value)):
-            logger.debug(f"Invalid value found: {display_value}")
-            return False
-        logger.debug(f"Value is valid: {display_value}")
-        return True
+        result = not (
+            value in invalid_values or (custom_check and not custom_check(value))
+        )
+        if logger.isEnabledFor(logging.DEBUG):
+            display_value = text_handler.generate_display_value(value, 10)
+            if result:
+                logger.debug(f"Value is valid: {display_value}")
+            else:
+                logger.debug(f"Invalid value found: {display_value}")
+        return result
 
     @staticmethod
     def all_valid(
@@ -130,3 +136,112 @@ class ValueValidator:
             logger.debug(f"Found {len(invalid_indices)} invalid elements")
 
         return invalid_indices
+
+    @staticmethod
+    def _build_invalid_check(
+        invalid_values: List[Any], custom_check: Callable[[Any], bool] = None
+    ) -> Callable[[Any], bool]:
+        """
+        is_valid() と同じ判定をログ出力なしで行う関数を作成します。
+        無効値のうちハッシュ可能なものは集合で判定し、ハッシュできない値はリストで判定する。
+        """
+        hashable_values = set()
+        unhashable_values = []
+        for invalid_value in invalid_values:
+            try:
+                hash(invalid_value)
+                hashable_values.add(invalid_value)
+            except TypeError:
+                unhashable_values.append(invalid_value)
+
+        def is_valid(value: Any) -> bool:
+            try:
+                if value in hashable_values:
+                    return False
+            except TypeError:
+                if value in invalid_values:
+                    return False
+            else:
+                if unhashable_values and value in unhashable_values:
+                    return False
+            return not (custom_check and not custom_check(value))
+
+        return is_valid
+
+    @staticmethod
+    def mask_valid(
+        values: List[Any],
+        invalid_values: List[Any] = [None, "", False],
+        custom_check: Callable[[Any], bool] = None,
+    ) -> np.ndarray:
+        """
+        列や範囲の値をまとめて検証し、有効な要素を True とする真偽値の配列を返します。
+        判定は is_valid() と同じだが、要素ごとのログ出力は行わない。
+
+        :param values: チェックする値の配列
+        :param invalid_values: 無効とみなす値のリスト（デフォルトは [None, "", False]）
+        :param custom_check: カスタム検証関数（オプション）。要素を受け取り、Falseを返せば無効と判断
+        :return: 有効な要素が True の numpy 配列
+        """
+        is_valid = ValueValidator._build_invalid_check(invalid_values, custom_check)
+        mask = np.fromiter(
+            (is_valid(value) for value in values), dtype=bool, count=len(values)
+        )
+        logger.debug(f"{int(mask.sum())} of {len(mask)} values are valid")
+        return mask
+
+    @staticmethod
+    def valid_indices(
+        values: List[Any],
+        invalid_values: List[Any] = [None, "", False],
+        custom_check: Callable[[Any], bool] = None,
+    ) -> np.ndarray:
+        """
+        有効な要素のインデックスの配列を返します。
+
+        :param values: チェックする値の配列
+        :param invalid_values: 無効とみなす値のリスト（デフォルトは [None, "", False]）
+        :param custom_check: カスタム検証関数（オプション）。要素を受け取り、Falseを返せば無効と判断
+        :return: 有効な要素のインデックスの numpy 配列
+        """
+        return np.flatnonzero(
+            ValueValidator.mask_valid(values, invalid_values, custom_check)
+        )
+
+    @staticmethod
+    def first_valid(
+        values: List[Any],
+        invalid_values: List[Any] = [None, "", False],
+        custom_check: Callable[[Any], bool] = None,
+    ) -> Optional[int]:
+        """
+        最初の有効な要素のインデックスを返します。見つかった時点で検証を終了する。
+
+        :param values: チェックする値の配列
+        :param invalid_values: 無効とみなす値のリスト（デフォルトは [None, "", False]）
+        :param custom_check: カスタム検証関数（オプション）。要素を受け取り、Falseを返せば無効と判断
+        :return: 最初の有効な要素のインデックス、有効な要素がない場合は None
+        """
+        is_valid = ValueValidator._build_invalid_check(invalid_values, custom_check)
+        for index, value in enumerate(values):
+            if is_valid(value):
+                return index
+        return None
+
+    @staticmethod
+    def count_valid(
+        values: List[Any],
+        invalid_values: List[Any] = [None, "", False],
+        custom_check: Callable[[Any], bool] = None,
+    ) -> int:
+        """
+        有効な要素の数を返します。
+
+        :param values: チェックする値の配列
+        :param invalid_values: 無効とみなす値のリスト（デフォルトは [None, "", False]）
+        :param custom_check: カスタム検証関数（オプション）。要素を受け取り、Falseを返せば無効と判断
+        :return: 有効な要素の数
+        """
+        return int(
+            ValueValidator.mask_valid(values, invalid_values, custom_check).sum()
+        )
@@ -1,4 +1,5 @@
 import time
+from typing import Optional
 import pygetwindow as gw
 import pyperclip
 import pyautogui
@@ -6,6 +7,7 @@ import webbrowser
 
 from src.log_operations.log_handlers import CustomLogger
 from src.input_operations.keyboard_handler import KeyboardHandler
+from src.file_operations.download_watcher import DownloadWatcher
 
 logger = CustomLogger(__name__)
 
@@ -25,6 +27,7 @@ class EdgeHandler:
         self.wait_time_after_prompt_medium = 10
         self.wait_time_after_prompt_long = 100
         self.wait_time_after_switch = 2
+        self.download_watcher: Optional[DownloadWatcher] = None
 
     def set_wait_time_after_prompt_short(self, wait_time_after_prompt_short):
         self.wait_time_after_prompt_short = wait_time_after_prompt_short
@@ -38,6 +41,15 @@ class EdgeHandler:
     def wait_time_after_switch(self, wait_time_after_switch):
         self.wait_time_after_switch = wait_time_after_switch
 
+    def set_download_watcher(self, download_watcher: Optional[DownloadWatcher]):
+        """
+        ui_save_html で保存の完了を待つための DownloadWatcher を設定する。
+        設定した場合、wait_time_after_prompt_long は保存の完了を待つ最大時間として使用される。
+        設定しない場合は、保存後に wait_time_after_prompt_long だけ待機する。
+        :param download_watcher: ダウンロードフォルダを監視する DownloadWatcher
+        """
+        self.download_watcher = download_watcher
+
     def activate_edge(self):
         """Microsoft Edge ウィンドウをアクティブ化する"""
         edge_windows = gw.getWindowsWithTitle("Edge")
@@ -76,21 +88,37 @@ class EdgeHandler:
         self.driver.switch_to.default_content()
         logger.debug("Switched back to default content")
 
-    def ui_save_html(self, filename):
+    def ui_save_html(self, filename, folder_name: Optional[str] = None) -> bool:
         """
         生成されたコンテンツをファイルに保存する
+        DownloadWatcher が設定されている場合は、ファイルと関連ファイルのフォルダの書き込みが終わるまで待機する。
         :param filename: 保存するファイルの名前（パスを含む）
+        :param folder_name: ファイルと一緒に保存されるフォルダの名前（例: 「<名前>_files」）
+        :return: 保存が完了した場合（DownloadWatcher がない場合は常に）True
         """
         self.activate_edge()
         time.sleep(self.wait_time_after_prompt_medium)
-        pyautogui.hotkey("ctrl", "s")
-        time.sleep(self.wait_time_after_prompt_medium)
-        pyperclip.copy(filename)
-        pyautogui.hotkey("ctrl", "v")
-        time.sleep(self.wait_time_after_prompt_medium)
-        pyautogui.press("enter")
-        time.sleep(self.wait_time_after_prompt_long)
+        if self.download_watcher is not None:
+            self.download_watcher.start()
+        try:
+            pyautogui.hotkey("ctrl", "s")
+            time.sleep(self.wait_time_after_prompt_medium)
+            pyperclip.copy(filename)
+            pyautogui.hotkey("ctrl", "v")
+            time.sleep(self.wait_time_after_prompt_medium)
+            pyautogui.press("enter")
+            if self.download_watcher is None:
+                time.sleep(self.wait_time_after_prompt_long)
+                saved = True
+            else:
+                saved = self.download_watcher.wait_for_download(
+                    filename, folder_name, timeout=self.wait_time_after_prompt_long
+                )
+        finally:
+            if self.download_watcher is not None:
+                self.download_watcher.stop()
         logger.debug(f"save {filename} as html in downloads")
+        return saved
 
     def close_tab(self):
         self.activate_edge()
@@ -20,7 +20,10 @@ class WebFetcher:
         :return: 取得したWebページのHTML内容、エラー時はNone
         """
         try:
-            response = requests.get(url)
+            with logger.span("http.fetch", url=url) as span:
+                response = requests.get(url)
+                span["http_status"] = response.status_code
+                span["bytes"] = len(response.content)
             response.raise_for_status()
             logger.debug(f"ページを正常に取得しました: {url}")
             return response.text
@@ -0,0 +1,49 @@
+import pytest
+
+from src.text_operations.text_replacer import MultiLiteralReplacer, TextReplacer
+
+# scripts/create_blog_wp/upload_wp_post.py の置換表（h2 が3つ未満の場合）
+UPLOAD_WP_POST_REPLACEMENTS = {
+    "<b>": "",
+    "</b>": "",
+    "<strong>": "",
+    "</strong>": "",
+    "<h3>": "<h2>",
+    "</h3>": "</h2>",
+    "</h4>": "</h3>",
+    "<h5>": "<h4>",
+    "</h5>": "</h4>",
+}
+
+
+def replace_sequentially(content, mapping):
+    for target_text, replacement_text in mapping.items():
+        content = TextReplacer.replace_content(content, target_text, replacement_text)
+    return content
+
+
+@pytest.mark.parametrize(
+    "html",
+    [
+        "",
+        "<p>タグなし</p>",
+        "<h3>見出し</h3><p><b>太字</b>と<strong>強調</strong></p>",
+        "<h2>A</h2><h3>B</h3><h4>C</h4><h5>D</h5><p><b><strong>E</strong></b></p>" * 3,
+        "<h5><b>入れ子</b></h5></h4></h3>",
+    ],
+)
+def test_replace_many_matches_sequential_replacement(html):
+    assert TextReplacer.replace_many(
+        html, UPLOAD_WP_POST_REPLACEMENTS
+    ) == replace_sequentially(html, UPLOAD_WP_POST_REPLACEMENTS)
+
+
+def test_leftmost_longest_match():
+    replacer = MultiLiteralReplacer({"ab": "1", "abc": "2", "bc": "3"})
+    assert replacer.subn("abcab") == ("21", 2)
+
+
+def test_replaced_text_is_not_rescanned():
+    replacer = MultiLiteralReplacer({"a": "b", "b": "c"})
+    assert replacer.replace("ab") == "bc"
+    assert replace_sequentially("ab", {"a": "b", "b": "c"}) == "cc"